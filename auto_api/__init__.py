@@ -1,4 +1,86 @@
-from .client import Client
-from .errors import ApiError, AuthError
+"""
+Python client for auto-api.com.
 
-__all__ = ['Client', 'ApiError', 'AuthError']
+Public names are imported on first access, so ``import auto_api`` stays
+cheap: requests, httpx and the optional backends load only when the class
+that needs them is used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    'Client': 'client',
+    'AsyncClient': 'async_client',
+    'ApiError': 'errors',
+    'AuthError': 'errors',
+    'NetworkError': 'errors',
+    'Offer': 'models',
+    'OfferPage': 'models',
+    'Change': 'models',
+    'ChangesPage': 'models',
+    'ResultStream': 'streaming',
+    'ResponseCache': 'cache',
+    'CacheBackend': 'cache',
+    'MemoryCache': 'cache',
+    'SQLiteCache': 'cache',
+    'CheckpointStore': 'changes',
+    'FileCheckpoint': 'changes',
+    'MemoryCheckpoint': 'changes',
+    'SQLiteCheckpoint': 'changes',
+    'SyncEngine': 'sync',
+    'Compactor': 'compaction',
+    'Crawler': 'crawl',
+    'CrawlPlanner': 'planner',
+    'CrawlPlan': 'planner',
+    'Shard': 'planner',
+    'Mirror': 'mirror',
+    'OfferIndex': 'query',
+    'RateLimiter': 'ratelimit',
+    'AdaptiveConcurrency': 'ratelimit',
+    'RetryPolicy': 'retry',
+    'RetryBudget': 'retry',
+    'Balancer': 'balancer',
+    'SingleFlight': 'singleflight',
+    'AsyncSingleFlight': 'singleflight',
+    'Hooks': 'hooks',
+    'RequestEvent': 'hooks',
+    'Transport': 'transport',
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .async_client import AsyncClient
+    from .balancer import Balancer
+    from .cache import CacheBackend, MemoryCache, ResponseCache, SQLiteCache
+    from .changes import CheckpointStore, FileCheckpoint, MemoryCheckpoint, SQLiteCheckpoint
+    from .client import Client
+    from .compaction import Compactor
+    from .crawl import Crawler
+    from .errors import ApiError, AuthError, NetworkError
+    from .hooks import Hooks, RequestEvent
+    from .mirror import Mirror
+    from .planner import CrawlPlan, CrawlPlanner, Shard
+    from .models import Change, ChangesPage, Offer, OfferPage
+    from .query import OfferIndex
+    from .ratelimit import AdaptiveConcurrency, RateLimiter
+    from .retry import RetryBudget, RetryPolicy
+    from .singleflight import AsyncSingleFlight, SingleFlight
+    from .streaming import ResultStream
+    from .sync import SyncEngine
+    from .transport import Transport
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - exercised only without the extra installed
+    httpx = None
+
+from .cache import request_key
+from .client import _BaseClient
+from .decoders import Decoder
+from .errors import NetworkError
+from .models import ChangesPage, Offer, OfferPage
+from .singleflight import AsyncSingleFlight
+
+
+class AsyncClient(_BaseClient):
+    """
+    asyncio client for auto-api.com, mirroring Client with coroutine methods.
+
+    Requests share one bounded keep-alive connection pool: at most
+    ``max_connections`` sockets are open at a time and further requests wait
+    for a free connection instead of failing, so a single event loop can keep
+    hundreds of calls in flight. Requires the ``async`` extra (httpx).
+
+    With ``coalesce=True`` (or an AsyncSingleFlight) identical requests
+    awaited concurrently share one HTTP call and one decoded result.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = 'https://api1.auto-api.com',
+        api_version: str = 'v2',
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        decoder: str | Decoder = 'auto',
+        models: bool = False,
+        coalesce: AsyncSingleFlight | bool = False,
+    ):
+        if httpx is None:
+            raise ImportError("AsyncClient requires httpx: pip install 'autoapicom-client[async]'")
+
+        super().__init__(api_key, base_url, api_version, decoder, models)
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, pool=None),
+        )
+        self.single_flight = AsyncSingleFlight() if coalesce is True else coalesce or None
+
+    async def __aenter__(self) -> AsyncClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.session.aclose()
+
+    async def get_filters(self, source: str) -> dict:
+        """Available filters for a source (brands, models, body types, etc.)"""
+        return await self._get(f'api/{self.api_version}/{source}/filters')
+
+    async def get_offers(self, source: str, **params) -> dict | OfferPage:
+        """
+        List of offers with pagination and filters.
+
+        Params: page (required), brand, model, configuration, complectation,
+        transmission, color, body_type, engine_type, year_from, year_to,
+        mileage_from, mileage_to, price_from, price_to
+        """
+        return self._as_model(OfferPage, await self._get(f'api/{self.api_version}/{source}/offers', params))
+
+    async def get_offer(self, source: str, inner_id: str) -> dict | Offer:
+        """Single offer by inner_id."""
+        return self._as_model(Offer, await self._get(f'api/{self.api_version}/{source}/offer', {'inner_id': inner_id}))
+
+    async def get_change_id(self, source: str, date: str) -> int:
+        """Get change_id by date (format: yyyy-mm-dd)."""
+        response = await self._get(f'api/{self.api_version}/{source}/change_id', {'date': date})
+        return int(response['change_id'])
+
+    async def get_changes(self, source: str, change_id: int) -> dict | ChangesPage:
+        """Changes feed (added/changed/removed) starting from change_id."""
+        return self._as_model(
+            ChangesPage,
+            await self._get(f'api/{self.api_version}/{source}/changes', {'change_id': change_id}),
+        )
+
+    async def get_offer_by_url(self, url: str) -> dict | Offer:
+        """Get offer data by its URL on the marketplace."""
+        return self._as_model(Offer, await self._post('api/v1/offer/info', {'url': url}))
+
+    async def _get(self, endpoint: str, params: dict | None = None) -> dict:
+        if self.single_flight is None:
+            return await self._get_now(endpoint, params)
+        return await self.single_flight.do(request_key('GET', endpoint, params), self._get_now, endpoint, params)
+
+    async def _get_now(self, endpoint: str, params: dict | None) -> dict:
+        try:
+            response = await self.session.get(f'{self.base_url}/{endpoint}', params=self._query(params))
+        except httpx.TransportError as e:
+            raise NetworkError(f'Request failed: {e!r}') from e
+        self._handle_error(response)
+        return self._decode(response)
+
+    async def _post(self, endpoint: str, data: dict) -> dict:
+        if self.single_flight is None:
+            return await self._post_now(endpoint, data)
+        return await self.single_flight.do(request_key('POST', endpoint, data), self._post_now, endpoint, data)
+
+    async def _post_now(self, endpoint: str, data: dict) -> dict:
+        try:
+            response = await self.session.post(
+                f'{self.base_url}/{endpoint}',
+                json=data,
+                headers={'x-api-key': self.api_key},
+            )
+        except httpx.TransportError as e:
+            raise NetworkError(f'Request failed: {e!r}') from e
+        self._handle_error(response)
+        return self._decode(response)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Callable, Iterable
+
+STRATEGIES = ('least_outstanding', 'latency')
+
+# Circuit states of an endpoint.
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class Endpoint:
+    """One base URL and its health as seen by a Balancer."""
+
+    __slots__ = ('base_url', 'outstanding', 'latency', 'failures', 'state', 'opened_at', 'requests', 'errors')
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip('/')
+        self.outstanding = 0
+        self.latency = None
+        self.failures = 0
+        self.state = CLOSED
+        self.opened_at = None
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self) -> str:
+        return f'Endpoint({self.base_url!r}, state={self.state!r}, outstanding={self.outstanding})'
+
+
+class Balancer:
+    """
+    Spreads requests over several API hosts and ejects the failing ones.
+
+    ``strategy`` is 'least_outstanding' (the host with the fewest requests
+    in flight) or 'latency' (lowest EWMA response time times requests in
+    flight plus one; hosts without a sample yet are tried first). Ties are
+    broken at random.
+
+    Each host has a circuit breaker: ``failure_threshold`` consecutive
+    failures (network errors and 5xx) open it and the host gets no traffic
+    for ``reset_timeout`` seconds. Then a single probe request is let
+    through (half-open); its success closes the circuit, its failure opens
+    it again. When every circuit is open the host that opened first is
+    tried anyway rather than failing without a request.
+
+    Thread-safe; pass one to several clients to share the health view.
+    """
+
+    def __init__(
+        self,
+        base_urls: Iterable[str],
+        strategy: str = 'least_outstanding',
+        failure_threshold: int = 3,
+        reset_timeout: float = 10.0,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ):
+        self.endpoints = [Endpoint(url) for url in base_urls]
+        if not self.endpoints:
+            raise ValueError('base_urls must not be empty')
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Unknown strategy {strategy!r}, expected one of: {", ".join(STRATEGIES)}')
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.smoothing = smoothing
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def acquire(self, exclude: Iterable[Endpoint] = ()) -> Endpoint:
+        """Pick the host for the next request and count it as in flight."""
+        exclude = set(map(id, exclude))
+        with self._lock:
+            now = self._clock()
+            candidates = [e for e in self.endpoints if id(e) not in exclude] or list(self.endpoints)
+            available = []
+            for endpoint in candidates:
+                if endpoint.state == OPEN and now - endpoint.opened_at >= self.reset_timeout:
+                    endpoint.state = HALF_OPEN
+                    # The first caller to see the timeout expire sends the probe.
+                    endpoint.outstanding += 1
+                    endpoint.requests += 1
+                    return endpoint
+                if endpoint.state == CLOSED:
+                    available.append(endpoint)
+
+            if available:
+                self._rng.shuffle(available)
+                endpoint = min(available, key=self._score)
+            else:
+                # Everything is ejected or probing: better a request to the oldest-opened host than none.
+                endpoint = min(candidates, key=lambda e: e.opened_at if e.opened_at is not None else now)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, ok: bool, seconds: float | None = None) -> None:
+        """Finish a request to ``endpoint``; ``ok`` is False for a network error or 5xx."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if seconds is not None:
+                if endpoint.latency is None:
+                    endpoint.latency = seconds
+                else:
+                    endpoint.latency += self.smoothing * (seconds - endpoint.latency)
+            if ok:
+                endpoint.failures = 0
+                endpoint.state = CLOSED
+                endpoint.opened_at = None
+                return
+            endpoint.errors += 1
+            endpoint.failures += 1
+            if endpoint.state == HALF_OPEN or endpoint.failures >= self.failure_threshold:
+                endpoint.state = OPEN
+                endpoint.opened_at = self._clock()
+
+    def healthy(self) -> list:
+        """Hosts whose circuit is closed."""
+        with self._lock:
+            return [endpoint for endpoint in self.endpoints if endpoint.state == CLOSED]
+
+    def stats(self) -> list:
+        """Per-host state, in-flight count, EWMA latency and counters."""
+        with self._lock:
+            return [
+                {
+                    'base_url': endpoint.base_url,
+                    'state': endpoint.state,
+                    'outstanding': endpoint.outstanding,
+                    'latency': endpoint.latency,
+                    'requests': endpoint.requests,
+                    'errors': endpoint.errors,
+                }
+                for endpoint in self.endpoints
+            ]
+
+    def _score(self, endpoint: Endpoint) -> float:
+        if self.strategy == 'least_outstanding':
+            return endpoint.outstanding
+        if endpoint.latency is None:
+            return -1.0
+        return endpoint.latency * (endpoint.outstanding + 1)
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from urllib.parse import urlencode
+
+# Seconds a response stays fresh, by the last segment of the endpoint path.
+# 0 disables caching for that endpoint.
+DEFAULT_TTLS = {
+    'filters': 24 * 3600,
+    'change_id': 3600,
+    'offer': 300,
+    'info': 300,
+    # List pages are large and rarely requested twice; caching them evicts everything else.
+    'offers': 0,
+    'changes': 0,
+}
+
+
+def request_key(method: str, endpoint: str, params: dict | None = None) -> str:
+    """Identifies a request by method, endpoint and parameters, in any order and without the api_key."""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items() if k != 'api_key')
+    return f'{method} {endpoint}?{urlencode(items)}'
+
+
+class CacheEntry:
+    """
+    A cached response body and the time (epoch seconds) it stops being fresh.
+
+    ``etag`` and ``last_modified`` are the response's validators; a stale
+    entry that has one can be revalidated with a conditional request.
+    ``size`` is the length in bytes of the response body it was decoded
+    from, which MemoryCache counts against its byte budget.
+    """
+
+    __slots__ = ('value', 'expires_at', 'etag', 'last_modified', 'size')
+
+    def __init__(
+        self,
+        value,
+        expires_at: float,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        size: int = 0,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    def conditional_headers(self) -> dict:
+        """If-None-Match / If-Modified-Since headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class CacheBackend:
+    """
+    Storage for cache entries.
+
+    Subclass and implement get/set/delete/clear/__len__ to plug in your own
+    store (Redis, memcached, ...). Backends are responsible for bounding
+    their own size.
+    """
+
+    def get(self, key: str) -> CacheEntry | None:
+        raise NotImplementedError
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """
+    In-process LRU cache holding at most ``maxsize`` entries and ``maxbytes`` bytes.
+
+    Entries are weighed by the size of the response body they came from
+    (CacheEntry.size); the least recently used are evicted until both
+    limits hold, and an entry bigger than ``maxbytes`` is not stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: int = 64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._remove(key)
+            if entry.size > self.maxbytes:
+                return
+            self._entries[key] = entry
+            self.bytes += entry.size
+            while len(self._entries) > self.maxsize or self.bytes > self.maxbytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= evicted.size
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+
+class SQLiteCache(CacheBackend):
+    """On-disk LRU cache in an SQLite table; bodies are stored as JSON."""
+
+    def __init__(self, path: str, maxsize: int = 100_000, table: str = 'auto_api_cache'):
+        import sqlite3
+
+        self.maxsize = maxsize
+        self.table = table
+        self._lock = threading.Lock()
+        # accessed_at is a logical clock: one more than the latest access.
+        self._tick = f'SELECT COALESCE(MAX(accessed_at), 0) + 1 FROM {table}'
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at INTEGER NOT NULL, '
+                'etag TEXT, last_modified TEXT)'
+            )
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)')
+            # Tables created before validators were stored lack their columns.
+            columns = {row[1] for row in self._conn.execute(f'PRAGMA table_info({table})')}
+            for column in ('etag', 'last_modified'):
+                if column not in columns:
+                    self._conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} TEXT')
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f'SELECT value, expires_at, etag, last_modified FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(f'UPDATE {self.table} SET accessed_at = ({self._tick}) WHERE key = ?', (key,))
+        return CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at, etag, last_modified) '
+                f'VALUES (?, ?, ?, ({self._tick}), ?, ?)',
+                (key, json.dumps(entry.value), entry.expires_at, entry.etag, entry.last_modified),
+            )
+            excess = self._count() - self.maxsize
+            if excess > 0:
+                self._conn.execute(
+                    f'DELETE FROM {self.table} WHERE key IN '
+                    f'(SELECT key FROM {self.table} ORDER BY accessed_at LIMIT ?)',
+                    (excess,),
+                )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM {self.table}')
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _count(self) -> int:
+        return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Caches decoded responses per endpoint and parameters, never keyed on the api_key.
+
+    ``ttls`` overrides DEFAULT_TTLS per endpoint name (filters, offers, offer,
+    change_id, changes, info). Cached values are shared between callers and
+    must be treated as read-only.
+
+    Expired entries stay in the backend until evicted so that ones with an
+    ETag or Last-Modified can be revalidated instead of downloaded again.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttls: dict | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def ttl(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint.rsplit('/', 1)[-1], 0)
+
+    def key(self, method: str, endpoint: str, params: dict | None = None) -> str:
+        return request_key(method, endpoint, params)
+
+    def get(self, key: str):
+        """The fresh cached value for key, or None."""
+        value, _ = self.lookup(key)
+        return value
+
+    def lookup(self, key: str) -> tuple:
+        """
+        (value, None) for a fresh entry, else (None, stale) where ``stale`` is
+        the expired entry when it can be revalidated, or None.
+        """
+        entry = self.backend.get(key)
+        fresh = entry is not None and entry.expires_at > self._clock()
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if fresh:
+            return entry.value, None
+        if entry is not None and (entry.etag or entry.last_modified):
+            return None, entry
+        return None, None
+
+    def set(
+        self,
+        key: str,
+        endpoint: str,
+        value,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        size: int = 0,
+    ) -> None:
+        """Store ``value``; ``size`` is the byte length of the response body it was decoded from."""
+        self.backend.set(key, CacheEntry(value, self._clock() + self.ttl(endpoint), etag, last_modified, size))
+
+    def revalidated(self, key: str, endpoint: str, entry: CacheEntry) -> None:
+        """Mark a stale entry fresh again after the server answered 304 Not Modified."""
+        with self._lock:
+            self.revalidations += 1
+        self.set(key, endpoint, entry.value, entry.etag, entry.last_modified, entry.size)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+            'size': len(self.backend),
+        }
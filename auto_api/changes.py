@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import datetime
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from .models import page_parts
+
+
+class CheckpointStore:
+    """
+    Persists the change_id a consumer has fully processed, per key (usually the source).
+
+    Subclass and implement load/save to plug in your own storage.
+    """
+
+    def load(self, key: str) -> int | None:
+        raise NotImplementedError
+
+    def save(self, key: str, change_id: int) -> None:
+        raise NotImplementedError
+
+
+class MemoryCheckpoint(CheckpointStore):
+    """In-process checkpoint store; positions are lost on exit."""
+
+    def __init__(self):
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> int | None:
+        with self._lock:
+            return self._positions.get(key)
+
+    def save(self, key: str, change_id: int) -> None:
+        with self._lock:
+            self._positions[key] = change_id
+
+
+class FileCheckpoint(CheckpointStore):
+    """
+    JSON file holding {key: change_id}.
+
+    Every save writes a temporary file, fsyncs it and renames it over the
+    original, so a crash leaves either the old or the new position on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self, key: str) -> int | None:
+        with self._lock:
+            return self._read().get(key)
+
+    def save(self, key: str, change_id: int) -> None:
+        with self._lock:
+            positions = self._read()
+            positions[key] = change_id
+
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(positions, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+
+class SQLiteCheckpoint(CheckpointStore):
+    """Checkpoints in an SQLite table; each save is its own committed transaction."""
+
+    def __init__(self, path: str, table: str = 'auto_api_checkpoints'):
+        import sqlite3
+
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, change_id INTEGER NOT NULL)'
+            )
+
+    def load(self, key: str) -> int | None:
+        with self._lock:
+            row = self._conn.execute(f'SELECT change_id FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, key: str, change_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, change_id) VALUES (?, ?)',
+                (key, change_id),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def resolve_change_id(client, source: str, start) -> int:
+    """Turn a change_id, a yyyy-mm-dd string or a date into a change_id."""
+    if isinstance(start, bool):
+        raise TypeError('start must be a change_id, a yyyy-mm-dd string or a date')
+    if isinstance(start, int):
+        return start
+    if isinstance(start, (datetime.date, datetime.datetime)):
+        start = start.strftime('%Y-%m-%d')
+    if isinstance(start, str):
+        return client.get_change_id(source, start)
+    raise TypeError('start must be a change_id, a yyyy-mm-dd string or a date')
+
+
+def follow_changes(
+    client,
+    source: str,
+    start=None,
+    checkpoint: CheckpointStore | None = None,
+    poll_interval: float = 5.0,
+    max_interval: float = 60.0,
+    stop_at_head: bool = False,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[dict]:
+    """
+    Yield change records from the get_changes feed continuously.
+
+    Starts from the checkpointed position when there is one, otherwise from
+    ``start``. The next batch is fetched in the background while the current
+    one is consumed. Once a batch has been fully iterated its next_change_id
+    is saved to ``checkpoint``, so a restart resumes at the first batch that
+    was not finished.
+
+    At the head of the feed (an empty batch) polling backs off exponentially
+    from ``poll_interval`` up to ``max_interval``, or the generator returns
+    when ``stop_at_head`` is set.
+    """
+    change_id = checkpoint.load(source) if checkpoint is not None else None
+    if change_id is None:
+        if start is None:
+            raise ValueError('start is required when there is no checkpoint for this source')
+        change_id = resolve_change_id(client, source, start)
+
+    interval = poll_interval
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(client.get_changes, source, change_id)
+        try:
+            while True:
+                batch = future.result()
+                records, meta = page_parts(batch)
+                next_change_id = meta.get('next_change_id')
+
+                if not records:
+                    if stop_at_head:
+                        future = None
+                        return
+                    sleep(interval)
+                    interval = min(interval * 2, max_interval)
+                    change_id = next_change_id or change_id
+                    future = pool.submit(client.get_changes, source, change_id)
+                    continue
+
+                interval = poll_interval
+                future = pool.submit(client.get_changes, source, next_change_id) if next_change_id else None
+
+                yield from records
+
+                if not next_change_id:
+                    return
+                change_id = next_change_id
+                if checkpoint is not None:
+                    checkpoint.save(source, change_id)
+        finally:
+            if future is not None:
+                future.cancel()
@@ -1,25 +1,203 @@
 from __future__ import annotations
 
-import requests
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, Sequence, Tuple, Union
 
-from .errors import ApiError, AuthError
+from .balancer import Balancer
+from .cache import CacheBackend, ResponseCache, request_key
+from .changes import CheckpointStore, follow_changes
+from .decoders import Decoder, get_decoder
+from .errors import ApiError, AuthError, NetworkError
+from .hooks import Hooks, RequestEvent, emit, endpoint_template
+from .models import Change, ChangesPage, Offer, OfferPage, page_parts
+from .ratelimit import AdaptiveConcurrency, RateLimiter
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .streaming import ResultStream
+from .transport import HTTP2Transport, RequestsTransport, Transport, UrllibTransport
+from .urls import OfferUrl, parse_offer_url
 
+# Seconds, or a (connect, read) pair.
+Timeout = Union[float, Tuple[float, float]]
 
-class Client:
-    """Auto API client for auto-api.com — car listings across multiple marketplaces."""
+# Statuses that mean the API is overloaded and the adaptive limit should shrink.
+OVERLOAD_STATUSES = (429, 503)
 
-    def __init__(self, api_key: str, base_url: str = 'https://api1.auto-api.com', api_version: str = 'v2'):
+
+class _BaseClient:
+    """Configuration and response handling shared by Client and AsyncClient."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = 'https://api1.auto-api.com',
+        api_version: str = 'v2',
+        decoder: str | Decoder = 'auto',
+        models: bool = False,
+    ):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
         self.api_version = api_version
-        self.session = requests.Session()
-        self.session.timeout = 30
+        self.decoder = get_decoder(decoder)
+        self.models = models
+
+    def _as_model(self, model, data: dict):
+        return model.from_dict(data) if self.models else data
+
+    def _query(self, params: dict | None = None) -> dict:
+        query = {'api_key': self.api_key}
+        if params:
+            query.update(params)
+        return query
+
+    def _decode(self, response) -> dict:
+        try:
+            return self.decoder(response.content)
+        except ValueError:
+            raise ApiError(
+                f"Invalid JSON response: {response.content[:200].decode('utf-8', 'replace')}",
+                response.status_code,
+            )
+
+    def _handle_error(self, response) -> None:
+        if response.status_code < 400:
+            return
+
+        body = None
+        reason = getattr(response, 'reason', None) or getattr(response, 'reason_phrase', '')
+        message = f'API error: {response.status_code} {reason}'
+
+        try:
+            body = self.decoder(response.content)
+            if isinstance(body, dict) and 'message' in body:
+                message = body['message']
+        except ValueError:
+            pass
+
+        if response.status_code in (401, 403):
+            raise AuthError(message, response.status_code)
+
+        raise ApiError(message, response.status_code, body)
+
+
+class Client(_BaseClient):
+    """
+    Auto API client for auto-api.com — car listings across multiple marketplaces.
+
+    Pass ``cache=True`` (or a ResponseCache / CacheBackend) to cache responses
+    per endpoint; see auto_api.cache for the default TTLs.
+
+    ``rate_limit`` (requests per second or a RateLimiter) paces every request
+    from this client, and ``concurrency_limit`` (an AdaptiveConcurrency)
+    caps requests in flight across threads, shrinking on 429/503/timeouts.
+
+    ``retry`` (True or a RetryPolicy) retries failed GETs with exponential
+    backoff; connection failures and timeouts raise NetworkError.
 
-    def get_filters(self, source: str) -> dict:
+    ``timeout`` (seconds or a (connect, read) pair) applies to every request
+    and can be overridden per call. ``pool_connections`` and ``pool_maxsize``
+    size the keep-alive pool (set pool_maxsize to at least the number of
+    threads sharing the client); ``pool_block`` makes threads wait for a free
+    connection instead of opening throwaway ones.
+
+    ``decoder`` picks the JSON backend: 'auto' (orjson or msgspec when
+    installed, else the standard library), a backend name, or a callable
+    taking the response bytes.
+
+    With ``models=True`` offers and changes come back as the compact typed
+    objects from auto_api.models (OfferPage, Offer, ChangesPage, Change)
+    instead of dicts.
+
+    With ``coalesce=True`` (or a SingleFlight) identical requests made
+    concurrently from several threads share one HTTP call and one decoded
+    result; ``client.single_flight.stats()`` counts them.
+
+    ``base_url`` may also be a list of hosts (or an auto_api.balancer.Balancer)
+    to spread requests over: each request goes to the host with the fewest
+    requests in flight, failing hosts are ejected for a while, and GETs that
+    hit a network error or 5xx are re-sent to another host straight away.
+
+    ``transport`` picks what sends the requests: 'requests' (the default;
+    the pool options above apply and ``client.session`` is its Session),
+    'urllib' (standard library only, for fast cold starts), 'http2'
+    (concurrent calls multiplexed over a few connections), or any
+    auto_api.transport.Transport, such as MockTransport in tests.
+
+    ``hooks`` (auto_api.hooks.Hooks instances) are told about every request
+    that goes to the network, with per-phase timings, status code, size and
+    retry count; auto_api.metrics has Prometheus and OpenTelemetry ones.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | Sequence[str] | Balancer = 'https://api1.auto-api.com',
+        api_version: str = 'v2',
+        cache: ResponseCache | CacheBackend | bool | None = None,
+        rate_limit: RateLimiter | float | None = None,
+        concurrency_limit: AdaptiveConcurrency | None = None,
+        retry: RetryPolicy | bool | None = None,
+        timeout: Timeout = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        decoder: str | Decoder = 'auto',
+        models: bool = False,
+        coalesce: SingleFlight | bool = False,
+        hooks: Iterable[Hooks] = (),
+        transport: str | Transport = 'requests',
+    ):
+        if isinstance(base_url, str):
+            self.balancer = None
+        else:
+            self.balancer = base_url if isinstance(base_url, Balancer) else Balancer(base_url)
+            base_url = self.balancer.endpoints[0].base_url
+        super().__init__(api_key, base_url, api_version, decoder, models)
+        self.timeout = timeout
+        if transport == 'requests':
+            transport = RequestsTransport(pool_connections, pool_maxsize, pool_block, keep_alive)
+        elif transport == 'urllib':
+            transport = UrllibTransport(keep_alive)
+        elif transport == 'http2':
+            transport = HTTP2Transport(keep_alive=keep_alive)
+        elif not isinstance(transport, Transport):
+            raise ValueError(f"Unknown transport {transport!r}, expected 'requests', 'urllib', 'http2' or a Transport")
+        self.transport = transport
+        # The requests.Session of the default transport; None for the others.
+        self.session = getattr(transport, 'session', None)
+
+        if cache is True:
+            cache = ResponseCache()
+        elif isinstance(cache, CacheBackend):
+            cache = ResponseCache(cache)
+        self.cache = cache or None
+
+        if rate_limit is not None and not isinstance(rate_limit, RateLimiter):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter = rate_limit
+        self.concurrency_limit = concurrency_limit
+        self.retry = RetryPolicy() if retry is True else retry or None
+        self.single_flight = SingleFlight() if coalesce is True else coalesce or None
+        self.hooks = list(hooks)
+
+    def __enter__(self) -> Client:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.transport.close()
+
+    def get_filters(self, source: str, *, timeout: Timeout | None = None) -> dict:
         """Available filters for a source (brands, models, body types, etc.)"""
-        return self._get(f'api/{self.api_version}/{source}/filters')
+        return self._get(f'api/{self.api_version}/{source}/filters', timeout=timeout)
 
-    def get_offers(self, source: str, **params) -> dict:
+    def get_offers(self, source: str, *, timeout: Timeout | None = None, **params) -> dict | OfferPage:
         """
         List of offers with pagination and filters.
 
@@ -27,67 +205,462 @@ class Client:
         transmission, color, body_type, engine_type, year_from, year_to,
         mileage_from, mileage_to, price_from, price_to
         """
-        return self._get(f'api/{self.api_version}/{source}/offers', params)
+        return self._as_model(OfferPage, self._get(f'api/{self.api_version}/{source}/offers', params, timeout=timeout))
+
+    def stream_offers(self, source: str, *, timeout: Timeout | None = None, **params) -> ResultStream:
+        """
+        One get_offers page, yielding each offer as soon as it has downloaded.
+
+        Takes the same params as get_offers. The returned stream is iterable
+        and has ``meta`` once exhausted; close it (or use it as a context
+        manager) when stopping early. Not cached.
+        """
+        return self._stream(f'api/{self.api_version}/{source}/offers', params, Offer, timeout)
+
+    def iter_offers(self, source: str, concurrency: int = 1, **params) -> Iterator[dict]:
+        """
+        Stream offer items across all pages of a get_offers query.
+
+        Follows meta.next_page starting at ``page`` (default 1). With
+        ``concurrency`` > 1 the next pages are prefetched on a pool of that many
+        threads while the current one is consumed; items still come back in
+        page order.
+        """
+        page = params.pop('page', 1)
+
+        if concurrency <= 1:
+            while page:
+                items, meta = page_parts(self.get_offers(source, page=page, **params))
+                yield from items
+                page = meta.get('next_page')
+            return
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while page:
+                    while len(pending) < concurrency:
+                        pending.append((page, pool.submit(self.get_offers, source, page=page, **params)))
+                        page += 1
 
-    def get_offer(self, source: str, inner_id: str) -> dict:
+                    current, future = pending.popleft()
+                    items, meta = page_parts(future.result())
+                    next_page = meta.get('next_page')
+
+                    if next_page != current + 1:
+                        # Last page, or pages are not sequential: drop the speculative fetches.
+                        for _, stale in pending:
+                            stale.cancel()
+                        pending.clear()
+                        page = next_page
+                    else:
+                        # Keep the pool busy while the caller consumes this page.
+                        pending.append((page, pool.submit(self.get_offers, source, page=page, **params)))
+                        page += 1
+
+                    yield from items
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def get_offer(self, source: str, inner_id: str, *, timeout: Timeout | None = None) -> dict | Offer:
         """Single offer by inner_id."""
-        return self._get(f'api/{self.api_version}/{source}/offer', {'inner_id': inner_id})
+        return self._as_model(
+            Offer,
+            self._get(f'api/{self.api_version}/{source}/offer', {'inner_id': inner_id}, timeout=timeout),
+        )
+
+    def get_offers_bulk(self, source: str, inner_ids: Iterable[str], concurrency: int = 8, stream: bool = False):
+        """
+        Fetch many offers by inner_id in parallel.
+
+        Duplicate ids are fetched once. Returns a dict keyed by inner_id, or
+        with ``stream=True`` an iterator of ``(inner_id, offer)`` pairs in
+        completion order. A failed id maps to its ApiError instead of
+        aborting the batch.
+        """
+        results = self._iter_offers_bulk(source, list(dict.fromkeys(inner_ids)), concurrency)
+        return results if stream else dict(results)
 
-    def get_change_id(self, source: str, date: str) -> int:
+    def _iter_offers_bulk(self, source: str, inner_ids: list, concurrency: int) -> Iterator[tuple]:
+        def fetch(inner_id):
+            try:
+                return inner_id, self.get_offer(source, inner_id)
+            except ApiError as e:
+                return inner_id, e
+
+        if not inner_ids:
+            return
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(inner_ids)))) as pool:
+            futures = [pool.submit(fetch, inner_id) for inner_id in inner_ids]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def get_change_id(self, source: str, date: str, *, timeout: Timeout | None = None) -> int:
         """Get change_id by date (format: yyyy-mm-dd)."""
-        response = self._get(f'api/{self.api_version}/{source}/change_id', {'date': date})
+        response = self._get(f'api/{self.api_version}/{source}/change_id', {'date': date}, timeout=timeout)
         return int(response['change_id'])
 
-    def get_changes(self, source: str, change_id: int) -> dict:
+    def get_changes(self, source: str, change_id: int, *, timeout: Timeout | None = None) -> dict | ChangesPage:
         """Changes feed (added/changed/removed) starting from change_id."""
-        return self._get(f'api/{self.api_version}/{source}/changes', {'change_id': change_id})
+        return self._as_model(
+            ChangesPage,
+            self._get(f'api/{self.api_version}/{source}/changes', {'change_id': change_id}, timeout=timeout),
+        )
 
-    def get_offer_by_url(self, url: str) -> dict:
+    def stream_changes(self, source: str, change_id: int, *, timeout: Timeout | None = None) -> ResultStream:
+        """Like get_changes, but yields each change record as soon as it has downloaded (see stream_offers)."""
+        return self._stream(f'api/{self.api_version}/{source}/changes', {'change_id': change_id}, Change, timeout)
+
+    def follow_changes(
+        self,
+        source: str,
+        start=None,
+        checkpoint: CheckpointStore | None = None,
+        **options,
+    ) -> Iterator[dict]:
+        """
+        Yield change records continuously from ``start`` (change_id, yyyy-mm-dd or date).
+
+        The last fully consumed change_id is saved to ``checkpoint`` and used
+        as the starting point on restart. Options: poll_interval,
+        max_interval, stop_at_head (see auto_api.changes.follow_changes).
+        """
+        return follow_changes(self, source, start, checkpoint, **options)
+
+    def get_offer_by_url(self, url: str, *, timeout: Timeout | None = None) -> dict | Offer:
         """Get offer data by its URL on the marketplace."""
-        return self._post('api/v1/offer/info', {'url': url})
+        return self._as_model(Offer, self._post('api/v1/offer/info', {'url': url}, timeout=timeout))
 
-    def _get(self, endpoint: str, params: dict | None = None) -> dict:
-        query = {'api_key': self.api_key}
-        if params:
-            query.update(params)
+    def resolve_offer_urls(self, urls: Iterable[str], concurrency: int = 8) -> list:
+        """
+        Offer data for many marketplace URLs, in input order.
+
+        URLs are normalized (tracking parameters and fragments dropped) and
+        deduplicated first. Those whose source and inner_id can be read from
+        the URL (see auto_api.urls) are fetched with get_offer, which the
+        cache covers; the rest, and any get_offer that comes back 4xx, are
+        POSTed to offer/info. Each result has the get_offer_by_url shape; a
+        failed URL maps to its ApiError instead of aborting the batch.
+        """
+        parsed = [parse_offer_url(url) for url in urls]
+        unique = {}
+        for offer_url in parsed:
+            unique.setdefault(offer_url.key, offer_url)
+        if not unique:
+            return []
 
-        response = self.session.get(f'{self.base_url}/{endpoint}', params=query)
-        self._handle_error(response)
-        return self._decode(response)
+        def resolve(offer_url):
+            try:
+                return offer_url.key, self._resolve_offer_url(offer_url)
+            except ApiError as e:
+                return offer_url.key, e
 
-    def _post(self, endpoint: str, data: dict) -> dict:
-        response = self.session.post(
-            f'{self.base_url}/{endpoint}',
-            json=data,
-            headers={'x-api-key': self.api_key},
-        )
-        self._handle_error(response)
-        return self._decode(response)
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(unique)))) as pool:
+            results = dict(pool.map(resolve, unique.values()))
+        return [results[offer_url.key] for offer_url in parsed]
 
-    def _decode(self, response: requests.Response) -> dict:
+    def _resolve_offer_url(self, offer_url: OfferUrl) -> dict | Offer:
+        if offer_url.inner_id is not None:
+            try:
+                item = self._get(f'api/{self.api_version}/{offer_url.source}/offer', {'inner_id': offer_url.inner_id})
+            except AuthError:
+                raise
+            except ApiError as e:
+                # An id the API does not know: let offer/info have a go at the URL itself.
+                if not 400 <= e.status_code < 500 or e.status_code == 429:
+                    raise
+            else:
+                if self.models:
+                    return Offer.from_dict(item)
+                return item.get('data', item)
+        return self.get_offer_by_url(offer_url.url)
+
+    def _get(self, endpoint: str, params: dict | None = None, timeout: Timeout | None = None) -> dict:
+        if self.single_flight is None:
+            return self._get_now(endpoint, params, timeout)
+        return self.single_flight.do(request_key('GET', endpoint, params), self._get_now, endpoint, params, timeout)
+
+    def _get_now(self, endpoint: str, params: dict | None, timeout: Timeout | None) -> dict:
+        key = self._cache_key('GET', endpoint, params)
+        stale = None
+        kwargs = {}
+        if key is not None:
+            cached, stale = self.cache.lookup(key)
+            if cached is not None:
+                return cached
+            if stale is not None:
+                kwargs['headers'] = stale.conditional_headers()
+
+        event = self._start_event('GET', endpoint)
         try:
-            return response.json()
-        except ValueError:
-            raise ApiError(
-                f'Invalid JSON response: {response.text[:200]}',
-                response.status_code,
+            response = self._request(
+                self.transport.get,
+                endpoint,
+                self.retry,
+                event,
+                failover=True,
+                params=self._query(params),
+                timeout=self.timeout if timeout is None else timeout,
+                **kwargs,
+            )
+            if response.status_code == 304 and stale is not None:
+                self.cache.revalidated(key, endpoint, stale)
+                result = stale.value
+            else:
+                result = self._decode_timed(response, event)
+        except BaseException as e:
+            # Any failure, not only ApiError, ends the event so spans and timers are closed.
+            self._fail_event(event, e)
+            raise
+        self._finish_event(event, response)
+
+        if key is not None and response.status_code != 304:
+            headers = response.headers or {}
+            self.cache.set(
+                key, endpoint, result, headers.get('ETag'), headers.get('Last-Modified'), len(response.content)
             )
+        return result
 
-    def _handle_error(self, response: requests.Response) -> None:
-        if response.ok:
+    def _post(self, endpoint: str, data: dict, timeout: Timeout | None = None) -> dict:
+        if self.single_flight is None:
+            return self._post_now(endpoint, data, timeout)
+        return self.single_flight.do(request_key('POST', endpoint, data), self._post_now, endpoint, data, timeout)
+
+    def _post_now(self, endpoint: str, data: dict, timeout: Timeout | None) -> dict:
+        key = self._cache_key('POST', endpoint, data)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        event = self._start_event('POST', endpoint)
+        try:
+            response = self._request(
+                self.transport.post,
+                endpoint,
+                None,
+                event,
+                json=data,
+                headers={'x-api-key': self.api_key},
+                timeout=self.timeout if timeout is None else timeout,
+            )
+            result = self._decode_timed(response, event)
+        except BaseException as e:
+            self._fail_event(event, e)
+            raise
+        self._finish_event(event, response)
+
+        if key is not None:
+            self.cache.set(key, endpoint, result, size=len(response.content))
+        return result
+
+    def _stream(self, endpoint: str, params: dict | None, model, timeout: Timeout | None) -> ResultStream:
+        event = self._start_event('GET', endpoint)
+        try:
+            response = self._request(
+                self.transport.get,
+                endpoint,
+                self.retry,
+                event,
+                failover=True,
+                params=self._query(params),
+                timeout=self.timeout if timeout is None else timeout,
+                stream=True,
+            )
+        except BaseException as e:
+            self._fail_event(event, e)
+            raise
+        # The body has not been read yet: size and download time stay unknown.
+        self._finish_event(event, response, streamed=True)
+        return ResultStream(
+            _iter_chunks(response, self.transport.stream_errors),
+            self.decoder,
+            model.from_dict if self.models else None,
+            on_close=response.close,
+            status_code=response.status_code,
+        )
+
+    def _request(
+        self,
+        send,
+        endpoint: str,
+        retry: RetryPolicy | None,
+        event: RequestEvent | None = None,
+        failover: bool = False,
+        **kwargs,
+    ):
+        """
+        Send until a successful response, retrying as far as ``retry`` allows.
+
+        With a balancer each attempt goes to the host it picks; with
+        ``failover`` a network error or 5xx is first retried at once on every
+        other host before ``retry`` gets a say.
+        """
+        if retry is not None and retry.budget is not None:
+            retry.budget.deposit()
+
+        started = retry.clock() if retry is not None else 0.0
+        timeout = kwargs.get('timeout')
+        attempt = 0
+        tried = []
+        while True:
+            if retry is not None and retry.deadline is not None:
+                # No single attempt may outlive the call's deadline.
+                remaining = max(retry.deadline - (retry.clock() - started), 0.001)
+                kwargs['timeout'] = _cap_timeout(timeout, remaining)
+
+            picked = []
+            if self.balancer is None:
+                url = f'{self.base_url}/{endpoint}'
+            else:
+                def url(exclude=tuple(tried)) -> str:
+                    # Picked only once the rate and concurrency limits let the request go, so
+                    # time queued locally counts neither as in flight nor as host latency.
+                    picked.append((self.balancer.acquire(exclude), time.perf_counter()))
+                    return f'{picked[0][0].base_url}/{endpoint}'
+
+            response = None
+            healthy = True
+            try:
+                response = self._send(send, url, event, **kwargs)
+                self._handle_error(response)
+                return response
+            except ApiError as e:
+                healthy = not _is_host_failure(e)
+                host = picked[0][0] if picked else None
+                if failover and not healthy and host is not None and len(tried) + 1 < len(self.balancer.endpoints):
+                    tried.append(host)
+                    if event is not None:
+                        event.retries += 1
+                    continue
+                tried = []
+                if retry is None:
+                    raise
+                headers = response.headers if response is not None else None
+                delay = retry.delay(attempt, e, headers, retry.clock() - started)
+                if delay is None:
+                    raise
+            except BaseException:
+                # Whatever else went wrong, the host did not answer: never count it as a success.
+                healthy = False
+                raise
+            finally:
+                if picked:
+                    host, sent = picked[0]
+                    self.balancer.release(host, healthy, time.perf_counter() - sent)
+            if event is None:
+                retry.sleep(delay)
+            else:
+                event.retries += 1
+                sleep_started = time.perf_counter()
+                retry.sleep(delay)
+                event.add('backoff', time.perf_counter() - sleep_started)
+            attempt += 1
+
+    def _send(self, send, url: str | Callable[[], str], event: RequestEvent | None = None, **kwargs):
+        """Send once the rate and concurrency limits allow; a callable ``url`` is resolved only then."""
+        if event is not None:
+            queued = time.perf_counter()
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        limiter = self.concurrency_limit
+        if limiter is not None:
+            limiter.acquire()
+
+        if event is not None:
+            sent = time.perf_counter()
+            event.add('queue', sent - queued)
+
+        overloaded = False
+        try:
+            if callable(url):
+                url = url()
+            response = send(url, **kwargs)
+            overloaded = response.status_code in OVERLOAD_STATUSES
+            if event is not None:
+                _record_transfer(event, response, time.perf_counter() - sent)
+            return response
+        except self.transport.timeout_errors as e:
+            overloaded = True
+            raise NetworkError(f'Request timed out: {e}') from e
+        except self.transport.connection_errors as e:
+            raise NetworkError(f'Connection failed: {e}') from e
+        finally:
+            if limiter is not None:
+                limiter.release(overloaded)
+
+    def _start_event(self, method: str, endpoint: str) -> RequestEvent | None:
+        if not self.hooks:
+            return None
+        # Every GET endpoint is scoped to a source; the one POST endpoint is not.
+        template, source = endpoint_template(endpoint) if method == 'GET' else (endpoint, None)
+        event = RequestEvent(method, template, source)
+        emit(self.hooks, 'on_request', event)
+        return event
+
+    def _finish_event(self, event: RequestEvent | None, response, streamed: bool = False) -> None:
+        if event is None:
             return
+        event.status_code = response.status_code
+        if not streamed:
+            event.size = len(response.content)
+        event.finish()
+        emit(self.hooks, 'on_response', event)
 
-        body = None
-        message = f'API error: {response.status_code} {response.reason}'
+    def _fail_event(self, event: RequestEvent | None, error: BaseException) -> None:
+        if event is None:
+            return
+        event.status_code = getattr(error, 'status_code', None) or None
+        event.error = error
+        event.finish()
+        emit(self.hooks, 'on_error', event)
 
+    def _decode_timed(self, response, event: RequestEvent | None) -> dict:
+        if event is None:
+            return self._decode(response)
+        started = time.perf_counter()
         try:
-            body = response.json()
-            if isinstance(body, dict) and 'message' in body:
-                message = body['message']
-        except ValueError:
-            pass
+            return self._decode(response)
+        finally:
+            event.add('decode', time.perf_counter() - started)
 
-        if response.status_code in (401, 403):
-            raise AuthError(message, response.status_code)
+    def _cache_key(self, method: str, endpoint: str, params: dict | None) -> str | None:
+        if self.cache is None or not self.cache.ttl(endpoint):
+            return None
+        return self.cache.key(method, endpoint, params)
 
-        raise ApiError(message, response.status_code, body)
+
+def _is_host_failure(error: ApiError) -> bool:
+    # Statuses a different host may well not return; 4xx would repeat anywhere.
+    return isinstance(error, NetworkError) or error.status_code >= 500
+
+
+def _cap_timeout(timeout: Timeout | None, limit: float) -> Timeout:
+    if timeout is None:
+        return limit
+    if isinstance(timeout, tuple):
+        return tuple(limit if part is None else min(part, limit) for part in timeout)
+    return min(timeout, limit)
+
+
+def _record_transfer(event: RequestEvent, response, seconds: float) -> None:
+    # requests measures until the headers were parsed; the rest of the send was the body download.
+    elapsed = getattr(response, 'elapsed', None)
+    ttfb = min(elapsed.total_seconds(), seconds) if elapsed is not None else seconds
+    event.add('ttfb', ttfb)
+    event.add('download', seconds - ttfb)
+
+
+def _iter_chunks(response, errors: tuple, chunk_size: int = 65536) -> Iterator[bytes]:
+    try:
+        yield from response.iter_content(chunk_size)
+    except errors as e:
+        raise NetworkError(f'Connection failed while reading response: {e}') from e
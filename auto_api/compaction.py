@@ -0,0 +1,182 @@
+"""
+Collapsing changes-feed windows to one net change per offer.
+
+A get_changes batch often has several records for the same inner_id (added
+then changed, changed then removed). compact() reduces any run of records to
+one Delta per offer with the net change_type, the final data and, when the
+previous state of the offer is known, field-level differences from it.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+
+class Delta:
+    """
+    Net effect of a window of change records on one offer.
+
+    ``data`` is the offer data after the window (None when removed),
+    ``previous`` the data before it when known, and ``changes`` maps each
+    top-level field that differs to an ``(old, new)`` pair. ``first_id`` and
+    ``last_id`` are the change ids it covers and ``records`` how many
+    records were collapsed into it.
+    """
+
+    __slots__ = ('source', 'inner_id', 'change_type', 'data', 'previous', 'changes', 'first_id', 'last_id', 'records')
+
+    def __init__(
+        self,
+        source: str | None,
+        inner_id: str,
+        change_type: str,
+        data: dict | None = None,
+        previous: dict | None = None,
+        changes: dict | None = None,
+        first_id: int | None = None,
+        last_id: int | None = None,
+        records: int = 1,
+    ):
+        self.source = source
+        self.inner_id = inner_id
+        self.change_type = change_type
+        self.data = data
+        self.previous = previous
+        self.changes = changes or {}
+        self.first_id = first_id
+        self.last_id = last_id
+        self.records = records
+
+    def to_dict(self) -> dict:
+        """As one changes-feed record, e.g. for Mirror.apply."""
+        record = {'id': self.last_id, 'inner_id': self.inner_id, 'change_type': self.change_type}
+        if self.data is not None:
+            record['data'] = self.data
+        return record
+
+    def __repr__(self) -> str:
+        return (
+            f'Delta(source={self.source!r}, inner_id={self.inner_id!r}, change_type={self.change_type!r}, '
+            f'changes={sorted(self.changes)!r}, records={self.records})'
+        )
+
+
+class Compactor:
+    """
+    Compacts change windows against the last known state of each offer.
+
+    ``state`` is where that state comes from: a dict keyed on
+    ``(source, inner_id)`` holding offer data (the default, starting empty)
+    or a Mirror. ``compact`` only reads it; ``commit`` writes deltas back,
+    into the dict or through Mirror.apply, so the next window is diffed
+    against them.
+
+    With known state, re-adding a stored offer is reported as changed and a
+    change that leaves the data as stored is dropped.
+    """
+
+    def __init__(self, state=None):
+        self.state = {} if state is None else state
+
+    def compact(self, source: str, records: Iterable) -> list:
+        """One Delta per inner_id in ``records`` (dicts or Change models), in feed order of their last record."""
+        windows = _windows(records)
+        if isinstance(self.state, dict):
+            known = {inner_id: self.state.get((source, inner_id)) for inner_id in windows}
+        else:
+            known = self.state.get_many(source, windows)
+
+        deltas = []
+        for inner_id, window in windows.items():
+            delta = _net(source, inner_id, window, known.get(inner_id))
+            if delta is not None:
+                deltas.append(delta)
+        return deltas
+
+    def commit(self, source: str, deltas: Iterable[Delta], change_id: int | None = None) -> None:
+        """Make ``deltas`` the known state; with a Mirror ``change_id`` is saved as its feed position."""
+        if not isinstance(self.state, dict):
+            self.state.apply(source, deltas, change_id)
+            return
+        for delta in deltas:
+            if delta.change_type == REMOVED:
+                self.state.pop((source, delta.inner_id), None)
+            elif delta.data is not None:
+                self.state[(source, delta.inner_id)] = delta.data
+
+
+def compact(records: Iterable, source: str | None = None) -> list:
+    """
+    Net effect per inner_id of change records, with no earlier state.
+
+    Whether an offer existed before the window is read from its first
+    record: an offer added and removed within the window disappears.
+    """
+    windows = _windows(records)
+    deltas = [_net(source, inner_id, window, None) for inner_id, window in windows.items()]
+    return [delta for delta in deltas if delta is not None]
+
+
+def diff(previous: dict | None, data: dict | None) -> dict:
+    """``{field: (old, new)}`` for the top-level fields that differ between two offer data dicts."""
+    previous = previous or {}
+    data = data or {}
+    return {
+        name: (previous.get(name), data.get(name))
+        for name in list(previous) + [name for name in data if name not in previous]
+        if previous.get(name) != data.get(name)
+    }
+
+
+def _windows(records: Iterable) -> dict:
+    # inner_id -> its records in feed order; dict order follows each inner_id's last record.
+    windows = {}
+    for record in records:
+        if not isinstance(record, dict):
+            record = record.to_dict()
+        inner_id = str(record.get('inner_id'))
+        window = windows.pop(inner_id, None) or []
+        window.append(record)
+        windows[inner_id] = window
+    return windows
+
+
+def _net(source: str | None, inner_id: str, window: list, previous: dict | None) -> Delta | None:
+    existed = previous is not None or window[0].get('change_type') != ADDED
+    exists = window[-1].get('change_type') != REMOVED
+    data = None
+    if exists:
+        for record in reversed(window):
+            if record.get('data'):
+                data = record['data']
+                break
+            if record.get('change_type') == REMOVED:
+                break
+        if data is None:
+            data = previous
+
+    if not existed and not exists:
+        return None
+    if not exists:
+        change_type = REMOVED
+    else:
+        change_type = CHANGED if existed else ADDED
+
+    changes = diff(previous, data) if previous is not None and exists else {}
+    if change_type == CHANGED and previous is not None and not changes:
+        return None
+    return Delta(
+        source,
+        inner_id,
+        change_type,
+        data if exists else None,
+        previous,
+        changes,
+        window[0].get('id'),
+        window[-1].get('id'),
+        len(window),
+    )
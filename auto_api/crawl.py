@@ -0,0 +1,198 @@
+"""
+Full-marketplace crawls spread over a process pool.
+
+Decoding pages and post-processing offers is CPU-bound; a Crawler runs both
+in worker processes, each with its own Client, and streams the results back
+page by page through a bounded queue.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import traceback
+from typing import Callable, Iterator
+
+from . import errors
+from .models import page_parts
+
+PARTITIONS = ('pages', 'brand')
+
+# Messages from the workers to the parent.
+_BATCH = 'batch'
+_DONE = 'done'
+_ERROR = 'error'
+
+
+class Crawler:
+    """
+    Crawls get_offers listings with a pool of worker processes.
+
+    With ``partition='pages'`` the workers claim page numbers from a shared
+    counter until one of them reaches the last page; with ``'brand'`` the
+    parent reads the brands from get_filters and each worker pages through
+    whole brands (pass ``brands`` to pick them). Either way every worker has
+    its own Client built from ``api_key`` and ``client_options``.
+
+    ``transform`` runs on each offer item inside the workers; returning None
+    drops the item. It has to be picklable (a module-level function). Each
+    page goes back to the parent as one pickled list, and at most
+    ``queue_size`` pages wait in the queue, so a slow consumer stalls the
+    workers instead of growing memory. Items come back in no particular
+    order.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        processes: int | None = None,
+        transform: Callable | None = None,
+        queue_size: int | None = None,
+        partition: str = 'pages',
+        mp_context: str | None = None,
+        **client_options,
+    ):
+        if partition not in PARTITIONS:
+            raise ValueError(f'Unknown partition {partition!r}, expected one of: {", ".join(PARTITIONS)}')
+        self.api_key = api_key
+        self.processes = processes or os.cpu_count() or 1
+        self.transform = transform
+        self.queue_size = queue_size or 2 * self.processes
+        self.partition = partition
+        self.client_options = client_options
+        self._context = multiprocessing.get_context(mp_context)
+
+    def crawl(self, source: str, brands: list | None = None, **params) -> Iterator:
+        """
+        Every offer of a get_offers query, passed through ``transform``.
+
+        Takes the same filter params as get_offers except ``page``. Closing
+        the iterator early stops the workers.
+        """
+        if 'page' in params:
+            raise TypeError('crawl() pages through the whole listing; page is not accepted')
+        if self.partition == 'brand':
+            if brands is None:
+                brands = _brands(self._client().get_filters(source))
+            tasks = list(brands)
+            processes = min(self.processes, len(tasks))
+        else:
+            tasks = None
+            processes = self.processes
+        return self._run(source, params, tasks, processes)
+
+    def _run(self, source: str, params: dict, tasks: list | None, processes: int) -> Iterator:
+        if not processes:
+            return
+        ctx = self._context
+        results = ctx.Queue(self.queue_size)
+        cursor = ctx.Value('q', 0)
+        last_page = ctx.Value('q', 0)
+        workers = [
+            ctx.Process(
+                target=_worker,
+                args=(self.api_key, self.client_options, source, params, tasks, self.transform, cursor, last_page, results),
+                daemon=True,
+            )
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        running = len(workers)
+        exited = False
+        try:
+            while running:
+                try:
+                    message = results.get(timeout=1.0)
+                except queue.Empty:
+                    if exited:
+                        raise RuntimeError('Crawl worker exited without reporting') from None
+                    # One more read: a worker may have reported just before exiting.
+                    exited = not any(worker.is_alive() for worker in workers)
+                    continue
+                kind = message[0]
+                if kind == _BATCH:
+                    yield from message[1]
+                elif kind == _DONE:
+                    running -= 1
+                else:
+                    raise _rebuild_error(*message[1:])
+        finally:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+            for worker in workers:
+                worker.join()
+            results.close()
+            results.join_thread()
+
+    def _client(self):
+        from .client import Client
+
+        return Client(self.api_key, **self.client_options)
+
+
+def _brands(filters: dict) -> list:
+    marks = filters.get('mark') or filters.get('brand') or []
+    return list(marks)
+
+
+def _worker(api_key, client_options, source, params, tasks, transform, cursor, last_page, results) -> None:
+    try:
+        from .client import Client
+
+        client = Client(api_key, **client_options)
+        for items in _pages(client, source, params, tasks, cursor, last_page):
+            if transform is not None:
+                items = [out for out in map(transform, items) if out is not None]
+            if items:
+                results.put((_BATCH, items))
+    except BaseException as e:
+        status_code = e.status_code if isinstance(e, errors.ApiError) else None
+        results.put((_ERROR, type(e).__name__, str(e), status_code, traceback.format_exc()))
+        return
+    results.put((_DONE,))
+
+
+def _pages(client, source, params, tasks, cursor, last_page) -> Iterator[list]:
+    if tasks is not None:
+        while True:
+            index = _claim(cursor)
+            if index >= len(tasks):
+                return
+            page = 1
+            while page:
+                items, meta = page_parts(client.get_offers(source, page=page, brand=tasks[index], **params))
+                yield items
+                page = meta.get('next_page')
+
+    while True:
+        page = _claim(cursor) + 1
+        if last_page.value and page > last_page.value:
+            return
+        items, meta = page_parts(client.get_offers(source, page=page, **params))
+        if not items or not meta.get('next_page'):
+            # Pages past this one are empty: stop everyone claiming them.
+            with last_page.get_lock():
+                end = page if items else page - 1
+                if not last_page.value or end < last_page.value:
+                    last_page.value = max(end, 1)
+        if items and not (last_page.value and page > last_page.value):
+            yield items
+
+
+def _claim(cursor) -> int:
+    with cursor.get_lock():
+        value = cursor.value
+        cursor.value += 1
+        return value
+
+
+def _rebuild_error(name: str, message: str, status_code: int | None, trace: str) -> Exception:
+    if status_code is not None:
+        # AuthError and NetworkError take the same (message, status_code) as ApiError.
+        cls = {'AuthError': errors.AuthError, 'NetworkError': errors.NetworkError}.get(name, errors.ApiError)
+        return cls(message, status_code)
+    return RuntimeError(f'Crawl worker failed with {name}: {message}\n{trace}')
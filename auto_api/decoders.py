@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Union
+
+# Turns a raw response body into Python objects; raises ValueError on bad JSON.
+Decoder = Callable[[bytes], Any]
+
+# Preference order for decoder='auto'.
+AUTO_ORDER = ('orjson', 'msgspec', 'json')
+
+
+def _json() -> Decoder:
+    # json.loads accepts bytes directly (it detects the UTF encoding itself).
+    return json.loads
+
+
+def _orjson() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec() -> Decoder:
+    import msgspec
+
+    decode = msgspec.json.Decoder().decode
+
+    def decoder(data: bytes) -> Any:
+        try:
+            return decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return decoder
+
+
+_FACTORIES = {'json': _json, 'orjson': _orjson, 'msgspec': _msgspec}
+
+
+def available_decoders() -> list:
+    """Names of the decoders that can be used in this environment."""
+    names = []
+    for name in _FACTORIES:
+        try:
+            _FACTORIES[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_decoder(decoder: Union[str, Decoder] = 'auto') -> Decoder:
+    """
+    Resolve a decoder name ('auto', 'json', 'orjson', 'msgspec') or callable.
+
+    'auto' picks the fastest installed backend: orjson, then msgspec, then
+    the standard library. orjson and msgspec parse the response bytes
+    directly without building an intermediate str.
+    """
+    if callable(decoder):
+        return decoder
+
+    if decoder == 'auto':
+        for name in AUTO_ORDER:
+            try:
+                return _FACTORIES[name]()
+            except ImportError:
+                continue
+
+    if decoder not in _FACTORIES:
+        raise ValueError(f'Unknown decoder: {decoder!r} (expected one of {", ".join(_FACTORIES)} or auto)')
+    return _FACTORIES[decoder]()
@@ -16,3 +16,10 @@ class AuthError(ApiError):
 
     def __init__(self, message: str = 'Invalid or missing API key', status_code: int = 401):
         super().__init__(message, status_code)
+
+
+class NetworkError(ApiError):
+    """Connection failure or timeout before any response was received."""
+
+    def __init__(self, message: str = 'Network error', status_code: int = 0):
+        super().__init__(message, status_code)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import time
+
+# Timing phases recorded on RequestEvent.timings, in seconds:
+#   queue     waiting for the rate limiter and the concurrency limit
+#   ttfb      from sending until the response headers arrived (connect, TLS and server time)
+#   download  reading the body after the headers
+#   decode    JSON decoding
+#   backoff   sleeping between retries
+#   total     the whole call, retries included
+PHASES = ('queue', 'ttfb', 'download', 'decode', 'backoff', 'total')
+
+
+class RequestEvent:
+    """
+    One client call as seen by hooks; retries are part of the same event.
+
+    ``endpoint`` is the path template (e.g. 'api/v2/{source}/offers') and
+    ``source`` the marketplace, so neither the api_key nor the query
+    parameters ever reach a hook. ``context`` is free for hooks to keep
+    per-call state between on_request and on_response/on_error.
+    """
+
+    __slots__ = ('method', 'endpoint', 'source', 'status_code', 'retries', 'size', 'timings', 'error', 'context', '_started')
+
+    def __init__(self, method: str, endpoint: str, source: str | None = None):
+        self.method = method
+        self.endpoint = endpoint
+        self.source = source
+        self.status_code = None
+        self.retries = 0
+        self.size = None
+        self.timings = {}
+        self.error = None
+        self.context = {}
+        self._started = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def finish(self) -> None:
+        self.timings['total'] = time.perf_counter() - self._started
+
+    def __repr__(self) -> str:
+        return f'RequestEvent({self.method} {self.endpoint!r}, source={self.source!r}, status_code={self.status_code!r})'
+
+
+class Hooks:
+    """
+    Receives client request events; subclass and override what you need.
+
+    on_request runs before the first attempt, then exactly one of
+    on_response (with status_code, size and timings filled in) or on_error
+    (with ``error`` set to whatever was raised, usually an ApiError). Cache
+    hits make no request and fire no events.
+    Hooks run on the calling thread, so keep them fast.
+    """
+
+    def on_request(self, event: RequestEvent) -> None:
+        pass
+
+    def on_response(self, event: RequestEvent) -> None:
+        pass
+
+    def on_error(self, event: RequestEvent) -> None:
+        pass
+
+
+def endpoint_template(endpoint: str) -> tuple:
+    """('api/v2/{source}/offers', 'encar') for a source-scoped path like 'api/v2/encar/offers'."""
+    parts = endpoint.split('/')
+    if len(parts) == 4 and parts[0] == 'api':
+        return f'api/{parts[1]}/{{source}}/{parts[3]}', parts[2]
+    return endpoint, None
+
+
+def emit(hooks, name: str, event: RequestEvent) -> None:
+    for hook in hooks:
+        getattr(hook, name)(event)
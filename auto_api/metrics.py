@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from .hooks import Hooks, RequestEvent
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+
+
+class PrometheusHooks(Hooks):
+    """
+    Exports request metrics as prometheus_client histograms and counters.
+
+    Durations and phase timings are labelled by endpoint template and
+    source, so p50/p99 can be computed per source and endpoint. Requires
+    the ``prometheus`` extra (prometheus_client).
+    """
+
+    def __init__(self, registry=None, namespace: str = 'auto_api', buckets=DURATION_BUCKETS):
+        try:
+            from prometheus_client import Counter, Histogram
+        except ImportError:
+            raise ImportError("PrometheusHooks requires prometheus_client: pip install 'autoapicom-client[prometheus]'") from None
+
+        options = {'registry': registry} if registry is not None else {}
+        self.duration = Histogram(
+            f'{namespace}_request_duration_seconds',
+            'Client call duration including retries.',
+            ['method', 'endpoint', 'source', 'status'],
+            buckets=buckets,
+            **options,
+        )
+        self.phases = Histogram(
+            f'{namespace}_request_phase_seconds',
+            'Time spent in each phase of a client call.',
+            ['endpoint', 'source', 'phase'],
+            buckets=buckets,
+            **options,
+        )
+        self.size = Histogram(
+            f'{namespace}_response_size_bytes',
+            'Response body size.',
+            ['endpoint', 'source'],
+            buckets=SIZE_BUCKETS,
+            **options,
+        )
+        self.retries = Counter(
+            f'{namespace}_request_retries',
+            'Retried attempts.',
+            ['endpoint', 'source'],
+            **options,
+        )
+        self.errors = Counter(
+            f'{namespace}_request_errors',
+            'Client calls that ended in an error.',
+            ['endpoint', 'source', 'error'],
+            **options,
+        )
+
+    def on_response(self, event: RequestEvent) -> None:
+        self._observe(event)
+        if event.size is not None:
+            self.size.labels(event.endpoint, event.source or '').observe(event.size)
+
+    def on_error(self, event: RequestEvent) -> None:
+        self._observe(event)
+        self.errors.labels(event.endpoint, event.source or '', type(event.error).__name__).inc()
+
+    def _observe(self, event: RequestEvent) -> None:
+        source = event.source or ''
+        status = str(event.status_code) if event.status_code is not None else 'none'
+        self.duration.labels(event.method, event.endpoint, source, status).observe(event.timings.get('total', 0.0))
+        for phase, seconds in event.timings.items():
+            if phase != 'total':
+                self.phases.labels(event.endpoint, source, phase).observe(seconds)
+        if event.retries:
+            self.retries.labels(event.endpoint, source).inc(event.retries)
+
+
+class OpenTelemetryHooks(Hooks):
+    """
+    Records every client call as an OpenTelemetry client span.
+
+    Spans are named '<method> <endpoint template>' and carry the status
+    code, response size, retry count and phase timings
+    (auto_api.timing.<phase>, in seconds). Requires opentelemetry-api.
+    """
+
+    _SPAN = 'opentelemetry.span'
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("OpenTelemetryHooks requires opentelemetry-api: pip install 'autoapicom-client[otel]'") from None
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer('auto_api')
+
+    def on_request(self, event: RequestEvent) -> None:
+        attributes = {'http.request.method': event.method, 'url.template': event.endpoint}
+        if event.source is not None:
+            attributes['auto_api.source'] = event.source
+        event.context[self._SPAN] = self.tracer.start_span(
+            f'{event.method} {event.endpoint}',
+            kind=self._trace.SpanKind.CLIENT,
+            attributes=attributes,
+        )
+
+    def on_response(self, event: RequestEvent) -> None:
+        span = self._finish(event)
+        if span is not None:
+            span.end()
+
+    def on_error(self, event: RequestEvent) -> None:
+        span = self._finish(event)
+        if span is not None:
+            span.record_exception(event.error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(event.error)))
+            span.end()
+
+    def _finish(self, event: RequestEvent):
+        span = event.context.pop(self._SPAN, None)
+        if span is None:
+            return None
+        if event.status_code is not None:
+            span.set_attribute('http.response.status_code', event.status_code)
+        if event.size is not None:
+            span.set_attribute('http.response.body.size', event.size)
+        if event.retries:
+            span.set_attribute('http.request.resend_count', event.retries)
+        for phase, seconds in event.timings.items():
+            span.set_attribute(f'auto_api.timing.{phase}', seconds)
+        return span
@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import datetime
+import json
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from .changes import resolve_change_id
+from .models import _item_dict, _number, page_parts
+
+# Indexed columns filterable by range; mark and model are matched exactly.
+RANGE_FIELDS = ('year', 'price', 'km_age')
+
+
+class Mirror:
+    """
+    Local SQLite copy of offers keyed on (source, inner_id).
+
+    ``bootstrap`` fills a source from a full get_offers crawl and ``sync``
+    keeps it current by applying the changes feed, so only changes are
+    fetched after the first crawl. Every applied changes batch is committed
+    in the same transaction as the feed position it ends at, so an
+    interrupted sync resumes at the first batch that was not stored.
+    Likewise a bootstrap crawls into a staging table and only replaces the
+    source's offers and position once it has finished.
+    """
+
+    def __init__(self, path: str, table: str = 'auto_api_offers', batch_size: int = 500):
+        self.table = table
+        self.batch_size = batch_size
+        self._positions = f'{table}_positions'
+        self._staging = f'{table}_staging'
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            for name in (table, self._staging):
+                self._conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS {name} ('
+                    'source TEXT NOT NULL, inner_id TEXT NOT NULL, '
+                    'mark TEXT, model TEXT, year INTEGER, price REAL, km_age INTEGER, '
+                    'data TEXT NOT NULL, PRIMARY KEY (source, inner_id))'
+                )
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_mark ON {table} (source, mark, model)')
+            for name in RANGE_FIELDS:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} (source, {name})')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self._positions} (source TEXT PRIMARY KEY, change_id INTEGER NOT NULL)'
+            )
+
+    def bootstrap(self, client, source: str, start=None, concurrency: int = 1, **params) -> int:
+        """
+        Replace the stored offers of ``source`` with a full get_offers crawl.
+
+        The changes-feed position is taken before the crawl starts (today's
+        change_id, or ``start`` as in follow_changes), so changes made while
+        crawling are replayed by the next ``sync``. ``params`` are passed to
+        iter_offers to mirror a subset. Returns the number of offers stored.
+
+        Offers are written to a staging table while crawling; the stored
+        offers and position of ``source`` are replaced in one transaction at
+        the end, so a failed crawl leaves the mirror as it was.
+        """
+        change_id = resolve_change_id(client, source, start if start is not None else datetime.date.today())
+
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM {self._staging} WHERE source = ?', (source,))
+
+        stored = 0
+        batch = []
+        for item in client.iter_offers(source, concurrency=concurrency, **params):
+            batch.append(_row(source, _item_dict(item)))
+            if len(batch) >= self.batch_size:
+                with self._lock, self._conn:
+                    stored += self._upsert(batch, self._staging)
+                batch = []
+
+        with self._lock, self._conn:
+            stored += self._upsert(batch, self._staging)
+            self._conn.execute(f'DELETE FROM {self.table} WHERE source = ?', (source,))
+            self._conn.execute(f'INSERT INTO {self.table} SELECT * FROM {self._staging} WHERE source = ?', (source,))
+            self._conn.execute(f'DELETE FROM {self._staging} WHERE source = ?', (source,))
+            self._save_position(source, change_id)
+        return stored
+
+    def sync(self, client, source: str, max_batches: int | None = None) -> int:
+        """
+        Apply changes-feed batches from the stored position until the head of the feed.
+
+        Returns the number of change records applied.
+        """
+        change_id = self.position(source)
+        if change_id is None:
+            raise ValueError(f'No feed position for {source!r}; call bootstrap first')
+
+        applied = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            records, meta = page_parts(client.get_changes(source, change_id))
+            next_change_id = meta.get('next_change_id')
+            if not records:
+                if next_change_id and next_change_id != change_id:
+                    with self._lock, self._conn:
+                        self._save_position(source, next_change_id)
+                break
+
+            self.apply(source, records, next_change_id)
+            applied += len(records)
+            batches += 1
+            if not next_change_id:
+                break
+            change_id = next_change_id
+        return applied
+
+    def apply(self, source: str, records: Iterable, change_id: int | None = None) -> None:
+        """
+        Apply change records (dicts or Change models) in one transaction.
+
+        added and changed records carrying data are upserted, removed ones
+        deleted. When ``change_id`` is given it is stored as the new feed
+        position in the same transaction.
+        """
+        upserts = {}
+        removals = set()
+        for record in records:
+            if not isinstance(record, dict):
+                record = record.to_dict()
+            inner_id = str(record.get('inner_id'))
+            if record.get('change_type') == 'removed':
+                upserts.pop(inner_id, None)
+                removals.add(inner_id)
+            elif record.get('data'):
+                removals.discard(inner_id)
+                upserts[inner_id] = _row(source, {'inner_id': inner_id, 'data': record['data']})
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f'DELETE FROM {self.table} WHERE source = ? AND inner_id = ?',
+                [(source, inner_id) for inner_id in removals],
+            )
+            self._upsert(upserts.values())
+            if change_id is not None:
+                self._save_position(source, change_id)
+
+    def position(self, source: str) -> int | None:
+        """The changes-feed position the stored offers of ``source`` are current to."""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT change_id FROM {self._positions} WHERE source = ?', (source,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, source: str, inner_id: str) -> dict | None:
+        """A stored offer as a result item ({'inner_id': ..., 'data': {...}})."""
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT data FROM {self.table} WHERE source = ? AND inner_id = ?', (source, str(inner_id))
+            ).fetchone()
+        return {'inner_id': str(inner_id), 'data': json.loads(row[0])} if row else None
+
+    def get_many(self, source: str, inner_ids: Iterable[str]) -> dict:
+        """Stored offer data by inner_id for those of ``inner_ids`` that are stored."""
+        inner_ids = list(dict.fromkeys(map(str, inner_ids)))
+        found = {}
+        with self._lock:
+            # Stay under SQLite's default limit of 999 bound parameters.
+            for start in range(0, len(inner_ids), 900):
+                chunk = inner_ids[start:start + 900]
+                rows = self._conn.execute(
+                    f'SELECT inner_id, data FROM {self.table} WHERE source = ? '
+                    f'AND inner_id IN ({", ".join("?" * len(chunk))})',
+                    (source, *chunk),
+                )
+                found.update((inner_id, json.loads(data)) for inner_id, data in rows)
+        return found
+
+    def offers(self, source: str, **filters) -> Iterator[dict]:
+        """
+        Stored offers of ``source`` as result items, filtered on the indexed columns.
+
+        Filters: mark, model, and year/price/km_age with _from/_to suffixes
+        (inclusive), e.g. ``offers('encar', mark='Kia', year_from=2020)``.
+        """
+        where, args = self._where(source, filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT inner_id, data FROM {self.table} WHERE {where} ORDER BY inner_id', args
+            ).fetchall()
+        for inner_id, data in rows:
+            yield {'inner_id': inner_id, 'data': json.loads(data)}
+
+    def count(self, source: str | None = None) -> int:
+        with self._lock:
+            if source is None:
+                return self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+            return self._conn.execute(f'SELECT COUNT(*) FROM {self.table} WHERE source = ?', (source,)).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def export_parquet(self, path: str, source: str | None = None, batch_size: int = 10_000) -> int:
+        """
+        Write the stored offers to a Parquet file; requires pyarrow.
+
+        Columns are source, inner_id, the indexed fields and ``data`` as a
+        JSON string. Rows are written in batches. Returns the row count.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install 'autoapicom-client[parquet]'") from None
+
+        schema = pa.schema([
+            ('source', pa.string()),
+            ('inner_id', pa.string()),
+            ('mark', pa.string()),
+            ('model', pa.string()),
+            ('year', pa.int64()),
+            ('price', pa.float64()),
+            ('km_age', pa.int64()),
+            ('data', pa.string()),
+        ])
+        query = f'SELECT source, inner_id, mark, model, year, price, km_age, data FROM {self.table}'
+        args = ()
+        if source is not None:
+            query += ' WHERE source = ?'
+            args = (source,)
+
+        written = 0
+        with self._lock:
+            cursor = self._conn.execute(query + ' ORDER BY source, inner_id', args)
+            with pq.ParquetWriter(path, schema) as writer:
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    columns = list(zip(*rows))
+                    writer.write_table(pa.Table.from_arrays(
+                        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                        schema=schema,
+                    ))
+                    written += len(rows)
+        return written
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _upsert(self, rows, table: str | None = None) -> int:
+        rows = list(rows)
+        self._conn.executemany(
+            f'INSERT OR REPLACE INTO {table or self.table} (source, inner_id, mark, model, year, price, km_age, data) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            rows,
+        )
+        return len(rows)
+
+    def _save_position(self, source: str, change_id: int) -> None:
+        self._conn.execute(
+            f'INSERT OR REPLACE INTO {self._positions} (source, change_id) VALUES (?, ?)',
+            (source, change_id),
+        )
+
+    def _where(self, source: str, filters: dict) -> tuple:
+        clauses = ['source = ?']
+        args = [source]
+        for name, value in filters.items():
+            if name in ('mark', 'model'):
+                clauses.append(f'{name} = ?')
+            elif name.endswith('_from') and name[:-5] in RANGE_FIELDS:
+                clauses.append(f'{name[:-5]} >= ?')
+            elif name.endswith('_to') and name[:-3] in RANGE_FIELDS:
+                clauses.append(f'{name[:-3]} <= ?')
+            else:
+                raise TypeError(f'Unknown mirror filter: {name}')
+            args.append(value)
+        return ' AND '.join(clauses), args
+
+
+def _row(source: str, item: dict) -> tuple:
+    data = item.get('data', item)
+    inner_id = item.get('inner_id', data.get('inner_id'))
+    return (
+        source,
+        str(inner_id),
+        data.get('mark'),
+        data.get('model'),
+        _number(data.get('year'), int),
+        _number(data.get('price'), float),
+        _number(data.get('km_age'), int),
+        json.dumps(data, ensure_ascii=False),
+    )
+
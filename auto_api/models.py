@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+# Offer data fields promoted to slots; everything else is kept in Offer.extra.
+OFFER_FIELDS = (
+    'url',
+    'mark',
+    'model',
+    'generation',
+    'configuration',
+    'complectation',
+    'year',
+    'color',
+    'price',
+    'km_age',
+    'engine_type',
+    'transmission_type',
+    'body_type',
+    'seller_type',
+)
+
+
+class Offer:
+    """
+    One listing with its common data fields as attributes.
+
+    Uses __slots__ instead of a per-offer dict; fields outside OFFER_FIELDS
+    live in ``extra``. ``images`` is a tuple; the decoded list is dropped.
+    """
+
+    __slots__ = ('inner_id',) + OFFER_FIELDS + ('images', 'extra')
+
+    def __init__(self, inner_id: str | None = None, images=None, extra: dict | None = None, **fields):
+        self.inner_id = inner_id
+        for name in OFFER_FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError(f'Unknown offer fields: {", ".join(fields)}')
+        self.images = tuple(images or ())
+        self.extra = extra or {}
+
+    @classmethod
+    def from_dict(cls, item: dict) -> Offer:
+        """Build from a result item ({'inner_id': ..., 'data': {...}}) or a bare data dict."""
+        data = item.get('data', item)
+        inner_id = item.get('inner_id', data.get('inner_id'))
+        offer = cls.__new__(cls)
+        offer.inner_id = str(inner_id) if inner_id is not None else None
+        for name in OFFER_FIELDS:
+            setattr(offer, name, data.get(name))
+        offer.images = tuple(data.get('images') or ())
+        offer.extra = {k: v for k, v in data.items() if k not in _PROMOTED}
+        return offer
+
+    def to_dict(self) -> dict:
+        """The result item shape the API returns."""
+        data = dict(self.extra)
+        for name in OFFER_FIELDS:
+            data[name] = getattr(self, name)
+        data['images'] = list(self.images)
+        return {'inner_id': self.inner_id, 'data': data}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Offer):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f'Offer(inner_id={self.inner_id!r}, mark={self.mark!r}, model={self.model!r}, year={self.year!r}, price={self.price!r})'
+
+
+_PROMOTED = frozenset(OFFER_FIELDS) | {'inner_id', 'images'}
+
+
+class Change:
+    """One changes-feed record; ``offer`` is built from its data on first access."""
+
+    __slots__ = ('inner_id', 'change_type', 'id', 'created_at', '_data', '_offer')
+
+    def __init__(self, inner_id: str, change_type: str, id: int | None = None, created_at: str | None = None, data=None):
+        self.inner_id = inner_id
+        self.change_type = change_type
+        self.id = id
+        self.created_at = created_at
+        self._data = data
+        self._offer = None
+
+    @classmethod
+    def from_dict(cls, record: dict) -> Change:
+        inner_id = record.get('inner_id')
+        return cls(
+            str(inner_id) if inner_id is not None else None,
+            record.get('change_type'),
+            record.get('id'),
+            record.get('created_at'),
+            record.get('data'),
+        )
+
+    @property
+    def offer(self) -> Offer | None:
+        if self._offer is None and self._data:
+            self._offer = Offer.from_dict({'inner_id': self.inner_id, 'data': self._data})
+            self._data = None
+        return self._offer
+
+    def to_dict(self) -> dict:
+        record = {'id': self.id, 'inner_id': self.inner_id, 'change_type': self.change_type, 'created_at': self.created_at}
+        offer = self.offer
+        if offer is not None:
+            record['data'] = offer.to_dict()['data']
+        return record
+
+    def __repr__(self) -> str:
+        return f'Change(inner_id={self.inner_id!r}, change_type={self.change_type!r}, id={self.id!r})'
+
+
+class OfferPage:
+    """One get_offers page: ``result`` is a list of Offer, ``meta`` the raw pagination dict."""
+
+    __slots__ = ('result', 'meta')
+
+    def __init__(self, result: list, meta: dict):
+        self.result = result
+        self.meta = meta
+
+    @classmethod
+    def from_dict(cls, page: dict) -> OfferPage:
+        return cls([Offer.from_dict(item) for item in page.get('result') or ()], page.get('meta') or {})
+
+    @property
+    def page(self) -> int | None:
+        return self.meta.get('page')
+
+    @property
+    def next_page(self) -> int | None:
+        return self.meta.get('next_page')
+
+    def __iter__(self) -> Iterator[Offer]:
+        return iter(self.result)
+
+    def __len__(self) -> int:
+        return len(self.result)
+
+
+class ChangesPage:
+    """One get_changes batch: ``result`` is a list of Change, ``meta`` the raw dict."""
+
+    __slots__ = ('result', 'meta')
+
+    def __init__(self, result: list, meta: dict):
+        self.result = result
+        self.meta = meta
+
+    @classmethod
+    def from_dict(cls, page: dict) -> ChangesPage:
+        return cls([Change.from_dict(record) for record in page.get('result') or ()], page.get('meta') or {})
+
+    @property
+    def next_change_id(self) -> int | None:
+        return self.meta.get('next_change_id')
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.result)
+
+    def __len__(self) -> int:
+        return len(self.result)
+
+
+def page_parts(page) -> tuple:
+    """(result, meta) of a page, whether it is a raw dict or an OfferPage/ChangesPage."""
+    if isinstance(page, dict):
+        return page.get('result') or [], page.get('meta') or {}
+    return page.result, page.meta
+
+
+def _item_dict(item) -> dict:
+    return item if isinstance(item, dict) else item.to_dict()
+
+
+def _number(value, kind):
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
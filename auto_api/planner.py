@@ -0,0 +1,271 @@
+"""
+Splitting a get_offers query into shards small enough to crawl exhaustively.
+
+Paging deep into a broad query is slow, and the listing shifts underneath a
+long crawl. CrawlPlanner splits the query space with get_filters values
+(brand, model, body type, ...) and by bisecting the year, price and mileage
+ranges until every shard lists at most ``max_pages`` pages. The shards are
+crawled in parallel, each resumable from its own checkpoint, and offers
+that show up in more than one shard are yielded once.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
+from urllib.parse import urlencode
+
+from .models import page_parts
+from .query import EQUALITY_FILTERS, RANGE_FILTERS
+
+# get_filters keys of the filter dimensions whose name differs from the get_offers param.
+_FILTER_KEYS = {'brand': 'mark', 'transmission': 'transmission_type'}
+
+DIMENSIONS = ('brand', 'year', 'price', 'mileage')
+
+# Bounds a range dimension is bisected from when the query does not set them.
+RANGES = {
+    'year': (1900, datetime.date.today().year + 1),
+    'price': (0, 1_000_000_000),
+    'mileage': (0, 10_000_000),
+}
+
+
+class Shard:
+    """
+    One slice of the query space: get_offers filter params without ``page``.
+
+    ``oversized`` is set when the planner ran out of ways to split the
+    shard and it still lists more than ``max_pages`` pages.
+    """
+
+    __slots__ = ('params', 'oversized')
+
+    def __init__(self, params: dict, oversized: bool = False):
+        self.params = params
+        self.oversized = oversized
+
+    @property
+    def key(self) -> str:
+        """Stable identity of the shard, used as its checkpoint key."""
+        return urlencode(sorted(self.params.items()))
+
+    def to_dict(self) -> dict:
+        return {'params': self.params, 'oversized': self.oversized}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Shard:
+        return cls(dict(data['params']), data.get('oversized', False))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Shard) and (self.params, self.oversized) == (other.params, other.oversized)
+
+    def __repr__(self) -> str:
+        return f'Shard({self.params!r}, oversized={self.oversized!r})'
+
+
+class CrawlPlan:
+    """
+    The shards covering one get_offers query of a source.
+
+    Save it next to the crawl checkpoint: re-planning a shifting listing
+    can give different shards, whose checkpoints would not line up.
+    """
+
+    def __init__(self, source: str, shards: list, probes: int = 0):
+        self.source = source
+        self.shards = shards
+        self.probes = probes
+
+    def __len__(self) -> int:
+        return len(self.shards)
+
+    def __iter__(self) -> Iterator[Shard]:
+        return iter(self.shards)
+
+    def to_dict(self) -> dict:
+        return {'source': self.source, 'shards': [shard.to_dict() for shard in self.shards]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CrawlPlan:
+        return cls(data['source'], [Shard.from_dict(shard) for shard in data['shards']])
+
+    def save(self, path: str) -> None:
+        """Write the plan as JSON, atomically (temporary file renamed over ``path``)."""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> CrawlPlan:
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self) -> str:
+        oversized = sum(1 for shard in self.shards if shard.oversized)
+        return f'CrawlPlan({self.source!r}, shards={len(self.shards)}, oversized={oversized})'
+
+
+class CrawlPlanner:
+    """
+    Plans and runs exhaustive crawls of get_offers queries.
+
+    ``plan`` probes page ``max_pages`` of the query: when it has a next
+    page, the query is split along the first of ``dimensions`` that can
+    still split it and each part is probed the same way. A filter
+    dimension (brand, model, body_type, engine_type, transmission, color)
+    splits into one shard per get_filters value, once; model needs brand
+    to be set first. A range dimension (year, price, mileage) is halved as
+    often as needed, starting from the query's own bounds or ``ranges``;
+    a bound the query leaves open stays open on the outermost shards, so
+    offers beyond ``ranges`` are still covered.
+    Probes of one level run on ``concurrency`` threads.
+
+    Splitting only reaches offers that have the field: an offer with no
+    price, or with a body type missing from get_filters, is in no shard
+    once the query is split on that dimension. Range bounds are inclusive
+    and halved as integers.
+
+    ``crawl`` pages through the shards, ``concurrency`` of them at a time.
+    With a ``checkpoint`` (any CheckpointStore) each shard's next page is
+    saved after its items have been consumed, 0 once it is finished, so a
+    restarted crawl skips finished shards and resumes the others where
+    they were. Offers are deduplicated on inner_id through ``seen``; pass
+    a persistent set-like object to keep that across restarts.
+    """
+
+    def __init__(
+        self,
+        client,
+        max_pages: int = 50,
+        dimensions: Iterable[str] = DIMENSIONS,
+        ranges: dict | None = None,
+        concurrency: int = 4,
+    ):
+        if max_pages < 1:
+            raise ValueError('max_pages must be 1 or greater')
+        dimensions = tuple(dimensions)
+        for dimension in dimensions:
+            if dimension not in EQUALITY_FILTERS and dimension not in RANGE_FILTERS:
+                raise ValueError(f'Unknown dimension {dimension!r}')
+        self.client = client
+        self.max_pages = max_pages
+        self.dimensions = dimensions
+        self.ranges = {**RANGES, **(ranges or {})}
+        self.concurrency = concurrency
+        self._filters = {}
+
+    def plan(self, source: str, **params) -> CrawlPlan:
+        """Shards of at most ``max_pages`` pages (unless oversized) that together cover the query."""
+        if 'page' in params:
+            raise TypeError('plan() covers the whole listing; page is not accepted')
+
+        shards = []
+        probes = 0
+        frontier = [params]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while frontier:
+                fits = list(pool.map(lambda query: self._fits(source, query), frontier))
+                probes += len(frontier)
+                next_frontier = []
+                for query, fit in zip(frontier, fits):
+                    parts = None if fit else self._split(source, query)
+                    if parts is None:
+                        shards.append(Shard(query, oversized=not fit))
+                    else:
+                        next_frontier.extend(parts)
+                frontier = next_frontier
+        return CrawlPlan(source, shards, probes)
+
+    def crawl(self, plan: CrawlPlan, checkpoint=None, seen=None) -> Iterator:
+        """Every offer of the plan's shards, each inner_id once, in no particular order."""
+        seen = set() if seen is None else seen
+        queue = []
+        for shard in plan:
+            page = checkpoint.load(self._checkpoint_key(plan, shard)) if checkpoint is not None else None
+            if page != 0:
+                queue.append((shard, page or 1))
+        queue.reverse()
+
+        pending = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+
+            def submit(shard: Shard, page: int) -> None:
+                future = pool.submit(self.client.get_offers, plan.source, page=page, **shard.params)
+                pending[future] = shard
+
+            try:
+                while queue and len(pending) < self.concurrency:
+                    submit(*queue.pop())
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        shard = pending.pop(future)
+                        items, meta = page_parts(future.result())
+                        next_page = meta.get('next_page') if items else None
+                        # Keep the pool busy while this page is consumed.
+                        if next_page:
+                            submit(shard, next_page)
+                        elif queue:
+                            submit(*queue.pop())
+
+                        for item in items:
+                            inner_id = _inner_id(item)
+                            if inner_id in seen:
+                                continue
+                            seen.add(inner_id)
+                            yield item
+
+                        if checkpoint is not None:
+                            checkpoint.save(self._checkpoint_key(plan, shard), next_page or 0)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _fits(self, source: str, params: dict) -> bool:
+        _, meta = page_parts(self.client.get_offers(source, page=self.max_pages, **params))
+        return not meta.get('next_page')
+
+    def _split(self, source: str, params: dict) -> list | None:
+        for dimension in self.dimensions:
+            if dimension in RANGE_FILTERS:
+                start, end = f'{dimension}_from', f'{dimension}_to'
+                low, high = self.ranges[dimension]
+                low = int(params.get(start, low))
+                high = int(params.get(end, high))
+                if low < high:
+                    middle = (low + high) // 2
+                    # A bound the query leaves open stays open on the outer half.
+                    return [{**params, end: middle}, {**params, start: middle + 1}]
+            elif dimension not in params:
+                values = self._values(source, dimension, params)
+                if values:
+                    return [{**params, dimension: value} for value in values]
+        return None
+
+    def _values(self, source: str, dimension: str, params: dict) -> list:
+        filters = self._filters.get(source)
+        if filters is None:
+            filters = self._filters[source] = self.client.get_filters(source)
+        if dimension == 'model':
+            marks = filters.get('mark')
+            if 'brand' not in params or not isinstance(marks, dict):
+                return []
+            return list(marks.get(params['brand']) or [])
+        return list(filters.get(_FILTER_KEYS.get(dimension, dimension)) or [])
+
+    def _checkpoint_key(self, plan: CrawlPlan, shard: Shard) -> str:
+        return f'{plan.source}:{shard.key}'
+
+
+def _inner_id(item) -> str:
+    if isinstance(item, dict):
+        return str(item.get('inner_id'))
+    return str(item.inner_id)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Iterable
+
+from .models import _item_dict, _number
+
+# get_offers filter -> offer data field, matched exactly.
+EQUALITY_FILTERS = {
+    'brand': 'mark',
+    'model': 'model',
+    'configuration': 'configuration',
+    'complectation': 'complectation',
+    'body_type': 'body_type',
+    'engine_type': 'engine_type',
+    'transmission': 'transmission_type',
+    'color': 'color',
+}
+
+# get_offers range filter prefix -> offer data field; used as <prefix>_from / <prefix>_to, inclusive.
+RANGE_FILTERS = {
+    'year': 'year',
+    'mileage': 'km_age',
+    'price': 'price',
+}
+
+
+class OfferIndex:
+    """
+    In-memory offers answering get_offers queries locally.
+
+    Each loaded source is stored column-wise: a value -> positions index per
+    equality filter and a sorted (value, position) index per range filter.
+    A query starts from the smallest matching index slice and checks the
+    remaining filters against the columns, so it touches only candidate
+    rows; the matches of recent queries are kept so paging through them
+    costs a slice per page. ``get_offers`` takes the same filters as Client.get_offers and
+    returns the same {'result', 'meta'} shape. Returned items are shared
+    with the index and must be treated as read-only.
+    """
+
+    def __init__(self, page_size: int = 20):
+        self.page_size = page_size
+        self._sources = {}
+
+    @classmethod
+    def from_mirror(cls, mirror, sources: Iterable[str], page_size: int = 20) -> OfferIndex:
+        """Load the given sources from a Mirror."""
+        index = cls(page_size)
+        for source in sources:
+            index.load(source, mirror.offers(source))
+        return index
+
+    def load(self, source: str, items: Iterable) -> None:
+        """Replace the offers of ``source`` with ``items`` (result items or Offer models)."""
+        self._sources[source] = _Columns([_item_dict(item) for item in items])
+
+    def get_offers(self, source: str, page: int = 1, **params) -> dict:
+        """
+        One page of offers matching the get_offers filters.
+
+        Params: page, brand, model, configuration, complectation,
+        transmission, color, body_type, engine_type, year_from, year_to,
+        mileage_from, mileage_to, price_from, price_to
+        """
+        if page < 1:
+            raise ValueError('page must be 1 or greater')
+
+        columns = self._sources.get(source)
+        if columns is None:
+            return {'result': [], 'meta': {'page': page, 'next_page': None}}
+
+        matches = columns.query(params)
+        start = (page - 1) * self.page_size
+        end = start + self.page_size
+        return {
+            'result': [columns.items[position] for position in matches[start:end]],
+            'meta': {'page': page, 'next_page': page + 1 if end < len(matches) else None},
+        }
+
+    def count(self, source: str, **params) -> int:
+        """Number of offers of ``source`` matching the filters."""
+        columns = self._sources.get(source)
+        return len(columns.query(params)) if columns is not None else 0
+
+
+class _Columns:
+    __slots__ = ('items', 'values', 'postings', 'numbers', 'sorted', '_recent')
+
+    # Matches of this many recent queries are kept for paging.
+    recent_size = 64
+
+    def __init__(self, items: list):
+        self.items = items
+        self._recent = OrderedDict()
+        data = [item.get('data', item) for item in items]
+
+        self.values = {}
+        self.postings = {}
+        for field in EQUALITY_FILTERS.values():
+            column = [row.get(field) for row in data]
+            postings = {}
+            for position, value in enumerate(column):
+                if isinstance(value, (str, int, float)):
+                    postings.setdefault(value, array('l')).append(position)
+            self.values[field] = column
+            self.postings[field] = postings
+
+        self.numbers = {}
+        self.sorted = {}
+        for field in RANGE_FILTERS.values():
+            column = [_number(row.get(field), float) for row in data]
+            pairs = sorted((value, position) for position, value in enumerate(column) if value is not None)
+            self.numbers[field] = column
+            self.sorted[field] = ([value for value, _ in pairs], array('l', [position for _, position in pairs]))
+
+    def query(self, params: dict):
+        equal = {}
+        ranges = {}
+        for name, value in params.items():
+            if value is None:
+                continue
+            if name in EQUALITY_FILTERS:
+                equal[EQUALITY_FILTERS[name]] = value
+            elif name.endswith('_from') and name[:-5] in RANGE_FILTERS:
+                ranges.setdefault(RANGE_FILTERS[name[:-5]], [None, None])[0] = float(value)
+            elif name.endswith('_to') and name[:-3] in RANGE_FILTERS:
+                ranges.setdefault(RANGE_FILTERS[name[:-3]], [None, None])[1] = float(value)
+            else:
+                raise TypeError(f'Unknown get_offers filter: {name}')
+
+        if not equal and not ranges:
+            return range(len(self.items))
+
+        key = (tuple(sorted(equal.items())), tuple(sorted((field, tuple(bounds)) for field, bounds in ranges.items())))
+        matches = self._recent.get(key)
+        if matches is None:
+            matches = self._recent[key] = self._match(equal, ranges)
+            if len(self._recent) > self.recent_size:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(key)
+        return matches
+
+    def _match(self, equal: dict, ranges: dict) -> list:
+        slices = [self.postings[field].get(value, ()) for field, value in equal.items()]
+        for field, (low, high) in ranges.items():
+            values, positions = self.sorted[field]
+            i = bisect_left(values, low) if low is not None else 0
+            j = bisect_right(values, high) if high is not None else len(values)
+            slices.append(positions[i:j])
+
+        candidates = min(slices, key=len)
+        checks = [(self.values[field], value) for field, value in equal.items()]
+        bounds = [(self.numbers[field], low, high) for field, (low, high) in ranges.items()]
+
+        matches = []
+        for position in candidates:
+            if any(column[position] != value for column, value in checks):
+                continue
+            if any(not _within(column[position], low, high) for column, low, high in bounds):
+                continue
+            matches.append(position)
+        # Range slices come out in value order; pages follow load order.
+        matches.sort()
+        return matches
+
+
+def _within(value: float | None, low: float | None, high: float | None) -> bool:
+    if value is None:
+        return False
+    return (low is None or value >= low) and (high is None or value <= high)
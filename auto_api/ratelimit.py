@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts of up to ``burst``.
+
+    Thread-safe; share one instance between clients to enforce a common
+    budget. Callers that find the bucket empty are queued: each reservation
+    returns how long that caller has to wait for its token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._tokens = self.burst
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            self._sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on the number of requests in flight.
+
+    Every successful request raises the limit by ``increase / limit`` (about
+    ``increase`` per full window of requests); an overload signal (429, 503,
+    timeout) multiplies it by ``decrease``, at most once per ``cooldown``
+    seconds so one burst of failures only counts once.
+    """
+
+    def __init__(
+        self,
+        initial: float = 8,
+        minimum: float = 1,
+        maximum: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = None
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        """Block until the number of requests in flight is below the limit."""
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, overloaded: bool = False) -> None:
+        """Finish a request and adjust the limit from its outcome."""
+        with self._cond:
+            self.in_flight -= 1
+            if overloaded:
+                now = self._clock()
+                if self._last_decrease is None or now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+            self._cond.notify_all()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from typing import Callable
+
+from .errors import ApiError, AuthError, NetworkError
+
+# Statuses worth retrying: rate limiting and transient server/gateway failures.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryBudget:
+    """
+    Caps retries across all calls of a client to a fraction of its requests.
+
+    Every request earns ``ratio`` of a retry (up to ``max_tokens``) and every
+    retry spends one; ``min_tokens`` are available from the start. When the
+    API is down this turns retry storms into fast failures.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 10, max_tokens: float = 100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying an idempotent GET.
+
+    Retries network errors and RETRY_STATUSES (never AuthError) up to
+    ``max_attempts`` attempts in total, waiting a random time between 0 and
+    ``backoff * 2 ** retry`` seconds capped at ``max_backoff`` (full jitter),
+    or the server's Retry-After when given; a Retry-After longer than
+    ``max_backoff`` gives up instead of waiting. A retry that would end past
+    ``deadline`` seconds from the first attempt, or that ``budget`` cannot
+    pay for, is not made and the last error is raised.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        deadline: float | None = None,
+        statuses: tuple = RETRY_STATUSES,
+        budget: RetryBudget | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.statuses = statuses
+        self.budget = budget
+        self.sleep = sleep
+        self.clock = clock
+        self.jitter = jitter
+
+    def is_retryable(self, error: ApiError) -> bool:
+        if isinstance(error, AuthError):
+            return False
+        return isinstance(error, NetworkError) or error.status_code in self.statuses
+
+    def delay(self, retry: int, error: ApiError, headers=None, elapsed: float = 0.0) -> float | None:
+        """Seconds to wait before retry number ``retry`` (0-based), or None to give up."""
+        if retry + 1 >= self.max_attempts or not self.is_retryable(error):
+            return None
+
+        delay = parse_retry_after(headers.get('Retry-After')) if headers is not None else None
+        if delay is not None and delay > self.max_backoff:
+            return None
+        if delay is None:
+            delay = self.jitter() * min(self.max_backoff, self.backoff * 2 ** retry)
+
+        if self.deadline is not None and elapsed + delay >= self.deadline:
+            return None
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+        return delay
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
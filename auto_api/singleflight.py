@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Hashable
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time across threads.
+
+    A caller arriving while a call with the same key is in flight waits for
+    it and gets the same result (or exception) instead of making its own
+    call. ``calls`` counts the calls actually made, ``coalesced`` the
+    callers that shared one.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._in_flight)}
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop.
+
+    The shared call runs as its own task, so cancelling one waiting caller
+    does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        # Imported here: asyncio takes longer to import than the whole sync client.
+        import asyncio
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._in_flight)}
+
+    def _forget(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
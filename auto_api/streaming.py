@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import re
+from typing import Callable, Iterable, Iterator
+
+from .decoders import Decoder
+from .errors import ApiError
+
+_WHITESPACE = b' \t\r\n'
+_HEAD_TOKENS = re.compile(rb'["{}\[\]:,]')
+_CONTAINER_TOKENS = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb'[,\]\s]')
+
+
+class ResultStream:
+    """
+    Iterates the items of a response's top-level ``result`` array while it downloads.
+
+    Chunks are scanned for item boundaries and each complete item is decoded
+    on its own, so memory holds about one item (plus one chunk) instead of
+    the whole page. Everything outside the array is decoded once the body
+    ends; ``meta`` is available after the stream has been exhausted.
+    Malformed or truncated bodies raise ApiError.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        decoder: Decoder,
+        item_factory: Callable | None = None,
+        on_close: Callable[[], None] | None = None,
+        status_code: int = 200,
+    ):
+        self.meta = None
+        self.envelope = None
+        self._chunks = iter(chunks)
+        self._decoder = decoder
+        self._item_factory = item_factory
+        self._on_close = on_close
+        self._status_code = status_code
+        self._iterator = self._items()
+
+    def __iter__(self) -> Iterator:
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def __enter__(self) -> ResultStream:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop reading and release the underlying response."""
+        self._iterator.close()
+
+    def _items(self) -> Iterator:
+        buf = bytearray()
+        rest = bytearray()
+        try:
+            for item in _scan(self._chunks, buf, rest):
+                value = self._decoder(item)
+                yield self._item_factory(value) if self._item_factory is not None else value
+
+            envelope = self._decoder(bytes(rest)) if rest.strip() else {}
+            if not isinstance(envelope, dict):
+                raise ValueError('Response body is not a JSON object')
+            envelope.pop('result', None)
+            self.envelope = envelope
+            self.meta = envelope.get('meta') or {}
+        except ValueError as e:
+            raise ApiError(f'Invalid JSON response: {e}', self._status_code) from e
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+
+
+def _string_end(buf: bytearray, start: int) -> int | None:
+    """Index just past the string opening at ``start``, or None if it is incomplete."""
+    j = start + 1
+    while True:
+        j = buf.find(b'"', j)
+        if j < 0:
+            return None
+        backslashes = 0
+        k = j - 1
+        while buf[k] == 0x5C:  # backslash
+            backslashes += 1
+            k -= 1
+        if backslashes % 2 == 0:
+            return j + 1
+        j += 1
+
+
+def _scan(chunks: Iterator[bytes], buf: bytearray, rest: bytearray) -> Iterator[bytes]:
+    """
+    Yield the raw bytes of each item of the top-level "result" array.
+
+    Bytes outside that array are copied to ``rest`` with the array left
+    empty, so ``rest`` ends up as the JSON envelope without the items.
+    """
+    mode = 'head'
+    pos = 0
+    depth = 0
+    last_string = None
+    key = None
+    item_start = None
+    eof = False
+
+    while True:
+        progressed = True
+        while progressed:
+            progressed = False
+
+            if mode == 'head':
+                match = _HEAD_TOKENS.search(buf, pos)
+                if match is None:
+                    break
+                i = match.start()
+                char = buf[i]
+                if char == 0x22:  # "
+                    end = _string_end(buf, i)
+                    if end is None:
+                        break
+                    if depth == 1:
+                        last_string = bytes(buf[i + 1:end - 1])
+                    pos = end
+                elif char == 0x3A:  # :
+                    if depth == 1:
+                        key = last_string
+                    pos = i + 1
+                elif char == 0x2C:  # ,
+                    if depth == 1:
+                        key = None
+                    pos = i + 1
+                elif char in b'{[':
+                    if depth == 1 and key == b'result' and char == 0x5B:
+                        rest += buf[:i + 1]
+                        del buf[:i + 1]
+                        pos = 0
+                        depth = 2
+                        mode = 'items'
+                    else:
+                        depth += 1
+                        pos = i + 1
+                else:
+                    depth -= 1
+                    pos = i + 1
+                progressed = True
+
+            elif mode == 'items':
+                if item_start is None:
+                    while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == 0x2C):
+                        pos += 1
+                    if pos >= len(buf):
+                        break
+                    if buf[pos] == 0x5D:  # ] closes the result array
+                        del buf[:pos]
+                        pos = 0
+                        depth = 1
+                        mode = 'tail'
+                        progressed = True
+                        continue
+                    item_start = pos
+                    if buf[pos] in b'{[':
+                        depth += 1
+                        pos += 1
+
+                item_end = None
+                if depth == 2:
+                    # Scalar item: a string, number or literal.
+                    if buf[item_start] == 0x22:
+                        item_end = _string_end(buf, item_start)
+                    else:
+                        match = _SCALAR_END.search(buf, item_start)
+                        item_end = match.start() if match else (len(buf) if eof else None)
+                    if item_end is None:
+                        break
+                else:
+                    while depth > 2:
+                        match = _CONTAINER_TOKENS.search(buf, pos)
+                        if match is None:
+                            break
+                        i = match.start()
+                        if buf[i] == 0x22:
+                            end = _string_end(buf, i)
+                            if end is None:
+                                break
+                            pos = end
+                        elif buf[i] in b'{[':
+                            depth += 1
+                            pos = i + 1
+                        else:
+                            depth -= 1
+                            pos = i + 1
+                    if depth > 2:
+                        break
+                    item_end = pos
+
+                yield bytes(buf[item_start:item_end])
+                del buf[:item_end]
+                pos = 0
+                item_start = None
+                progressed = True
+
+            else:
+                rest += buf
+                del buf[:]
+
+        if eof:
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+        else:
+            buf += chunk
+
+    if mode == 'items':
+        raise ValueError('Truncated response: the result array was not closed')
+    rest += buf
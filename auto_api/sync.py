@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator
+
+from .changes import CheckpointStore, resolve_change_id
+from .errors import ApiError, AuthError
+from .models import page_parts
+
+
+class _SourceState:
+    """Position, buffered batches and health of one source's changes feed."""
+
+    def __init__(self, source: str, change_id: int, now: float):
+        self.source = source
+        self.change_id = change_id  # first change_id not yet consumed
+        self.fetch_id = change_id  # next change_id to request
+        self.batches = deque()  # (records, next_change_id)
+        self.in_flight = None
+        self.next_poll = now
+        self.interval = 0.0
+        self.at_head = False
+        self.behind_since = now
+        self.consumed = 0
+        self.errors = 0
+        self.last_error = None
+
+    @property
+    def done(self) -> bool:
+        return self.fetch_id is None and self.in_flight is None and not self.batches
+
+
+class SyncEngine:
+    """
+    Follows the changes feeds of several sources from one process.
+
+    Each source has at most one get_changes request in flight and at most
+    ``prefetch`` batches buffered, and requests are dispatched round-robin
+    across sources on a pool of ``max_concurrency`` threads, so a busy source
+    cannot starve the others. Iterating the engine yields ``(source, change)``
+    pairs, one batch per source in turn; after a batch has been consumed its
+    next_change_id is saved to ``checkpoint`` under the source name.
+
+    ``start`` is a change_id, a yyyy-mm-dd date, or a dict of those per
+    source; it is only used for sources without a checkpoint.
+    """
+
+    def __init__(
+        self,
+        client,
+        sources: Iterable[str],
+        start=None,
+        checkpoint: CheckpointStore | None = None,
+        max_concurrency: int = 4,
+        prefetch: int = 2,
+        poll_interval: float = 5.0,
+        max_interval: float = 60.0,
+        stop_at_head: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.sources = list(sources)
+        self.start = start
+        self.checkpoint = checkpoint
+        self.max_concurrency = max_concurrency
+        self.prefetch = prefetch
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.stop_at_head = stop_at_head
+        self._clock = clock
+        self._sleep = sleep
+        self._states = []
+        self._dispatch_cursor = 0
+        self._consume_cursor = 0
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self.run()
+
+    def lag(self) -> dict:
+        """Seconds each source has been behind the head of its feed (0 while caught up)."""
+        now = self._clock()
+        return {
+            state.source: 0.0 if state.at_head and not state.batches else now - state.behind_since
+            for state in self._states
+        }
+
+    def stats(self) -> dict:
+        """Per-source position, buffered and consumed record counts, errors and lag."""
+        lag = self.lag()
+        return {
+            state.source: {
+                'change_id': state.change_id,
+                'pending': sum(len(records) for records, _ in state.batches),
+                'consumed': state.consumed,
+                'errors': state.errors,
+                'last_error': state.last_error,
+                'lag': lag[state.source],
+            }
+            for state in self._states
+        }
+
+    def run(self) -> Iterator[tuple]:
+        self._states = [_SourceState(source, self._initial_change_id(source), self._clock()) for source in self.sources]
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            try:
+                while True:
+                    self._collect()
+                    self._dispatch(pool)
+
+                    state = self._next_ready()
+                    if state is not None:
+                        records, next_change_id = state.batches.popleft()
+                        self._dispatch(pool)
+
+                        for record in records:
+                            yield state.source, record
+
+                        state.consumed += len(records)
+                        if next_change_id is not None:
+                            state.change_id = next_change_id
+                            if self.checkpoint is not None:
+                                self.checkpoint.save(state.source, next_change_id)
+                        continue
+
+                    if all(state.done or (self.stop_at_head and state.at_head and state.in_flight is None)
+                           for state in self._states):
+                        return
+
+                    self._wait()
+            finally:
+                for state in self._states:
+                    if state.in_flight is not None:
+                        state.in_flight.cancel()
+
+    def _initial_change_id(self, source: str) -> int:
+        if self.checkpoint is not None:
+            change_id = self.checkpoint.load(source)
+            if change_id is not None:
+                return change_id
+
+        start = self.start.get(source) if isinstance(self.start, dict) else self.start
+        if start is None:
+            raise ValueError(f'start is required for {source}: it has no checkpoint')
+        return resolve_change_id(self.client, source, start)
+
+    def _dispatch(self, pool: ThreadPoolExecutor) -> None:
+        now = self._clock()
+        in_flight = sum(1 for state in self._states if state.in_flight is not None)
+        count = len(self._states)
+        first = self._dispatch_cursor
+
+        for offset in range(count):
+            if in_flight >= self.max_concurrency:
+                break
+            state = self._states[(first + offset) % count]
+            if (
+                state.in_flight is None
+                and state.fetch_id is not None
+                and len(state.batches) < self.prefetch
+                and now >= state.next_poll
+                and not (self.stop_at_head and state.at_head)
+            ):
+                state.in_flight = pool.submit(self.client.get_changes, state.source, state.fetch_id)
+                in_flight += 1
+                self._dispatch_cursor = (first + offset + 1) % count
+
+    def _collect(self) -> None:
+        now = self._clock()
+        for state in self._states:
+            future = state.in_flight
+            if future is None or not future.done():
+                continue
+            state.in_flight = None
+
+            try:
+                batch = future.result()
+            except AuthError:
+                raise
+            except (ApiError, OSError) as e:
+                state.errors += 1
+                state.last_error = e
+                self._back_off(state, now)
+                continue
+
+            records, meta = page_parts(batch)
+            next_change_id = meta.get('next_change_id')
+
+            if not records:
+                state.at_head = True
+                state.fetch_id = next_change_id or state.fetch_id
+                self._back_off(state, now)
+                continue
+
+            if state.at_head:
+                state.at_head = False
+                state.behind_since = now
+            state.interval = 0.0
+            state.batches.append((records, next_change_id))
+            state.fetch_id = next_change_id
+
+    def _back_off(self, state: _SourceState, now: float) -> None:
+        state.interval = min(max(state.interval * 2, self.poll_interval), self.max_interval)
+        state.next_poll = now + state.interval
+
+    def _next_ready(self) -> _SourceState | None:
+        count = len(self._states)
+        for offset in range(count):
+            state = self._states[(self._consume_cursor + offset) % count]
+            if state.batches:
+                self._consume_cursor = (self._consume_cursor + offset + 1) % count
+                return state
+        return None
+
+    def _wait(self) -> None:
+        futures = [state.in_flight for state in self._states if state.in_flight is not None]
+        now = self._clock()
+        polls = [
+            state.next_poll - now
+            for state in self._states
+            if state.in_flight is None and state.fetch_id is not None and not (self.stop_at_head and state.at_head)
+        ]
+        timeout = max(min(polls), 0.0) if polls and len(futures) < self.max_concurrency else None
+
+        if futures:
+            wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        elif timeout:
+            self._sleep(timeout)
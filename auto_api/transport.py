@@ -0,0 +1,421 @@
+"""
+How a Client puts requests on the wire.
+
+Client talks to a Transport through get() and post(), which take
+requests-style keyword arguments (params, json, headers, timeout, stream)
+and return a response with ``status_code``, ``headers``, ``content``,
+``iter_content(chunk_size)``, ``close()`` and, optionally, ``elapsed``
+and ``reason``. Client reads nothing else: error messages, including the
+one for a body that is not JSON, are built from ``content``.
+Each transport lists the exceptions that mean a timeout or a failed
+connection; Client turns them into NetworkError.
+"""
+
+from __future__ import annotations
+
+import datetime
+import http.client
+import json
+import socket
+import threading
+import time
+import zlib
+from typing import Iterator
+from urllib.parse import urlencode, urlsplit
+
+
+class Transport:
+    """Base class for Client transports; see the module docstring for the contract."""
+
+    # Raised when a request or a read timed out.
+    timeout_errors: tuple = ()
+    # Raised when a request failed before a response arrived.
+    connection_errors: tuple = ()
+    # Raised while reading a streamed body.
+    stream_errors: tuple = ()
+
+    def get(self, url: str, **kwargs):
+        raise NotImplementedError
+
+    def post(self, url: str, **kwargs):
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    The default: a requests.Session with a keep-alive connection pool.
+
+    ``session`` is the Session itself, for mounting adapters or patching in
+    tests; Client exposes it as ``client.session``.
+    """
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False, keep_alive: bool = True):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.request import ACCEPT_ENCODING
+
+        self.timeout_errors = (requests.Timeout,)
+        # The last two: the connection broke, or the body was corrupt, while the body was being read.
+        self.connection_errors = (
+            requests.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.ContentDecodingError,
+        )
+        self.stream_errors = (requests.RequestException,)
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if not keep_alive:
+            self.session.headers['Connection'] = 'close'
+        # Every encoding urllib3 can decode here: gzip and deflate, plus br and zstd when installed.
+        self.session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+
+    def get(self, url: str, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class UrllibTransport(Transport):
+    """
+    Standard-library transport on http.client, for short-lived processes.
+
+    Avoids importing requests and urllib3 altogether, which makes
+    ``import auto_api`` plus the first request noticeably faster. Each
+    thread keeps one keep-alive connection per host; streamed responses get
+    a connection of their own. Decodes gzip and deflate.
+    """
+
+    timeout_errors = (socket.timeout,)
+    connection_errors = (OSError, http.client.HTTPException, zlib.error)
+    stream_errors = (OSError, http.client.HTTPException, zlib.error)
+
+    def __init__(self, keep_alive: bool = True, user_agent: str = 'autoapicom-client'):
+        self.keep_alive = keep_alive
+        self.headers = {'User-Agent': user_agent, 'Accept-Encoding': 'gzip, deflate', 'Accept': '*/*'}
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+        self._local = threading.local()
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> UrllibResponse:
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params, doseq=True)
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url: str, json: dict | None = None, **kwargs) -> UrllibResponse:
+        return self._request('POST', url, body=_json_body(json), **kwargs)
+
+    def close(self) -> None:
+        """Close the calling thread's idle connections."""
+        connections = getattr(self._local, 'connections', {})
+        for conn in connections.values():
+            conn.close()
+        connections.clear()
+
+    def _request(self, method, url, body=None, headers=None, timeout=None, stream=False) -> UrllibResponse:
+        parts = urlsplit(url)
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        request_headers = dict(self.headers)
+        if body is not None:
+            request_headers['Content-Type'] = 'application/json'
+        request_headers.update(headers or {})
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+        key = (parts.scheme, parts.netloc)
+        pooled = self.keep_alive and not stream
+        connections = self._connections()
+        conn = connections.pop(key, None) if pooled else None
+        reused = conn is not None
+        if conn is None:
+            conn = _connection(parts, connect_timeout)
+
+        started = time.perf_counter()
+        try:
+            if conn.sock is None:
+                conn.connect()
+            conn.sock.settimeout(read_timeout)
+            conn.request(method, target, body, request_headers)
+            raw = conn.getresponse()
+        except (ConnectionError, http.client.RemoteDisconnected, http.client.CannotSendRequest):
+            conn.close()
+            if not reused:
+                raise
+            # The server closed the idle keep-alive connection: resend once on a new one.
+            return self._request(method, url, body, headers, timeout, stream)
+        except BaseException:
+            conn.close()
+            raise
+        elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+
+        if stream:
+            # The connection belongs to the response until it is closed.
+            return UrllibResponse(raw, elapsed, conn)
+        response = UrllibResponse(raw, elapsed)
+        try:
+            response.read()
+        except BaseException:
+            conn.close()
+            raise
+        if pooled and not raw.will_close:
+            connections[key] = conn
+        else:
+            conn.close()
+        return response
+
+    def _connections(self) -> dict:
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        return connections
+
+
+class HTTP2Transport(Transport):
+    """
+    httpx client speaking HTTP/2, multiplexing concurrent requests.
+
+    Over https the requests in flight to a host run as streams on a shared
+    connection, so raising a client's concurrency costs no extra sockets or
+    handshakes; up to ``max_connections`` are kept open. Plain http URLs
+    fall back to HTTP/1.1. Thread-safe. Requires the ``http2`` extra (httpx
+    and h2).
+    """
+
+    def __init__(self, max_connections: int = 4, keepalive_expiry: float = 30.0, keep_alive: bool = True):
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("HTTP2Transport requires httpx: pip install 'autoapicom-client[http2]'") from None
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            raise ImportError("HTTP2Transport requires h2: pip install 'autoapicom-client[http2]'") from None
+
+        self._httpx = httpx
+        self.timeout_errors = (httpx.TimeoutException,)
+        self.connection_errors = (httpx.TransportError, httpx.DecodingError)
+        self.stream_errors = (httpx.TransportError, httpx.DecodingError)
+        self.client = httpx.Client(
+            http2=True,
+            # Not a hard cap: over HTTP/1.1 (plain http) extra requests open throwaway
+            # connections, as with requests, rather than queueing for a pooled one.
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=max_connections if keep_alive else 0,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            headers={'User-Agent': 'autoapicom-client'},
+        )
+
+    def get(self, url: str, params: dict | None = None, headers=None, timeout=None, stream: bool = False):
+        return self._send('GET', url, params=params, headers=headers, timeout=timeout, stream=stream)
+
+    def post(self, url: str, json: dict | None = None, headers=None, timeout=None, stream: bool = False):
+        return self._send('POST', url, json=json, headers=headers, timeout=timeout, stream=stream)
+
+    def close(self) -> None:
+        self.client.close()
+
+    def _send(self, method: str, url: str, timeout=None, stream: bool = False, **kwargs) -> HttpxResponse:
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        timeout = self._httpx.Timeout(read, connect=connect)
+        request = self.client.build_request(method, url, timeout=timeout, **kwargs)
+        started = time.perf_counter()
+        response = self.client.send(request, stream=True)
+        elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+        if not stream:
+            try:
+                response.read()
+            finally:
+                response.close()
+        return HttpxResponse(response, elapsed)
+
+
+class HttpxResponse:
+    """The part of requests.Response that Client uses, over an httpx response."""
+
+    def __init__(self, response, elapsed: datetime.timedelta):
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.http_version = response.http_version
+        # Until the headers arrived, like requests; httpx's own elapsed includes the body.
+        self.elapsed = elapsed
+        self._response = response
+
+    @property
+    def content(self) -> bytes:
+        return self._response.content
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        return self._response.iter_bytes(chunk_size)
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class MockTransport(Transport):
+    """
+    In-memory transport for tests: ``handler(request)`` answers every call.
+
+    The handler gets a MockRequest and returns a MockResponse, a
+    ``(status_code, body)`` or ``(status_code, body, headers)`` tuple where
+    a dict or list body is sent as JSON, or just a dict or list for a 200.
+    It may raise TimeoutError or ConnectionError to simulate network
+    failures. Every request is appended to ``requests``.
+    """
+
+    timeout_errors = (TimeoutError,)
+    connection_errors = (ConnectionError,)
+    stream_errors = (ConnectionError,)
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict | None = None, headers=None, **kwargs) -> MockResponse:
+        return self._call(MockRequest('GET', url, params=params, headers=headers))
+
+    def post(self, url: str, json=None, headers=None, **kwargs) -> MockResponse:
+        return self._call(MockRequest('POST', url, json=json, headers=headers))
+
+    def _call(self, request: MockRequest) -> MockResponse:
+        with self._lock:
+            self.requests.append(request)
+        result = self.handler(request)
+        if isinstance(result, MockResponse):
+            return result
+        if isinstance(result, tuple):
+            return MockResponse(*result)
+        return MockResponse(200, result)
+
+
+class MockRequest:
+    """One request seen by MockTransport; GET ``params`` include the api_key."""
+
+    __slots__ = ('method', 'url', 'params', 'json', 'headers')
+
+    def __init__(self, method: str, url: str, params: dict | None = None, json=None, headers=None):
+        self.method = method
+        self.url = url
+        self.params = dict(params or {})
+        self.json = json
+        self.headers = dict(headers or {})
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.url).path
+
+    def __repr__(self) -> str:
+        return f'MockRequest({self.method!r}, {self.url!r})'
+
+
+class MockResponse:
+    """A canned response; dict and list bodies are encoded as JSON."""
+
+    def __init__(self, status_code: int = 200, body=b'', headers: dict | None = None):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode()
+        elif isinstance(body, str):
+            body = body.encode()
+        self.status_code = status_code
+        self.content = body
+        self.headers = _Headers(headers or {})
+        self.elapsed = datetime.timedelta(0)
+        self.closed = False
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _Headers(dict):
+    """Case-insensitive header lookup, as on real responses."""
+
+    def __init__(self, headers: dict):
+        super().__init__((name.lower(), value) for name, value in headers.items())
+
+    def get(self, name: str, default=None):
+        return super().get(name.lower(), default)
+
+    def __getitem__(self, name: str):
+        return super().__getitem__(name.lower())
+
+    def __contains__(self, name) -> bool:
+        return super().__contains__(name.lower())
+
+
+class UrllibResponse:
+    """The part of requests.Response that Client uses, over an http.client response."""
+
+    def __init__(self, raw: http.client.HTTPResponse, elapsed: datetime.timedelta, conn=None):
+        self.status_code = raw.status
+        self.headers = raw.headers
+        self.elapsed = elapsed
+        self._raw = raw
+        self._conn = conn
+        self._content = None
+
+    @property
+    def content(self) -> bytes:
+        return self.read()
+
+    def read(self) -> bytes:
+        """The whole (decoded) body."""
+        if self._content is None:
+            self._content = b''.join(self.iter_content(65536))
+        return self._content
+
+    def iter_content(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        if self._content is not None:
+            yield self._content
+            return
+        decompressor = _decompressor(self.headers.get('Content-Encoding'))
+        while True:
+            chunk = self._raw.read(chunk_size)
+            if not chunk:
+                break
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            if chunk:
+                yield chunk
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+    def close(self) -> None:
+        self._raw.close()
+        if self._conn is not None:
+            self._conn.close()
+
+
+def _connection(parts, timeout) -> http.client.HTTPConnection:
+    if parts.scheme == 'https':
+        return http.client.HTTPSConnection(parts.hostname, parts.port, timeout=timeout)
+    return http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+
+
+def _json_body(data) -> bytes | None:
+    return json.dumps(data).encode() if data is not None else None
+
+
+def _decompressor(encoding: str | None):
+    encoding = (encoding or '').strip().lower()
+    if encoding == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == 'deflate':
+        # Meant to be zlib-wrapped; +32 also accepts a gzip header.
+        return zlib.decompressobj(32 + zlib.MAX_WBITS)
+    return None
@@ -0,0 +1,158 @@
+"""
+Recognizing marketplace listing URLs locally.
+
+parse_offer_url tells which source a listing URL belongs to and, where the
+URL carries it, the listing's inner_id, so the offer can be fetched with the
+cheaper (and cacheable) get_offer instead of POSTing the URL to offer/info.
+"""
+
+from __future__ import annotations
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track where a click came from.
+TRACKING_PARAMS = frozenset({
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref', 'ref_src', 'referrer', 'spm', 'share_token', 'share_from',
+})
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hmsr')
+
+_DIGITS_HTML = re.compile(r'(\d+)\.html?$')
+_UUID = re.compile(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$')
+
+
+class OfferUrl:
+    """A normalized listing URL with its source and, when known, inner_id."""
+
+    __slots__ = ('url', 'source', 'inner_id')
+
+    def __init__(self, url: str, source: str | None = None, inner_id: str | None = None):
+        self.url = url
+        self.source = source
+        self.inner_id = inner_id
+
+    @property
+    def key(self) -> tuple:
+        """Identity for deduplication: (source, inner_id), or the normalized URL."""
+        if self.inner_id is not None:
+            return self.source, self.inner_id
+        return None, self.url
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, OfferUrl) and (self.url, self.source, self.inner_id) == (other.url, other.source, other.inner_id)
+
+    def __repr__(self) -> str:
+        return f'OfferUrl({self.url!r}, source={self.source!r}, inner_id={self.inner_id!r})'
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for comparison.
+
+    Forces https, lowercases the host and drops the default port, the
+    fragment, a trailing slash and tracking parameters (utm_*, gclid, ...);
+    the remaining query parameters are sorted.
+    """
+    url = url.strip()
+    if '://' not in url:
+        url = 'https://' + url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if parts.port not in (None, 80, 443):
+        host = f'{host}:{parts.port}'
+    path = parts.path.rstrip('/') if parts.path not in ('', '/') else ''
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def parse_offer_url(url: str) -> OfferUrl:
+    """
+    Normalize ``url`` and work out its source and inner_id.
+
+    Knows the hosts of all eight sources. The inner_id is taken from the
+    URL where the marketplace puts the listing id in it (encar, mobilede,
+    autoscout24, che168, dongchedi, dubicars); guazi and dubizzle URLs get
+    their source only. Unknown hosts give an OfferUrl without either.
+    """
+    normalized = normalize_url(url)
+    parts = urlsplit(normalized)
+    host = parts.hostname or ''
+    path = parts.path
+    query = dict(parse_qsl(parts.query))
+
+    for suffix, source, extract in _RULES:
+        if _host_matches(host, suffix):
+            return OfferUrl(normalized, source, extract(path, query))
+    return OfferUrl(normalized)
+
+
+def _host_matches(host: str, suffix: str) -> bool:
+    if suffix.endswith('.'):
+        # Any country domain: autoscout24.de, autoscout24.it, ...
+        return any(label == suffix[:-1] for label in host.split('.'))
+    return host == suffix or host.endswith('.' + suffix)
+
+
+def _digits(value: str | None) -> str | None:
+    return value if value and value.isdigit() else None
+
+
+def _encar(path: str, query: dict) -> str | None:
+    # fem.encar.com/cars/detail/40427050, www.encar.com/dc/dc_cardetailview.do?carid=40427050
+    match = re.search(r'/cars/detail/(\d+)$', path)
+    return match.group(1) if match else _digits(query.get('carid'))
+
+
+def _mobilede(path: str, query: dict) -> str | None:
+    # suchen.mobile.de/fahrzeuge/details.html?id=412345678, .../auto-inserat/bmw-x5/412345678.html
+    if _digits(query.get('id')):
+        return query['id']
+    match = _DIGITS_HTML.search(path)
+    return match.group(1) if match else None
+
+
+def _autoscout24(path: str, query: dict) -> str | None:
+    # www.autoscout24.de/angebote/bmw-x5-xdrive30d-diesel-schwarz-<uuid>
+    match = _UUID.search(path.lower())
+    return match.group(1) if match else None
+
+
+def _che168(path: str, query: dict) -> str | None:
+    # www.che168.com/dealer/123456/45678901.html, m.che168.com/cardetail/index?infoid=45678901
+    if _digits(query.get('infoid')):
+        return query['infoid']
+    match = _DIGITS_HTML.search(path)
+    return match.group(1) if match else None
+
+
+def _dongchedi(path: str, query: dict) -> str | None:
+    # www.dongchedi.com/usedcar/12345678
+    match = re.search(r'/usedcar/(\d+)$', path)
+    return match.group(1) if match else None
+
+
+def _dubicars(path: str, query: dict) -> str | None:
+    # www.dubicars.com/2020-bmw-x5-xdrive40i-123456.html
+    match = re.search(r'-(\d+)\.html$', path)
+    return match.group(1) if match else None
+
+
+def _unknown_id(path: str, query: dict) -> None:
+    return None
+
+
+_RULES = (
+    ('encar.com', 'encar', _encar),
+    ('mobile.de', 'mobilede', _mobilede),
+    ('autoscout24.', 'autoscout24', _autoscout24),
+    ('che168.com', 'che168', _che168),
+    ('dongchedi.com', 'dongchedi', _dongchedi),
+    ('guazi.com', 'guazi', _unknown_id),
+    ('dubicars.com', 'dubicars', _dubicars),
+    ('dubizzle.com', 'dubizzle', _unknown_id),
+)
@@ -0,0 +1,212 @@
+"""
+Client benchmarks against a local mock server; prints JSON results.
+
+Run: python -m benchmarks [scenario ...] [--latency 0.02] [--concurrency 8] [--transport http2] [--output results.json]
+
+Scenarios: pagination-sequential, pagination-concurrent, bulk, changes, decode.
+Each scenario runs in its own process so peak RSS is per scenario.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from auto_api import Client, Hooks
+from auto_api.decoders import available_decoders, get_decoder
+from auto_api.streaming import ResultStream
+
+from .payloads import make_page
+from .server import MockServer
+
+SCENARIOS = ('pagination-sequential', 'pagination-concurrent', 'bulk', 'changes', 'decode')
+
+
+class _Latencies(Hooks):
+    def __init__(self):
+        self.seconds = []
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def on_response(self, event):
+        with self._lock:
+            self.seconds.append(event.timings['total'])
+
+    def on_error(self, event):
+        with self._lock:
+            self.seconds.append(event.timings['total'])
+            self.errors += 1
+
+
+def percentile(values: list, q: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_client_scenario(name: str, args) -> dict:
+    server = MockServer(
+        pages=args.pages,
+        per_page=args.per_page,
+        images=args.images,
+        changes_head=args.changes,
+        changes_per_batch=args.per_page,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+    )
+    latencies = _Latencies()
+    with server:
+        client = Client(
+            'bench-key',
+            base_url=server.url,
+            retry=args.error_rate > 0,
+            pool_maxsize=max(10, args.concurrency),
+            hooks=[latencies],
+            transport=args.transport,
+        )
+        started = time.perf_counter()
+        if name == 'pagination-sequential':
+            items = sum(1 for _ in client.iter_offers('encar'))
+        elif name == 'pagination-concurrent':
+            items = sum(1 for _ in client.iter_offers('encar', concurrency=args.concurrency))
+        elif name == 'bulk':
+            ids = [str(40000000 + i) for i in range(args.bulk)]
+            items = len(client.get_offers_bulk('encar', ids, concurrency=args.concurrency))
+        else:
+            items = sum(1 for _ in client.follow_changes('encar', 1, stop_at_head=True))
+        seconds = time.perf_counter() - started
+        client.close()
+
+    requests = len(latencies.seconds)
+    return {
+        'scenario': name,
+        'items': items,
+        'requests': requests,
+        'errors': latencies.errors,
+        'seconds': round(seconds, 4),
+        'rps': round(requests / seconds, 1) if seconds else None,
+        'p50_ms': _ms(percentile(latencies.seconds, 0.5)),
+        'p99_ms': _ms(percentile(latencies.seconds, 0.99)),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def run_decode_scenario(args) -> dict:
+    body = make_page(args.per_page, args.images)
+    decoders = {}
+    for name in available_decoders():
+        decoder = get_decoder(name)
+        decoders[name] = _time_decode(lambda: decoder(body), len(body), args.rounds)
+        decoders[f'{name}+stream'] = _time_decode(
+            lambda: list(ResultStream((body[i:i + 65536] for i in range(0, len(body), 65536)), decoder)),
+            len(body),
+            args.rounds,
+        )
+    return {'scenario': 'decode', 'page_bytes': len(body), 'decoders': decoders, 'peak_rss_mb': peak_rss_mb()}
+
+
+def _time_decode(decode, size: int, rounds: int) -> dict:
+    decode()
+    seconds = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        decode()
+        seconds.append(time.perf_counter() - started)
+    return {
+        'p50_ms': _ms(percentile(seconds, 0.5)),
+        'p99_ms': _ms(percentile(seconds, 0.99)),
+        'mb_per_s': round(size / (sum(seconds) / rounds) / 1e6, 1),
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1e3, 3) if seconds is not None else None
+
+
+def run(name: str, args) -> dict:
+    result = run_decode_scenario(args) if name == 'decode' else run_client_scenario(name, args)
+    result['config'] = {
+        key: getattr(args, key)
+        for key in (
+            'pages', 'per_page', 'images', 'changes', 'bulk', 'concurrency', 'latency', 'jitter', 'error_rate',
+            'rounds', 'transport',
+        )
+    }
+    return result
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', metavar='scenario', help=f'default: all of {", ".join(SCENARIOS)}')
+    parser.add_argument('--pages', type=int, default=50, help='get_offers pages per source')
+    parser.add_argument('--per-page', type=int, default=20, help='offers per page and changes per batch')
+    parser.add_argument('--images', type=int, default=10, help='image URLs per offer')
+    parser.add_argument('--changes', type=int, default=2000, help='change records to follow')
+    parser.add_argument('--bulk', type=int, default=500, help='offers fetched by the bulk scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency per response, seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random server latency, seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of responses that are 503s')
+    parser.add_argument('--rounds', type=int, default=50, help='decode rounds')
+    parser.add_argument('--transport', default='requests', choices=('requests', 'urllib', 'http2'))
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    parser.add_argument('--in-process', action='store_true', help='run all scenarios in this process')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f'unknown scenario: {", ".join(unknown)}')
+    args.scenarios = args.scenarios or list(SCENARIOS)
+
+    if args.in_process or len(args.scenarios) == 1:
+        results = [run(name, args) for name in args.scenarios]
+    else:
+        passthrough = [arg for arg in (argv if argv is not None else sys.argv[1:]) if arg not in SCENARIOS]
+        passthrough = _without_output(passthrough)
+        results = []
+        for name in args.scenarios:
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks', name, '--in-process', *passthrough],
+                check=True,
+                stdout=subprocess.PIPE,
+            ).stdout
+            results.extend(json.loads(output))
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+def _without_output(args: list) -> list:
+    cleaned = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == '--output':
+            skip = True
+        elif not arg.startswith('--output='):
+            cleaned.append(arg)
+    return cleaned
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare JSON decoders on realistic get_offers / get_changes pages.
+
+Run: python -m benchmarks.bench_decode [--offers 100] [--images 20] [--rounds 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from auto_api.decoders import available_decoders, get_decoder
+
+from .payloads import make_page
+
+
+def bench(decoder, body: bytes, rounds: int) -> float:
+    decoder(body)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decoder(body)
+    return (time.perf_counter() - started) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--offers', type=int, default=100, help='offers per page')
+    parser.add_argument('--images', type=int, default=20, help='image URLs per offer')
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    body = make_page(args.offers, args.images)
+    print(f'page: {len(body) / 1e6:.2f} MB, {args.offers} offers, {args.rounds} rounds')
+
+    baseline = None
+    for name in available_decoders():
+        seconds = bench(get_decoder(name), body, args.rounds)
+        baseline = baseline or seconds
+        print(f'{name:>8}: {seconds * 1e3:8.2f} ms/page  {len(body) / seconds / 1e6:8.1f} MB/s  x{baseline / seconds:.2f}')
+
+
+if __name__ == '__main__':
+    main()
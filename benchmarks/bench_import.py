@@ -0,0 +1,78 @@
+"""
+Cold-start cost of the client: import time and first-request latency.
+
+Each round runs in a fresh interpreter against a local mock server.
+Run: python -m benchmarks.bench_import [--rounds 10] [--transport requests urllib]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from .server import MockServer
+
+TRANSPORTS = ('requests', 'urllib')
+
+# Runs in the child interpreter; prints the timings as JSON.
+_PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import auto_api
+imported = time.perf_counter()
+client = auto_api.Client('bench-key', base_url=sys.argv[2], transport=sys.argv[1])
+created = time.perf_counter()
+client.get_filters('encar')
+done = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1e3,
+    'client_ms': (created - imported) * 1e3,
+    'first_request_ms': (done - created) * 1e3,
+    'total_ms': (done - started) * 1e3,
+    'modules': len(sys.modules),
+    'requests_loaded': 'requests' in sys.modules,
+}))
+'''
+
+
+def measure(transport: str, url: str, rounds: int = 10) -> dict:
+    """Median timings over ``rounds`` fresh interpreters."""
+    samples = []
+    for _ in range(rounds):
+        output = subprocess.run(
+            [sys.executable, '-c', _PROBE, transport, url], check=True, stdout=subprocess.PIPE
+        ).stdout
+        samples.append(json.loads(output))
+    result = {
+        key: round(statistics.median(sample[key] for sample in samples), 2)
+        for key in ('import_ms', 'client_ms', 'first_request_ms', 'total_ms')
+    }
+    result['modules'] = samples[-1]['modules']
+    result['requests_loaded'] = samples[-1]['requests_loaded']
+    return result
+
+
+def run(transports=TRANSPORTS, rounds: int = 10) -> dict:
+    with MockServer(pages=1, images=1) as server:
+        return {transport: measure(transport, server.url, rounds) for transport in transports}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--transport', nargs='+', default=list(TRANSPORTS), choices=TRANSPORTS)
+    args = parser.parse_args()
+
+    for transport, result in run(args.transport, args.rounds).items():
+        print(
+            f'{transport:>8}: import {result["import_ms"]:7.2f} ms  client {result["client_ms"]:6.2f} ms  '
+            f'first request {result["first_request_ms"]:6.2f} ms  total {result["total_ms"]:7.2f} ms  '
+            f'{result["modules"]} modules'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""Realistic, deterministic response bodies for benchmarks and the mock server."""
+
+from __future__ import annotations
+
+import json
+import random
+
+MARKS = {
+    'Hyundai': ['Sonata', 'Avante', 'Grandeur', 'Tucson', 'Santa Fe'],
+    'Kia': ['K5', 'Sorento', 'Sportage', 'Carnival', 'Morning'],
+    'BMW': ['3 Series', '5 Series', 'X3', 'X5'],
+    'Mercedes-Benz': ['C-Class', 'E-Class', 'GLC', 'S-Class'],
+}
+
+
+def make_offer(rng: random.Random, inner_id: int, images: int) -> dict:
+    mark = rng.choice(list(MARKS))
+    return {
+        'id': inner_id,
+        'inner_id': str(inner_id),
+        'change_type': 'added',
+        'created_at': '2025-01-15 08:30:00',
+        'data': {
+            'id': inner_id,
+            'inner_id': str(inner_id),
+            'url': f'https://fem.encar.com/cars/detail/{inner_id}',
+            'mark': mark,
+            'model': rng.choice(MARKS[mark]),
+            'generation': None,
+            'configuration': '2.0 Turbo',
+            'complectation': 'Premium',
+            'year': rng.randint(2012, 2025),
+            'color': rng.choice(['white', 'black', 'silver', 'blue']),
+            'price': rng.randint(500, 9000) * 10000,
+            'km_age': rng.randint(0, 250000),
+            'engine_type': rng.choice(['gasoline', 'diesel', 'hybrid', 'electric']),
+            'transmission_type': rng.choice(['automatic', 'manual']),
+            'body_type': rng.choice(['sedan', 'suv', 'hatchback', 'minivan']),
+            'address': '서울 강남구',
+            'seller_type': rng.choice(['dealer', 'private']),
+            'is_dealer': True,
+            'displacement': 1999,
+            'offer_created': '2025-01-14',
+            'description': '무사고 차량입니다. ' * rng.randint(5, 40),
+            'images': [
+                f'https://ci.encar.com/carpicture/carpicture{inner_id % 100:02d}/pic{inner_id}_{n:03d}.jpg'
+                for n in range(images)
+            ],
+            'extra': {'options': ['sunroof', 'navigation', 'heated seats'], 'accidents': 0},
+        },
+    }
+
+
+def make_page(offers: int = 100, images: int = 20, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    page = {
+        'result': [make_offer(rng, 40000000 + i, images) for i in range(offers)],
+        'meta': {'page': 1, 'next_page': 2, 'limit': offers},
+    }
+    return json.dumps(page, ensure_ascii=False).encode()
+
+
+def make_offers_page(page: int, pages: int, per_page: int = 20, images: int = 20, seed: int = 1) -> bytes:
+    """Page ``page`` of a get_offers listing that is ``pages`` pages long."""
+    rng = random.Random(seed * 1_000_003 + page)
+    first = 40000000 + (page - 1) * per_page
+    result = [offer_item(make_offer(rng, first + i, images)) for i in range(per_page)] if page <= pages else []
+    meta = {'page': page, 'next_page': page + 1 if page < pages else None, 'limit': per_page}
+    return json.dumps({'result': result, 'meta': meta}, ensure_ascii=False).encode()
+
+
+def make_changes(change_id: int, count: int, head: int, images: int = 20, seed: int = 1) -> bytes:
+    """A get_changes batch starting at ``change_id``; empty at or past ``head``."""
+    rng = random.Random(seed * 1_000_003 + change_id)
+    count = max(0, min(count, head - change_id))
+    result = []
+    for n in range(change_id, change_id + count):
+        record = make_offer(rng, 40000000 + rng.randint(0, 999_999), images)
+        record['id'] = n
+        record['change_type'] = rng.choice(['added', 'changed', 'changed', 'removed'])
+        if record['change_type'] == 'removed':
+            del record['data']
+        result.append(record)
+    meta = {'cur_change_id': change_id, 'next_change_id': change_id + count if count else change_id, 'limit': count}
+    return json.dumps({'result': result, 'meta': meta}, ensure_ascii=False).encode()
+
+
+def make_filters() -> bytes:
+    return json.dumps({
+        'mark': {mark: models for mark, models in MARKS.items()},
+        'body_type': ['sedan', 'suv', 'hatchback', 'minivan'],
+        'engine_type': ['gasoline', 'diesel', 'hybrid', 'electric'],
+        'transmission_type': ['automatic', 'manual'],
+        'color': ['white', 'black', 'silver', 'blue'],
+    }, ensure_ascii=False).encode()
+
+
+def offer_item(offer: dict) -> dict:
+    """The get_offers / get_offer item shape: inner_id and data only."""
+    return {'inner_id': offer['inner_id'], 'data': offer['data']}
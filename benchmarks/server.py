@@ -0,0 +1,229 @@
+"""
+Local stand-in for the auto-api.com API, for benchmarks and tests.
+
+Serves /api/v2/{source}/filters|offers|offer|change_id|changes and
+/api/v1/offer/info with generated payloads, optional latency and injected
+errors. Run standalone: python -m benchmarks.server [--port 8000] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .payloads import make_changes, make_filters, make_offer, make_offers_page, offer_item
+
+
+class MockServer:
+    """
+    Threaded HTTP server answering like the API from deterministic payloads.
+
+    ``pages`` x ``per_page`` offers are listed per source; the changes feed
+    runs from change_id 1 up to ``changes_head``. Every response waits
+    ``latency`` plus up to ``jitter`` seconds, and a fraction ``error_rate``
+    of requests fails with ``error_status``. ``stats`` counts requests by
+    endpoint. Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(
+        self,
+        pages: int = 50,
+        per_page: int = 20,
+        images: int = 10,
+        changes_head: int = 10_000,
+        changes_per_batch: int = 100,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        api_key: str | None = None,
+        seed: int = 1,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ):
+        self.pages = pages
+        self.per_page = per_page
+        self.images = images
+        self.changes_head = changes_head
+        self.changes_per_batch = changes_per_batch
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_key = api_key
+        self.seed = seed
+        self.stats = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.mock = self
+
+        self.offers_page = lru_cache(maxsize=1024)(self._offers_page)
+        self.offer = lru_cache(maxsize=4096)(self._offer)
+        self.changes = lru_cache(maxsize=1024)(self._changes)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> MockServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            name='mock-auto-api',
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> MockServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle(self, method: str, path: str, query: dict, headers, body: bytes) -> tuple:
+        """(status, body bytes, extra headers) for one request."""
+        parts = path.strip('/').split('/')
+        endpoint = parts[-1] if parts else ''
+        with self._lock:
+            self.stats[endpoint] = self.stats.get(endpoint, 0) + 1
+            delay = self.latency + self._rng.random() * self.jitter
+            failed = self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            return self.error_status, _message('Injected error'), {'Retry-After': '0'}
+
+        key = headers.get('x-api-key') if method == 'POST' else query.get('api_key')
+        if self.api_key is not None and key != self.api_key:
+            return 401, _message('Invalid API key'), {}
+
+        if method == 'POST' and parts == ['api', 'v1', 'offer', 'info']:
+            url = json.loads(body or b'{}').get('url', '')
+            inner_id = ''.join(ch for ch in url if ch.isdigit())
+            if not inner_id:
+                return 404, _message('Offer not found'), {}
+            return 200, json.dumps(json.loads(self.offer(int(inner_id)))['data'], ensure_ascii=False).encode(), {}
+
+        if method != 'GET' or len(parts) != 4 or parts[:2] != ['api', 'v2']:
+            return 404, _message('Not found'), {}
+
+        try:
+            if endpoint == 'filters':
+                return 200, make_filters(), {}
+            if endpoint == 'offers':
+                return 200, self.offers_page(int(query.get('page', 1))), {}
+            if endpoint == 'offer':
+                return 200, self.offer(int(query['inner_id'])), {}
+            if endpoint == 'change_id':
+                time.strptime(query['date'], '%Y-%m-%d')
+                return 200, json.dumps({'change_id': 1}).encode(), {}
+            if endpoint == 'changes':
+                return 200, self.changes(int(query['change_id'])), {}
+        except (KeyError, ValueError):
+            return 422, _message('Invalid parameters'), {}
+        return 404, _message('Not found'), {}
+
+    def _offers_page(self, page: int) -> bytes:
+        return make_offers_page(page, self.pages, self.per_page, self.images, self.seed)
+
+    def _offer(self, inner_id: int) -> bytes:
+        offer = offer_item(make_offer(random.Random(inner_id), inner_id, self.images))
+        return json.dumps(offer, ensure_ascii=False).encode()
+
+    def _changes(self, change_id: int) -> bytes:
+        return make_changes(change_id, self.changes_per_batch, self.changes_head, self.images, self.seed)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # socketserver's default backlog of 5 drops connects under a burst of new
+    # connections, which then wait out a 1 s SYN retransmit.
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients would wait for a delayed ACK on every response.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._respond('GET')
+
+    def do_POST(self):
+        self._respond('POST')
+
+    def _respond(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        status, payload, headers = self.server.mock.handle(method, url.path, query, self.headers, body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up waiting (a timeout test, an aborted benchmark).
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _message(text: str) -> bytes:
+    return json.dumps({'message': text}).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve a local mock of the auto-api.com API.')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--images', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='up to this many extra seconds, uniformly')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with 503')
+    args = parser.parse_args()
+
+    server = MockServer(
+        pages=args.pages,
+        per_page=args.per_page,
+        images=args.images,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        port=args.port,
+    )
+    print(f'Serving on {server.url}')
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
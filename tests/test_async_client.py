@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+import pytest
+
+httpx = pytest.importorskip('httpx')
+
+from auto_api.async_client import AsyncClient
+from auto_api.errors import ApiError, AuthError, NetworkError
+
+
+def make_client(handler, **kwargs):
+    """AsyncClient whose requests are answered by handler(request) -> httpx.Response."""
+    client = AsyncClient('test-key', **kwargs)
+    client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def respond(body, status_code=200, calls=None):
+    def handler(request):
+        if calls is not None:
+            calls.append(request)
+        if isinstance(body, str):
+            return httpx.Response(status_code, text=body)
+        return httpx.Response(status_code, json=body)
+
+    return handler
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# ── Methods ──────────────────────────────────────────────────────
+
+
+class TestMethods:
+    def test_get_filters(self):
+        calls = []
+        client = make_client(respond({'mark': ['Kia']}, calls=calls))
+
+        result = run(client.get_filters('encar'))
+
+        assert result == {'mark': ['Kia']}
+        assert calls[0].url.path == '/api/v2/encar/filters'
+        assert calls[0].url.params['api_key'] == 'test-key'
+
+    def test_get_offers_passes_filters(self):
+        calls = []
+        client = make_client(respond({'result': []}, calls=calls))
+
+        run(client.get_offers('mobilede', page=2, brand='BMW', year_from=2020))
+
+        params = calls[0].url.params
+        assert calls[0].url.path == '/api/v2/mobilede/offers'
+        assert params['page'] == '2'
+        assert params['brand'] == 'BMW'
+        assert params['year_from'] == '2020'
+
+    def test_get_offer(self):
+        calls = []
+        client = make_client(respond({'inner_id': 'abc123'}, calls=calls))
+
+        result = run(client.get_offer('encar', 'abc123'))
+
+        assert result == {'inner_id': 'abc123'}
+        assert calls[0].url.params['inner_id'] == 'abc123'
+
+    def test_get_change_id_returns_integer(self):
+        client = make_client(respond({'change_id': '42567'}))
+
+        result = run(client.get_change_id('encar', '2024-01-15'))
+
+        assert result == 42567
+        assert isinstance(result, int)
+
+    def test_get_changes(self):
+        calls = []
+        client = make_client(respond({'result': []}, calls=calls))
+
+        run(client.get_changes('encar', 42567))
+
+        assert calls[0].url.path == '/api/v2/encar/changes'
+        assert calls[0].url.params['change_id'] == '42567'
+
+    def test_get_offer_by_url_posts_with_header(self):
+        calls = []
+        client = make_client(respond({'mark': 'BMW'}, calls=calls))
+
+        result = run(client.get_offer_by_url('https://example.com/car/123'))
+
+        assert result == {'mark': 'BMW'}
+        assert calls[0].method == 'POST'
+        assert calls[0].url.path == '/api/v1/offer/info'
+        assert calls[0].headers['x-api-key'] == 'test-key'
+        assert 'api_key' not in str(calls[0].url)
+        assert json.loads(calls[0].content) == {'url': 'https://example.com/car/123'}
+
+    def test_many_concurrent_requests(self):
+        client = make_client(lambda request: httpx.Response(200, json={'inner_id': request.url.params['inner_id']}))
+
+        async def main():
+            return await asyncio.gather(*(client.get_offer('encar', str(i)) for i in range(200)))
+
+        results = run(main())
+
+        assert [r['inner_id'] for r in results] == [str(i) for i in range(200)]
+
+
+# ── Error handling ───────────────────────────────────────────────
+
+
+class TestErrorHandling:
+    def test_raises_api_error_with_body(self):
+        body = {'message': 'Validation failed'}
+        client = make_client(respond(body, 422))
+
+        with pytest.raises(ApiError, match='Validation failed') as exc_info:
+            run(client.get_filters('encar'))
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.response_body == body
+
+    def test_fallback_message_uses_reason_phrase(self):
+        client = make_client(respond({'error': 'x'}, 500))
+
+        with pytest.raises(ApiError, match='API error: 500 Internal Server Error'):
+            run(client.get_filters('encar'))
+
+    def test_raises_auth_error_on_401(self):
+        client = make_client(respond({'message': 'Unauthorized'}, 401))
+
+        with pytest.raises(AuthError):
+            run(client.get_offers('encar', page=1))
+
+    def test_raises_api_error_on_invalid_json(self):
+        client = make_client(respond('not json at all'))
+
+        with pytest.raises(ApiError, match='Invalid JSON response'):
+            run(client.get_filters('encar'))
+
+    def test_connection_failure_raises_network_error(self):
+        def handler(request):
+            raise httpx.ConnectError('connection refused')
+
+        client = make_client(handler)
+
+        with pytest.raises(NetworkError):
+            run(client.get_filters('encar'))
+
+
+# ── Connection pool ──────────────────────────────────────────────
+
+
+class TestConnectionPool:
+    def test_context_manager_closes_session(self):
+        async def main():
+            async with AsyncClient('test-key') as client:
+                pass
+            return client
+
+        client = run(main())
+
+        assert client.session.is_closed
+
+    def test_strips_trailing_slashes(self):
+        client = AsyncClient('test-key', base_url='https://custom.api.com///')
+        assert client.base_url == 'https://custom.api.com'
@@ -0,0 +1,263 @@
+import random
+import socket
+
+import pytest
+
+from auto_api.balancer import CLOSED, HALF_OPEN, OPEN, Balancer
+from auto_api.client import Client
+from auto_api.errors import ApiError, NetworkError
+from auto_api.ratelimit import RateLimiter
+from auto_api.transport import MockTransport
+from benchmarks.server import MockServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class InOrder(random.Random):
+    """Leaves ties in host order, so the first listed host is picked first."""
+
+    def shuffle(self, x, *args):
+        pass
+
+
+def closed_port_url():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f'http://127.0.0.1:{port}'
+
+
+# ── Selection ────────────────────────────────────────────────────
+
+
+class TestSelection:
+    def test_rejects_bad_arguments(self):
+        with pytest.raises(ValueError):
+            Balancer([])
+        with pytest.raises(ValueError):
+            Balancer(['https://a'], strategy='round_robin')
+
+    def test_least_outstanding(self):
+        balancer = Balancer(['https://a', 'https://b/'], rng=random.Random(1))
+
+        first = balancer.acquire()
+        second = balancer.acquire()
+
+        assert {first.base_url, second.base_url} == {'https://a', 'https://b'}
+        balancer.release(first, True)
+        assert balancer.acquire() is first
+
+    def test_latency_weighted(self):
+        balancer = Balancer(['https://a', 'https://b'], strategy='latency', rng=random.Random(1))
+        a, b = balancer.endpoints
+        for _ in range(2):
+            host = balancer.acquire()
+            balancer.release(host, True, 0.2 if host is a else 0.01)
+
+        assert balancer.acquire() is b
+        # One request in flight on b still scores lower than an idle a.
+        assert balancer.acquire() is b
+
+    def test_latency_is_smoothed(self):
+        balancer = Balancer(['https://a'], smoothing=0.5)
+        (host,) = balancer.endpoints
+        for seconds in (1.0, 0.0):
+            balancer.release(balancer.acquire(), True, seconds)
+
+        assert host.latency == 0.5
+
+    def test_exclude(self):
+        balancer = Balancer(['https://a', 'https://b'])
+        a, b = balancer.endpoints
+
+        assert balancer.acquire(exclude=[a]) is b
+        assert balancer.acquire(exclude=[a, b]) in (a, b)
+
+
+# ── Circuit breaker ──────────────────────────────────────────────
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def setup(self):
+        clock = FakeClock()
+        balancer = Balancer(['https://a', 'https://b'], failure_threshold=2, reset_timeout=5, clock=clock)
+        return balancer, clock
+
+    def fail(self, balancer, host, times=1):
+        for _ in range(times):
+            balancer.acquire(exclude=[e for e in balancer.endpoints if e is not host])
+            balancer.release(host, False)
+
+    def test_opens_after_consecutive_failures(self, setup):
+        balancer, _ = setup
+        a, b = balancer.endpoints
+
+        self.fail(balancer, a)
+        assert a.state == CLOSED
+        self.fail(balancer, a)
+        assert a.state == OPEN
+        assert balancer.healthy() == [b]
+        assert all(balancer.acquire() is b for _ in range(5))
+
+    def test_success_resets_the_count(self, setup):
+        balancer, _ = setup
+        a, b = balancer.endpoints
+
+        self.fail(balancer, a)
+        balancer.release(balancer.acquire(exclude=[b]), True)
+        self.fail(balancer, a)
+
+        assert a.state == CLOSED
+
+    def test_probe_closes_circuit(self, setup):
+        balancer, clock = setup
+        a, b = balancer.endpoints
+        self.fail(balancer, a, times=2)
+
+        clock.now = 5
+        probe = balancer.acquire()
+        assert probe is a and a.state == HALF_OPEN
+        # Only one probe at a time.
+        assert balancer.acquire() is b
+        balancer.release(probe, True)
+
+        assert a.state == CLOSED
+        assert balancer.healthy() == [a, b]
+
+    def test_failed_probe_reopens(self, setup):
+        balancer, clock = setup
+        a, b = balancer.endpoints
+        self.fail(balancer, a, times=2)
+
+        clock.now = 5
+        balancer.release(balancer.acquire(), False)
+
+        assert a.state == OPEN
+        clock.now = 9
+        assert balancer.acquire() is b
+
+    def test_all_open_still_sends(self, setup):
+        balancer, clock = setup
+        a, b = balancer.endpoints
+        self.fail(balancer, a, times=2)
+        clock.now = 1
+        self.fail(balancer, b, times=2)
+
+        assert balancer.acquire() is a
+
+    def test_stats(self, setup):
+        balancer, _ = setup
+        a, _ = balancer.endpoints
+        self.fail(balancer, a, times=2)
+
+        stats = balancer.stats()[0]
+        assert stats['base_url'] == 'https://a'
+        assert stats['state'] == OPEN
+        assert stats['requests'] == 2
+        assert stats['errors'] == 2
+        assert stats['outstanding'] == 0
+
+
+# ── Client ───────────────────────────────────────────────────────
+
+
+class TestClient:
+    def test_spreads_requests(self):
+        with MockServer() as first, MockServer() as second:
+            client = Client('key', base_url=[first.url, second.url], pool_maxsize=16)
+            offers = list(client.iter_offers('encar', concurrency=8))
+
+        assert len(offers) == 50 * 20
+        assert first.stats['offers'] > 0 and second.stats['offers'] > 0
+        assert client.base_url == first.url
+        assert all(host['outstanding'] == 0 for host in client.balancer.stats())
+
+    def test_fails_over_from_dead_host(self):
+        with MockServer() as server:
+            balancer = Balancer([closed_port_url(), server.url], failure_threshold=1, rng=InOrder())
+            client = Client('key', base_url=balancer)
+            for _ in range(3):
+                assert 'mark' in client.get_filters('encar')
+
+        dead, alive = balancer.endpoints
+        assert dead.state == OPEN
+        assert dead.requests == 1
+        assert alive.requests == 3
+
+    def test_fails_over_on_server_errors(self):
+        with MockServer(error_rate=1.0) as failing, MockServer() as server:
+            balancer = Balancer([failing.url, server.url], rng=InOrder())
+            client = Client('key', base_url=balancer)
+            for _ in range(4):
+                client.get_offers('encar', page=1)
+            stream = client.stream_offers('encar', page=1)
+            assert len(list(stream)) == 20
+
+        # Three failures open the circuit; after that the failing host gets nothing.
+        assert failing.stats['offers'] == 3
+        assert server.stats['offers'] == 5
+
+    def test_latency_excludes_local_queueing(self):
+        balancer = Balancer(['https://a', 'https://b'])
+        rate_limit = RateLimiter(10, burst=1)
+        client = Client('key', base_url=balancer, rate_limit=rate_limit, transport=MockTransport(lambda request: {}))
+        for _ in range(4):
+            client.get_filters('encar')
+
+        # The rate limiter spaced the calls 100 ms apart; none of that is host latency.
+        latencies = [host['latency'] for host in balancer.stats() if host['latency'] is not None]
+        assert latencies and all(latency < 0.05 for latency in latencies)
+        assert all(host['outstanding'] == 0 for host in balancer.stats())
+
+    def test_unexpected_errors_count_as_host_failures(self):
+        clock = FakeClock()
+        balancer = Balancer(['https://a'], failure_threshold=1, reset_timeout=5, clock=clock)
+        balancer.endpoints[0].state, balancer.endpoints[0].opened_at = OPEN, 0.0
+        clock.now = 10.0
+
+        def handler(request):
+            raise RuntimeError('connection dropped mid-body')
+
+        client = Client('key', base_url=balancer, transport=MockTransport(handler))
+        with pytest.raises(RuntimeError):
+            client.get_filters('encar')
+
+        # The half-open probe failed, so the circuit opens again.
+        (host,) = balancer.stats()
+        assert host['state'] == OPEN
+        assert host['errors'] == 1
+        assert host['outstanding'] == 0
+
+    def test_client_errors_are_not_failed_over(self):
+        with MockServer() as first, MockServer() as second:
+            client = Client('key', base_url=[first.url, second.url])
+            with pytest.raises(ApiError) as error:
+                client.get_offer('encar', 'not-a-number')
+
+        assert error.value.status_code == 422
+        assert first.stats.get('offer', 0) + second.stats.get('offer', 0) == 1
+        assert all(host['state'] == CLOSED for host in client.balancer.stats())
+
+    def test_post_is_not_failed_over(self):
+        with MockServer() as server:
+            balancer = Balancer([closed_port_url(), server.url], rng=InOrder())
+            client = Client('key', base_url=balancer)
+            with pytest.raises(NetworkError):
+                client.get_offer_by_url('https://fem.encar.com/cars/detail/40000001')
+
+        assert server.stats == {}
+
+    def test_all_hosts_down(self):
+        client = Client('key', base_url=[closed_port_url(), closed_port_url()])
+
+        with pytest.raises(NetworkError):
+            client.get_filters('encar')
+        assert [host['errors'] for host in client.balancer.stats()] == [1, 1]
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from auto_api.client import Client
+from auto_api.errors import ApiError, AuthError
+from auto_api.retry import RetryPolicy
+from benchmarks import bench_import
+from benchmarks.__main__ import main, percentile
+from benchmarks.server import MockServer
+
+
+@pytest.fixture
+def server():
+    with MockServer(pages=3, per_page=5, images=2, changes_head=23, changes_per_batch=10) as server:
+        yield server
+
+
+# ── Mock server ──────────────────────────────────────────────────
+
+
+class TestMockServer:
+    def test_serves_every_endpoint(self, server):
+        client = Client('key', base_url=server.url)
+
+        assert set(client.get_filters('encar')) == {'mark', 'body_type', 'engine_type', 'transmission_type', 'color'}
+        assert len(list(client.iter_offers('encar'))) == 15
+        offer = client.get_offer('encar', '40000001')
+        assert offer['inner_id'] == '40000001'
+        assert client.get_offer_by_url('https://fem.encar.com/cars/detail/40000001') == offer['data']
+        assert client.get_change_id('encar', '2025-01-15') == 1
+        assert len(list(client.follow_changes('encar', 1, stop_at_head=True))) == 22
+        assert server.stats['offers'] == 3
+
+    def test_payloads_are_deterministic(self, server):
+        client = Client('key', base_url=server.url)
+
+        assert client.get_offers('encar', page=2) == client.get_offers('encar', page=2)
+
+    def test_checks_api_key(self):
+        with MockServer(api_key='secret') as server:
+            with pytest.raises(AuthError):
+                Client('wrong', base_url=server.url).get_filters('encar')
+            assert Client('secret', base_url=server.url).get_filters('encar')
+
+    def test_injected_errors(self):
+        with MockServer(error_rate=1.0) as server:
+            with pytest.raises(ApiError) as error:
+                Client('key', base_url=server.url).get_filters('encar')
+        assert error.value.status_code == 503
+
+    def test_errors_are_retried(self):
+        with MockServer(error_rate=0.3, seed=7) as server:
+            client = Client('key', base_url=server.url, retry=RetryPolicy(max_attempts=10, backoff=0.001))
+            assert len(list(client.iter_offers('encar'))) == 50 * 20
+
+
+# ── Scenarios ────────────────────────────────────────────────────
+
+
+class TestScenarios:
+    def test_percentile(self):
+        assert percentile([], 0.5) is None
+        assert percentile([3, 1, 2], 0.5) == 2
+        assert percentile(list(range(101)), 0.99) == 99
+
+    def test_reports_json(self, tmp_path, capsys):
+        output = tmp_path / 'results.json'
+
+        main(['pagination-concurrent', 'bulk', 'decode', '--in-process', '--pages', '3', '--bulk', '5',
+              '--rounds', '2', '--output', str(output)])
+
+        results = {result['scenario']: result for result in json.loads(output.read_text())}
+        assert results['pagination-concurrent']['items'] == 60
+        assert results['bulk']['requests'] == 5
+        assert results['bulk']['p99_ms'] >= results['bulk']['p50_ms']
+        assert 'json' in results['decode']['decoders']
+        assert capsys.readouterr().out == ''
+
+    def test_import_benchmark(self):
+        results = bench_import.run(rounds=1)
+
+        assert results['urllib']['requests_loaded'] is False
+        assert results['requests']['requests_loaded'] is True
+        assert results['urllib']['first_request_ms'] > 0
@@ -0,0 +1,326 @@
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+from urllib3.util.request import ACCEPT_ENCODING
+
+from auto_api.cache import CacheEntry, MemoryCache, ResponseCache, SQLiteCache
+from auto_api.client import Client
+from tests.test_client import MockResponse
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+# ── Backends ─────────────────────────────────────────────────────
+
+
+class TestBackends:
+    @pytest.fixture(params=['memory', 'sqlite'])
+    def make_backend(self, request, tmp_path):
+        if request.param == 'memory':
+            return lambda maxsize: MemoryCache(maxsize)
+        return lambda maxsize: SQLiteCache(str(tmp_path / 'cache.db'), maxsize)
+
+    def test_set_and_get(self, make_backend):
+        backend = make_backend(10)
+        backend.set('k', CacheEntry({'a': [1, 2]}, 123.0))
+
+        entry = backend.get('k')
+
+        assert entry.value == {'a': [1, 2]}
+        assert entry.expires_at == 123.0
+
+    def test_missing_key(self, make_backend):
+        assert make_backend(10).get('nope') is None
+
+    def test_evicts_least_recently_used(self, make_backend):
+        backend = make_backend(2)
+        backend.set('a', CacheEntry(1, 0))
+        backend.set('b', CacheEntry(2, 0))
+        backend.get('a')
+        backend.set('c', CacheEntry(3, 0))
+
+        assert backend.get('b') is None
+        assert backend.get('a').value == 1
+        assert backend.get('c').value == 3
+        assert len(backend) == 2
+
+    def test_memory_cache_evicts_by_bytes(self):
+        backend = MemoryCache(maxsize=10, maxbytes=100)
+        backend.set('a', CacheEntry(1, 0, size=40))
+        backend.set('b', CacheEntry(2, 0, size=40))
+        backend.get('a')
+        backend.set('c', CacheEntry(3, 0, size=40))
+
+        assert backend.get('b') is None
+        assert backend.get('a').value == 1
+        assert backend.bytes == 80
+
+        backend.set('a', CacheEntry(4, 0, size=10))
+        assert backend.bytes == 50
+
+    def test_memory_cache_skips_entries_over_budget(self):
+        backend = MemoryCache(maxbytes=100)
+        backend.set('a', CacheEntry(1, 0, size=40))
+        backend.set('big', CacheEntry(2, 0, size=101))
+
+        assert backend.get('big') is None
+        assert backend.get('a').value == 1
+        assert backend.bytes == 40
+
+        backend.delete('a')
+        assert backend.bytes == 0
+
+    def test_delete_and_clear(self, make_backend):
+        backend = make_backend(10)
+        backend.set('a', CacheEntry(1, 0))
+        backend.set('b', CacheEntry(2, 0))
+
+        backend.delete('a')
+        assert backend.get('a') is None
+
+        backend.clear()
+        assert len(backend) == 0
+
+    def test_keeps_validators(self, make_backend):
+        backend = make_backend(10)
+        backend.set('k', CacheEntry({}, 1.0, '"v1"', 'Wed, 21 Oct 2015 07:28:00 GMT'))
+
+        entry = backend.get('k')
+        assert entry.etag == '"v1"'
+        assert entry.last_modified == 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+    def test_sqlite_adds_validator_columns_to_old_table(self, tmp_path):
+        path = str(tmp_path / 'cache.db')
+        conn = sqlite3.connect(path)
+        conn.execute(
+            'CREATE TABLE auto_api_cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at INTEGER NOT NULL)'
+        )
+        conn.execute('INSERT INTO auto_api_cache VALUES (?, ?, ?, ?)', ('old', '{}', 1.0, 1))
+        conn.commit()
+        conn.close()
+
+        backend = SQLiteCache(path)
+        backend.set('new', CacheEntry({}, 1.0, '"v1"'))
+
+        assert backend.get('old').etag is None
+        assert backend.get('new').etag == '"v1"'
+
+    def test_sqlite_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / 'cache.db')
+        SQLiteCache(path).set('k', CacheEntry({'x': 1}, 5.0))
+
+        assert SQLiteCache(path).get('k').value == {'x': 1}
+
+
+# ── ResponseCache ────────────────────────────────────────────────
+
+
+class TestResponseCache:
+    def test_key_ignores_api_key_and_param_order(self):
+        cache = ResponseCache()
+
+        a = cache.key('GET', 'api/v2/encar/offers', {'api_key': 'one', 'page': 1, 'brand': 'Kia'})
+        b = cache.key('GET', 'api/v2/encar/offers', {'brand': 'Kia', 'page': 1, 'api_key': 'two'})
+
+        assert a == b
+        assert 'api_key' not in a
+
+    def test_ttl_per_endpoint(self):
+        cache = ResponseCache(ttls={'offers': 5})
+
+        assert cache.ttl('api/v2/encar/filters') == 24 * 3600
+        assert cache.ttl('api/v2/encar/offers') == 5
+        assert ResponseCache().ttl('api/v2/encar/offers') == 0
+        assert cache.ttl('api/v2/encar/changes') == 0
+
+    def test_expired_entry_is_a_miss(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set('k', 'api/v2/encar/offer', {'x': 1})
+
+        assert cache.get('k') == {'x': 1}
+        clock.now += 301
+        assert cache.get('k') is None
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'revalidations': 0, 'size': 1}
+
+
+    def test_stale_entry_with_validators_is_returned_for_revalidation(self):
+        clock = FakeClock()
+        cache = ResponseCache(clock=clock)
+        cache.set('a', 'api/v2/encar/filters', {'x': 1}, etag='"v1"')
+        cache.set('b', 'api/v2/encar/filters', {'x': 2})
+        clock.now += 24 * 3600 + 1
+
+        value, stale = cache.lookup('a')
+        assert value is None
+        assert stale.conditional_headers() == {'If-None-Match': '"v1"'}
+        assert cache.lookup('b') == (None, None)
+
+        cache.revalidated('a', 'api/v2/encar/filters', stale)
+        assert cache.get('a') == {'x': 1}
+        assert cache.revalidations == 1
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientCache:
+    def test_disabled_by_default(self):
+        client = Client('test-key')
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': []})) as mock:
+            client.get_filters('encar')
+            client.get_filters('encar')
+
+        assert client.cache is None
+        assert mock.call_count == 2
+
+    def test_repeated_call_is_served_from_cache(self):
+        client = Client('test-key', cache=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': ['Kia']})) as mock:
+            first = client.get_filters('encar')
+            second = client.get_filters('encar')
+
+        assert first == second == {'mark': ['Kia']}
+        assert mock.call_count == 1
+        assert client.cache.hits == 1
+        assert client.cache.misses == 1
+
+    def test_different_params_are_different_entries(self):
+        client = Client('test-key', cache=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})) as mock:
+            client.get_offer('encar', 'a')
+            client.get_offer('encar', 'b')
+            client.get_offer('encar', 'a')
+
+        assert mock.call_count == 2
+
+    def test_changes_are_never_cached(self):
+        client = Client('test-key', cache=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'result': []})) as mock:
+            client.get_changes('encar', 1)
+            client.get_changes('encar', 1)
+
+        assert mock.call_count == 2
+        assert client.cache.stats()['size'] == 0
+
+    def test_offer_pages_are_not_cached_by_default(self):
+        client = Client('test-key', cache=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'result': [], 'meta': {}})) as mock:
+            client.get_offers('encar', page=1)
+            client.get_offers('encar', page=1)
+
+        assert mock.call_count == 2
+
+    def test_entries_are_weighed_by_body_size(self):
+        client = Client('test-key', cache=True)
+        response = MockResponse({'mark': ['Kia']})
+
+        with patch.object(client.session, 'get', return_value=response):
+            client.get_filters('encar')
+
+        assert client.cache.backend.bytes == len(response.content)
+
+    def test_errors_are_not_cached(self):
+        client = Client('test-key', cache=True)
+        responses = [MockResponse({'message': 'Boom'}, 500), MockResponse({'mark': []})]
+
+        with patch.object(client.session, 'get', side_effect=responses) as mock:
+            with pytest.raises(Exception):
+                client.get_filters('encar')
+            client.get_filters('encar')
+
+        assert mock.call_count == 2
+
+    def test_offer_by_url_is_cached_by_body(self):
+        client = Client('test-key', cache=True)
+
+        with patch.object(client.session, 'post', return_value=MockResponse({'mark': 'BMW'})) as mock:
+            client.get_offer_by_url('https://example.com/car/1')
+            client.get_offer_by_url('https://example.com/car/1')
+            client.get_offer_by_url('https://example.com/car/2')
+
+        assert mock.call_count == 2
+
+    def test_accepts_backend(self, tmp_path):
+        client = Client('test-key', cache=SQLiteCache(str(tmp_path / 'cache.db')))
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': ['Kia']})) as mock:
+            client.get_filters('encar')
+            result = client.get_filters('encar')
+
+        assert result == {'mark': ['Kia']}
+        assert mock.call_count == 1
+        assert isinstance(client.cache, ResponseCache)
+
+
+# ── Conditional requests ─────────────────────────────────────────
+
+
+class TestConditionalRequests:
+    def make_client(self):
+        clock = FakeClock()
+        return Client('test-key', cache=ResponseCache(clock=clock)), clock
+
+    def test_sends_validators_once_stale_and_uses_304(self):
+        client, clock = self.make_client()
+        headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        responses = [MockResponse({'mark': ['Kia']}, headers=headers), MockResponse('', 304, 'Not Modified')]
+
+        with patch.object(client.session, 'get', side_effect=responses) as mock:
+            client.get_filters('encar')
+            clock.now += 24 * 3600 + 1
+            result = client.get_filters('encar')
+            again = client.get_filters('encar')
+
+        assert result == again == {'mark': ['Kia']}
+        assert mock.call_count == 2
+        assert 'headers' not in mock.call_args_list[0][1]
+        assert mock.call_args_list[1][1]['headers'] == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        }
+        assert client.cache.stats()['revalidations'] == 1
+
+    def test_changed_body_replaces_entry(self):
+        client, clock = self.make_client()
+        responses = [
+            MockResponse({'mark': 'Kia'}, headers={'ETag': '"v1"'}),
+            MockResponse({'mark': 'BMW'}, headers={'ETag': '"v2"'}),
+            MockResponse('', 304, 'Not Modified'),
+        ]
+
+        with patch.object(client.session, 'get', side_effect=responses) as mock:
+            client.get_offer('encar', '1')
+            clock.now += 301
+            assert client.get_offer('encar', '1') == {'mark': 'BMW'}
+            clock.now += 301
+            assert client.get_offer('encar', '1') == {'mark': 'BMW'}
+
+        assert mock.call_args_list[2][1]['headers'] == {'If-None-Match': '"v2"'}
+
+    def test_stale_entry_without_validators_is_refetched_plainly(self):
+        client, clock = self.make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': []})) as mock:
+            client.get_filters('encar')
+            clock.now += 24 * 3600 + 1
+            client.get_filters('encar')
+
+        assert mock.call_count == 2
+        assert 'headers' not in mock.call_args[1]
+
+    def test_negotiates_supported_encodings(self):
+        assert Client('test-key').session.headers['Accept-Encoding'] == ACCEPT_ENCODING
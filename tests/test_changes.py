@@ -0,0 +1,184 @@
+import datetime
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from auto_api.changes import (
+    FileCheckpoint,
+    MemoryCheckpoint,
+    SQLiteCheckpoint,
+    follow_changes,
+    resolve_change_id,
+)
+from auto_api.client import Client
+from tests.test_client import MockResponse
+
+
+class FakeFeed:
+    """Stands in for Client: serves get_changes batches keyed by change_id."""
+
+    def __init__(self, batches, change_ids=None):
+        self.batches = batches
+        self.change_ids = change_ids or {}
+        self.requested = []
+
+    def get_changes(self, source, change_id):
+        self.requested.append(change_id)
+        return self.batches.get(change_id, {'result': [], 'meta': {'next_change_id': change_id}})
+
+    def get_change_id(self, source, date):
+        return self.change_ids[date]
+
+
+def feed_of(*sizes, first=100):
+    """Consecutive batches of `sizes` records; the last one is followed by an empty head batch."""
+    batches = {}
+    change_id = first
+    for size in sizes:
+        records = [{'change_type': 'changed', 'inner_id': f'{change_id}-{i}'} for i in range(size)]
+        batches[change_id] = {'result': records, 'meta': {'next_change_id': change_id + size}}
+        change_id += size
+    return FakeFeed(batches)
+
+
+# ── Checkpoint stores ────────────────────────────────────────────
+
+
+class TestCheckpointStores:
+    @pytest.fixture(params=['memory', 'file', 'sqlite'])
+    def store(self, request, tmp_path):
+        if request.param == 'memory':
+            return MemoryCheckpoint()
+        if request.param == 'file':
+            return FileCheckpoint(str(tmp_path / 'checkpoints.json'))
+        return SQLiteCheckpoint(str(tmp_path / 'checkpoints.db'))
+
+    def test_load_missing_returns_none(self, store):
+        assert store.load('encar') is None
+
+    def test_save_and_load(self, store):
+        store.save('encar', 42)
+        store.save('mobilede', 7)
+        store.save('encar', 43)
+
+        assert store.load('encar') == 43
+        assert store.load('mobilede') == 7
+
+    def test_file_checkpoint_survives_reopen(self, tmp_path):
+        path = str(tmp_path / 'checkpoints.json')
+        FileCheckpoint(path).save('encar', 42)
+
+        assert FileCheckpoint(path).load('encar') == 42
+        assert json.loads((tmp_path / 'checkpoints.json').read_text()) == {'encar': 42}
+        assert not (tmp_path / 'checkpoints.json.tmp').exists()
+
+    def test_sqlite_checkpoint_survives_reopen(self, tmp_path):
+        path = str(tmp_path / 'checkpoints.db')
+        store = SQLiteCheckpoint(path)
+        store.save('encar', 42)
+        store.close()
+
+        assert SQLiteCheckpoint(path).load('encar') == 42
+
+
+# ── resolve_change_id ────────────────────────────────────────────
+
+
+class TestResolveChangeId:
+    def test_change_id_is_used_as_is(self):
+        assert resolve_change_id(FakeFeed({}), 'encar', 42) == 42
+
+    def test_date_string_is_looked_up(self):
+        feed = FakeFeed({}, change_ids={'2025-01-15': 900})
+        assert resolve_change_id(feed, 'encar', '2025-01-15') == 900
+
+    def test_date_object_is_looked_up(self):
+        feed = FakeFeed({}, change_ids={'2025-01-15': 900})
+        assert resolve_change_id(feed, 'encar', datetime.date(2025, 1, 15)) == 900
+
+    def test_rejects_other_types(self):
+        with pytest.raises(TypeError):
+            resolve_change_id(FakeFeed({}), 'encar', 1.5)
+
+
+# ── follow_changes ───────────────────────────────────────────────
+
+
+class TestFollowChanges:
+    def test_yields_records_across_batches(self):
+        feed = feed_of(2, 3)
+
+        ids = [r['inner_id'] for r in follow_changes(feed, 'encar', 100, stop_at_head=True)]
+
+        assert ids == ['100-0', '100-1', '102-0', '102-1', '102-2']
+
+    def test_requires_start_without_checkpoint(self):
+        with pytest.raises(ValueError):
+            list(follow_changes(feed_of(1), 'encar', stop_at_head=True))
+
+    def test_saves_checkpoint_after_each_consumed_batch(self):
+        feed = feed_of(2, 3)
+        checkpoint = MemoryCheckpoint()
+        stream = follow_changes(feed, 'encar', 100, checkpoint=checkpoint, stop_at_head=True)
+
+        next(stream)
+        next(stream)
+        assert checkpoint.load('encar') is None
+
+        next(stream)
+        assert checkpoint.load('encar') == 102
+
+        list(stream)
+        assert checkpoint.load('encar') == 105
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        checkpoint = FileCheckpoint(str(tmp_path / 'checkpoints.json'))
+        stream = follow_changes(feed_of(2, 3), 'encar', 100, checkpoint=checkpoint, stop_at_head=True)
+        [next(stream) for _ in range(3)]
+        stream.close()
+
+        feed = feed_of(2, 3)
+        ids = [r['inner_id'] for r in follow_changes(feed, 'encar', 100, checkpoint=checkpoint, stop_at_head=True)]
+
+        assert ids == ['102-0', '102-1', '102-2']
+        assert 100 not in feed.requested
+
+    def test_prefetches_next_batch(self):
+        feed = feed_of(2, 3)
+        stream = follow_changes(feed, 'encar', 100, stop_at_head=True)
+
+        next(stream)
+        deadline = time.monotonic() + 2
+        while len(feed.requested) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert feed.requested == [100, 102]
+
+    def test_backs_off_at_head(self):
+        feed = feed_of(1)
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 4:
+                feed.batches[101] = {'result': [{'inner_id': 'late'}], 'meta': {'next_change_id': 102}}
+
+        stream = follow_changes(feed, 'encar', 100, poll_interval=1, max_interval=4, sleep=sleep)
+        ids = [next(stream)['inner_id'], next(stream)['inner_id']]
+        stream.close()
+
+        assert ids == ['100-0', 'late']
+        assert sleeps == [1, 2, 4, 4]
+
+    def test_client_method_uses_get_changes(self):
+        client = Client('test-key')
+        batch = {'result': [{'inner_id': 'a'}], 'meta': {'next_change_id': 2}}
+        responses = [MockResponse(batch), MockResponse({'result': [], 'meta': {'next_change_id': 2}})]
+
+        with patch.object(client.session, 'get', side_effect=responses) as mock:
+            records = list(client.follow_changes('encar', 1, stop_at_head=True))
+
+        assert records == [{'inner_id': 'a'}]
+        assert [call[1]['params']['change_id'] for call in mock.call_args_list] == [1, 2]
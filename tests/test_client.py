@@ -2,18 +2,20 @@ import json
 from unittest.mock import patch, MagicMock
 
 import pytest
+import requests
 
 from auto_api.client import Client
-from auto_api.errors import ApiError, AuthError
+from auto_api.errors import ApiError, AuthError, NetworkError
 
 
 class MockResponse:
     """Minimal mock of requests.Response."""
 
-    def __init__(self, body, status_code=200, reason='OK'):
+    def __init__(self, body, status_code=200, reason='OK', headers=None):
         self.status_code = status_code
         self.reason = reason
         self.ok = 200 <= status_code < 400
+        self.headers = headers or {}
 
         if isinstance(body, str):
             self.text = body
@@ -24,11 +26,21 @@ class MockResponse:
             self._json_data = body
             self._json_error = False
 
+        self.content = self.text.encode()
+        self.closed = False
+
     def json(self):
         if self._json_error:
             raise ValueError('No JSON')
         return self._json_data
 
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
 
 def make_client():
     client = Client('test-key')
@@ -120,6 +132,84 @@ class TestGetOffers:
         assert '/api/v2/encar/offers' in url
 
 
+# ── iterOffers ───────────────────────────────────────────────────
+
+
+def paged_responses(pages, per_page=2):
+    """session.get side effect serving `pages` sequential pages of offers."""
+
+    def get(url, params=None, **kwargs):
+        page = params['page']
+        if page > pages:
+            return MockResponse({'result': [], 'meta': {'page': page, 'next_page': None}})
+        items = [{'inner_id': f'{page}-{i}'} for i in range(per_page)]
+        next_page = page + 1 if page < pages else None
+        return MockResponse({'result': items, 'meta': {'page': page, 'next_page': next_page}})
+
+    return get
+
+
+class TestIterOffers:
+    def test_streams_items_across_pages(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=paged_responses(3)):
+            ids = [item['inner_id'] for item in client.iter_offers('encar', brand='Kia')]
+
+        assert ids == ['1-0', '1-1', '2-0', '2-1', '3-0', '3-1']
+
+    def test_passes_filters_to_every_page(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=paged_responses(2)) as mock:
+            list(client.iter_offers('encar', brand='Kia', year_from=2020))
+
+        for call in mock.call_args_list:
+            assert call[1]['params']['brand'] == 'Kia'
+            assert call[1]['params']['year_from'] == 2020
+
+    def test_starts_from_given_page(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=paged_responses(3)):
+            ids = [item['inner_id'] for item in client.iter_offers('encar', page=3)]
+
+        assert ids == ['3-0', '3-1']
+
+    def test_concurrent_mode_keeps_page_order(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=paged_responses(20)):
+            ids = [item['inner_id'] for item in client.iter_offers('encar', concurrency=4)]
+
+        assert ids == [f'{page}-{i}' for page in range(1, 21) for i in range(2)]
+
+    def test_concurrent_mode_bounds_speculative_fetches(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=paged_responses(2)) as mock:
+            list(client.iter_offers('encar', concurrency=4))
+
+        requested = sorted(call[1]['params']['page'] for call in mock.call_args_list)
+        assert requested[:2] == [1, 2]
+        assert len(requested) <= 2 + 4
+
+    def test_concurrent_mode_follows_non_sequential_next_page(self):
+        responses = {
+            1: {'result': [{'inner_id': 'a'}], 'meta': {'next_page': 5}},
+            5: {'result': [{'inner_id': 'b'}], 'meta': {'next_page': None}},
+        }
+        client = make_client()
+
+        def get(url, params=None, **kwargs):
+            return MockResponse(responses.get(params['page'], {'result': [{'inner_id': 'stale'}], 'meta': {}}))
+
+        with patch.object(client.session, 'get', side_effect=get):
+            ids = [item['inner_id'] for item in client.iter_offers('encar', concurrency=3)]
+
+        assert ids == ['a', 'b']
+
+
 # ── getOffer ─────────────────────────────────────────────────────
 
 
@@ -143,6 +233,68 @@ class TestGetOffer:
         assert params['inner_id'] == 'abc123'
 
 
+# ── getOffersBulk ────────────────────────────────────────────────
+
+
+def offer_by_id(failing=()):
+    """session.get side effect answering get_offer with the requested inner_id."""
+
+    def get(url, params=None, **kwargs):
+        inner_id = params['inner_id']
+        if inner_id in failing:
+            return MockResponse({'message': 'Offer not found'}, 404, 'Not Found')
+        return MockResponse({'inner_id': inner_id})
+
+    return get
+
+
+class TestGetOffersBulk:
+    def test_returns_dict_keyed_by_inner_id(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=offer_by_id()):
+            result = client.get_offers_bulk('encar', ['a', 'b', 'c'], concurrency=2)
+
+        assert result == {'a': {'inner_id': 'a'}, 'b': {'inner_id': 'b'}, 'c': {'inner_id': 'c'}}
+
+    def test_dedupes_ids(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=offer_by_id()) as mock:
+            result = client.get_offers_bulk('encar', ['a', 'b', 'a', 'a'])
+
+        assert sorted(result) == ['a', 'b']
+        assert mock.call_count == 2
+
+    def test_failures_are_reported_per_id(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=offer_by_id(failing={'b'})):
+            result = client.get_offers_bulk('encar', ['a', 'b', 'c'])
+
+        assert result['a'] == {'inner_id': 'a'}
+        assert isinstance(result['b'], ApiError)
+        assert result['b'].status_code == 404
+        assert result['c'] == {'inner_id': 'c'}
+
+    def test_stream_yields_pairs(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=offer_by_id()):
+            pairs = list(client.get_offers_bulk('encar', ['a', 'b'], stream=True))
+
+        assert sorted(pairs, key=lambda pair: pair[0]) == [('a', {'inner_id': 'a'}), ('b', {'inner_id': 'b'})]
+
+    def test_empty_ids(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get') as mock:
+            result = client.get_offers_bulk('encar', [])
+
+        assert result == {}
+        mock.assert_not_called()
+
+
 # ── getChangeId ──────────────────────────────────────────────────
 
 
@@ -381,10 +533,68 @@ class TestErrorHandling:
         assert not isinstance(exc_info.value, AuthError)
 
 
+    def test_connection_error_raises_network_error(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', side_effect=requests.ConnectionError('reset')):
+            with pytest.raises(NetworkError) as exc_info:
+                client.get_filters('encar')
+
+        assert isinstance(exc_info.value.__cause__, requests.ConnectionError)
+
+    def test_timeout_raises_network_error(self):
+        client = make_client()
+
+        with patch.object(client.session, 'post', side_effect=requests.Timeout('read timed out')):
+            with pytest.raises(NetworkError, match='timed out'):
+                client.get_offer_by_url('https://example.com/car/123')
+
+
 # ── Session configuration ────────────────────────────────────────
 
 
 class TestSessionConfig:
-    def test_session_timeout_is_30(self):
+    def test_default_timeout_is_30(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})) as mock:
+            client.get_filters('encar')
+
+        assert client.timeout == 30
+        assert mock.call_args[1]['timeout'] == 30
+
+    def test_client_timeout_applies_to_every_request(self):
+        client = Client('test-key', timeout=(3.05, 10))
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})) as get_mock:
+            client.get_offers('encar', page=1)
+        with patch.object(client.session, 'post', return_value=MockResponse({})) as post_mock:
+            client.get_offer_by_url('https://example.com/car/123')
+
+        assert get_mock.call_args[1]['timeout'] == (3.05, 10)
+        assert post_mock.call_args[1]['timeout'] == (3.05, 10)
+
+    def test_per_call_timeout_overrides_client_timeout(self):
+        client = make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})) as mock:
+            client.get_offers('encar', page=1, brand='Kia', timeout=5)
+
+        assert mock.call_args[1]['timeout'] == 5
+        assert 'timeout' not in mock.call_args[1]['params']
+
+    def test_pool_sizing_is_applied_to_adapters(self):
+        client = Client('test-key', pool_connections=4, pool_maxsize=32, pool_block=True)
+
+        adapter = client.session.get_adapter('https://api1.auto-api.com')
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+
+    def test_keep_alive_can_be_disabled(self):
+        client = Client('test-key', keep_alive=False)
+        assert client.session.headers['Connection'] == 'close'
+
+    def test_keep_alive_by_default(self):
         client = make_client()
-        assert client.session.timeout == 30
+        assert 'close' not in client.session.headers.get('Connection', '')
@@ -0,0 +1,150 @@
+import pytest
+
+from auto_api.compaction import Compactor, Delta, compact, diff
+from auto_api.mirror import Mirror
+from auto_api.models import Change
+
+
+def record(id, inner_id, change_type, **data):
+    result = {'id': id, 'inner_id': inner_id, 'change_type': change_type}
+    if data:
+        result['data'] = data
+    return result
+
+
+# ── compact ──────────────────────────────────────────────────────
+
+
+class TestCompact:
+    def test_collapses_to_net_effect(self):
+        deltas = compact([
+            record(1, 'a', 'added', price=100),
+            record(2, 'b', 'changed', price=50),
+            record(3, 'a', 'changed', price=90),
+            record(4, 'c', 'added', price=10),
+            record(5, 'c', 'removed'),
+            record(6, 'b', 'removed'),
+        ], source='encar')
+
+        assert [(d.inner_id, d.change_type) for d in deltas] == [('a', 'added'), ('b', 'removed')]
+        a, b = deltas
+        assert a.data == {'price': 90}
+        assert (a.first_id, a.last_id, a.records) == (1, 3, 2)
+        assert a.source == 'encar'
+        assert b.data is None
+
+    def test_order_follows_last_record(self):
+        deltas = compact([record(1, 'a', 'changed', x=1), record(2, 'b', 'changed', x=1), record(3, 'a', 'changed', x=2)])
+
+        assert [d.inner_id for d in deltas] == ['b', 'a']
+
+    def test_removed_then_added_is_changed(self):
+        (delta,) = compact([record(1, 'a', 'removed'), record(2, 'a', 'added', price=1)])
+
+        assert delta.change_type == 'changed'
+        assert delta.data == {'price': 1}
+
+    def test_accepts_change_models(self):
+        records = [Change.from_dict(record(1, 7, 'added', mark='Kia')), Change.from_dict(record(2, 7, 'changed', mark='Kia', price=5))]
+
+        (delta,) = compact(records)
+
+        assert delta.inner_id == '7'
+        assert delta.data['price'] == 5
+
+    def test_to_dict(self):
+        delta = Delta('encar', 'a', 'added', {'price': 1}, last_id=9)
+
+        assert delta.to_dict() == {'id': 9, 'inner_id': 'a', 'change_type': 'added', 'data': {'price': 1}}
+
+
+class TestDiff:
+    def test_fields(self):
+        assert diff({'price': 100, 'km_age': 10, 'color': 'red'}, {'price': 90, 'km_age': 10, 'year': 2020}) == {
+            'price': (100, 90),
+            'color': ('red', None),
+            'year': (None, 2020),
+        }
+
+    def test_none(self):
+        assert diff(None, {'price': 1}) == {'price': (None, 1)}
+
+
+# ── Compactor ────────────────────────────────────────────────────
+
+
+class TestCompactor:
+    def test_diffs_against_committed_state(self):
+        compactor = Compactor()
+        first = compactor.compact('encar', [record(1, 'a', 'added', price=100, km_age=10)])
+        compactor.commit('encar', first)
+
+        (delta,) = compactor.compact('encar', [
+            record(2, 'a', 'changed', price=95, km_age=10),
+            record(3, 'a', 'changed', price=90, km_age=12),
+        ])
+
+        assert delta.change_type == 'changed'
+        assert delta.previous == {'price': 100, 'km_age': 10}
+        assert delta.changes == {'price': (100, 90), 'km_age': (10, 12)}
+
+    def test_drops_unchanged(self):
+        compactor = Compactor({('encar', 'a'): {'price': 1}})
+
+        assert compactor.compact('encar', [record(1, 'a', 'changed', price=2), record(2, 'a', 'changed', price=1)]) == []
+
+    def test_readded_known_offer_is_changed(self):
+        compactor = Compactor({('encar', 'a'): {'price': 1}})
+
+        (delta,) = compactor.compact('encar', [record(1, 'a', 'added', price=2)])
+
+        assert delta.change_type == 'changed'
+        assert delta.changes == {'price': (1, 2)}
+
+    def test_commit_removes(self):
+        state = {('encar', 'a'): {'price': 1}}
+        compactor = Compactor(state)
+
+        compactor.commit('encar', compactor.compact('encar', [record(1, 'a', 'removed')]))
+
+        assert state == {}
+
+    def test_sources_are_separate(self):
+        compactor = Compactor({('encar', 'a'): {'price': 1}})
+
+        (delta,) = compactor.compact('mobilede', [record(1, 'a', 'added', price=2)])
+
+        assert delta.change_type == 'added'
+        assert delta.previous is None
+
+
+class TestCompactorMirror:
+    @pytest.fixture
+    def mirror(self, tmp_path):
+        mirror = Mirror(str(tmp_path / 'offers.db'))
+        mirror.apply('encar', [record(1, 'a', 'added', mark='Kia', price=100), record(2, 'b', 'added', mark='BMW', price=50)])
+        yield mirror
+        mirror.close()
+
+    def test_reads_and_writes_mirror(self, mirror):
+        compactor = Compactor(mirror)
+
+        deltas = compactor.compact('encar', [
+            record(3, 'a', 'changed', mark='Kia', price=80),
+            record(4, 'b', 'removed'),
+            record(5, 'c', 'added', mark='Audi', price=70),
+        ])
+        compactor.commit('encar', deltas, change_id=6)
+
+        assert [(d.inner_id, d.change_type) for d in deltas] == [('a', 'changed'), ('b', 'removed'), ('c', 'added')]
+        assert deltas[0].changes == {'price': (100, 80)}
+        assert mirror.get('encar', 'a')['data']['price'] == 80
+        assert mirror.get('encar', 'b') is None
+        assert mirror.get('encar', 'c')['data']['mark'] == 'Audi'
+        assert mirror.position('encar') == 6
+
+    def test_get_many(self, mirror):
+        found = mirror.get_many('encar', ['a', 'missing', 'a'] + [str(i) for i in range(2000)])
+
+        assert set(found) == {'a'}
+        assert found['a']['price'] == 100
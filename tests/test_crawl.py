@@ -0,0 +1,94 @@
+import multiprocessing
+
+import pytest
+
+from auto_api.crawl import Crawler
+from auto_api.errors import AuthError
+from benchmarks.payloads import MARKS
+from benchmarks.server import MockServer
+
+
+def inner_id(item):
+    return item['inner_id']
+
+
+def even_only(item):
+    return item['inner_id'] if int(item['inner_id']) % 2 == 0 else None
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockServer(pages=7, per_page=5, images=1) as server:
+        yield server
+
+
+# ── Partitioning ─────────────────────────────────────────────────
+
+
+class TestCrawler:
+    def test_rejects_unknown_partition(self):
+        with pytest.raises(ValueError):
+            Crawler('key', partition='color')
+
+    def test_rejects_page(self, server):
+        with pytest.raises(TypeError):
+            Crawler('key', base_url=server.url).crawl('encar', page=2)
+
+    def test_pages(self, server):
+        crawler = Crawler('key', processes=3, transform=inner_id, base_url=server.url)
+
+        ids = list(crawler.crawl('encar'))
+
+        assert sorted(ids) == [str(40000000 + i) for i in range(35)]
+
+    def test_more_processes_than_pages(self, server):
+        crawler = Crawler('key', processes=12, base_url=server.url)
+
+        items = list(crawler.crawl('encar'))
+
+        assert len(items) == 35
+        assert items[0]['data']['mark']
+
+    def test_brands(self, server):
+        crawler = Crawler('key', processes=2, partition='brand', transform=inner_id, base_url=server.url)
+
+        ids = list(crawler.crawl('encar', brands=['Kia', 'Hyundai', 'BMW']))
+
+        # The mock server ignores the brand filter, so every brand lists all offers.
+        assert len(ids) == 3 * 35
+        assert len(set(ids)) == 35
+
+    def test_brands_from_filters(self, server):
+        crawler = Crawler('key', processes=2, partition='brand', transform=inner_id, base_url=server.url)
+
+        ids = list(crawler.crawl('encar'))
+
+        assert len(ids) == len(MARKS) * 35
+
+    def test_transform_drops_none(self, server):
+        crawler = Crawler('key', processes=2, transform=even_only, base_url=server.url)
+
+        assert sorted(crawler.crawl('encar')) == [str(40000000 + i) for i in range(0, 35, 2)]
+
+
+# ── Errors and shutdown ──────────────────────────────────────────
+
+
+class TestShutdown:
+    def test_worker_errors_are_raised(self):
+        with MockServer(api_key='secret') as server:
+            crawler = Crawler('wrong', processes=2, base_url=server.url)
+            with pytest.raises(AuthError) as error:
+                list(crawler.crawl('encar'))
+
+        assert error.value.status_code == 401
+
+    def test_closing_early_stops_workers(self, server):
+        crawler = Crawler('key', processes=2, queue_size=1, base_url=server.url)
+
+        stream = crawler.crawl('encar')
+        first = next(stream)
+        stream.close()
+
+        assert first['inner_id']
+        assert not multiprocessing.active_children()
@@ -0,0 +1,91 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from auto_api.client import Client
+from auto_api.decoders import AUTO_ORDER, available_decoders, get_decoder
+from auto_api.errors import ApiError
+from tests.test_client import MockResponse
+
+PAGE = {
+    'result': [
+        {'inner_id': '1', 'data': {'mark': 'Hyundai', 'model': 'Sonata', 'price': 21000, 'images': ['a.jpg']}},
+        {'inner_id': '2', 'data': {'mark': '기아', 'model': 'K5', 'price': None, 'images': []}},
+    ],
+    'meta': {'page': 1, 'next_page': 2},
+}
+BODY = json.dumps(PAGE, ensure_ascii=False).encode()
+
+
+# ── get_decoder ──────────────────────────────────────────────────
+
+
+class TestGetDecoder:
+    @pytest.mark.parametrize('name', available_decoders())
+    def test_decodes_bytes(self, name):
+        assert get_decoder(name)(BODY) == PAGE
+
+    @pytest.mark.parametrize('name', available_decoders())
+    def test_invalid_json_raises_value_error(self, name):
+        with pytest.raises(ValueError):
+            get_decoder(name)(b'not json at all')
+
+    def test_stdlib_is_always_available(self):
+        assert 'json' in available_decoders()
+
+    def test_auto_prefers_fastest_installed(self):
+        expected = next(name for name in AUTO_ORDER if name in available_decoders())
+        assert get_decoder('auto').__module__ == get_decoder(expected).__module__
+
+    def test_callable_is_used_as_is(self):
+        decoder = lambda data: {'raw': data}
+        assert get_decoder(decoder) is decoder
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match='Unknown decoder'):
+            get_decoder('yaml')
+
+    def test_missing_backend_raises_import_error(self):
+        with patch.dict('sys.modules', {'orjson': None}):
+            with pytest.raises(ImportError):
+                get_decoder('orjson')
+
+    def test_auto_falls_back_to_stdlib(self):
+        with patch.dict('sys.modules', {'orjson': None, 'msgspec': None}):
+            assert get_decoder('auto') is json.loads
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientDecoder:
+    @pytest.mark.parametrize('name', available_decoders())
+    def test_decodes_response_content(self, name):
+        client = Client('test-key', decoder=name)
+
+        with patch.object(client.session, 'get', return_value=MockResponse(PAGE)):
+            assert client.get_offers('encar', page=1) == PAGE
+
+    @pytest.mark.parametrize('name', available_decoders())
+    def test_invalid_json_raises_api_error(self, name):
+        client = Client('test-key', decoder=name)
+
+        with patch.object(client.session, 'get', return_value=MockResponse('<html>oops</html>')):
+            with pytest.raises(ApiError, match='Invalid JSON response: <html>oops</html>'):
+                client.get_filters('encar')
+
+    def test_error_body_uses_decoder(self):
+        calls = []
+
+        def decoder(data):
+            calls.append(data)
+            return json.loads(data)
+
+        client = Client('test-key', decoder=decoder)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Nope'}, 422)):
+            with pytest.raises(ApiError, match='Nope'):
+                client.get_filters('encar')
+
+        assert calls == [b'{"message": "Nope"}']
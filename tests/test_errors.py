@@ -1,4 +1,4 @@
-from auto_api.errors import ApiError, AuthError
+from auto_api.errors import ApiError, AuthError, NetworkError
 
 
 # ── ApiError ─────────────────────────────────────────────────────
@@ -59,3 +59,25 @@ class TestAuthError:
     def test_response_body_is_none(self):
         error = AuthError()
         assert error.response_body is None
+
+
+# ── NetworkError ─────────────────────────────────────────────────
+
+
+class TestNetworkError:
+    def test_extends_api_error(self):
+        error = NetworkError()
+        assert isinstance(error, ApiError)
+        assert not isinstance(error, AuthError)
+
+    def test_default_message(self):
+        error = NetworkError()
+        assert error.message == 'Network error'
+
+    def test_default_status_code_is_zero(self):
+        error = NetworkError()
+        assert error.status_code == 0
+
+    def test_custom_message(self):
+        error = NetworkError('Connection reset')
+        assert error.message == 'Connection reset'
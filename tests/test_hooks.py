@@ -0,0 +1,165 @@
+import datetime
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from auto_api.client import Client
+from auto_api.errors import ApiError, NetworkError
+from auto_api.hooks import Hooks, RequestEvent, endpoint_template
+from auto_api.retry import RetryPolicy
+from tests.test_client import MockResponse
+
+
+class Recorder(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, event):
+        self.events.append(('request', event))
+
+    def on_response(self, event):
+        self.events.append(('response', event))
+
+    def on_error(self, event):
+        self.events.append(('error', event))
+
+
+def make_client(**kwargs):
+    recorder = Recorder()
+    return Client('test-key', hooks=[recorder], **kwargs), recorder
+
+
+# ── endpoint_template ────────────────────────────────────────────
+
+
+class TestEndpointTemplate:
+    def test_source_is_templated(self):
+        assert endpoint_template('api/v2/encar/offers') == ('api/v2/{source}/offers', 'encar')
+
+    def test_other_paths_are_kept(self):
+        assert endpoint_template('health') == ('health', None)
+
+
+# ── Events ───────────────────────────────────────────────────────
+
+
+class TestEvents:
+    def test_request_and_response(self):
+        client, recorder = make_client()
+        response = MockResponse({'result': [], 'meta': {}})
+        response.elapsed = datetime.timedelta(seconds=0)
+
+        with patch.object(client.session, 'get', return_value=response):
+            client.get_offers('encar', page=1)
+
+        (first, event), (second, same) = recorder.events
+        assert (first, second) == ('request', 'response')
+        assert event is same
+        assert event.method == 'GET'
+        assert event.endpoint == 'api/v2/{source}/offers'
+        assert event.source == 'encar'
+        assert event.status_code == 200
+        assert event.size == len(response.content)
+        assert event.retries == 0
+        assert set(event.timings) == {'queue', 'ttfb', 'download', 'decode', 'total'}
+        assert event.timings['total'] >= event.timings['decode']
+
+    def test_never_exposes_api_key(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})):
+            client.get_offer('encar', '1')
+
+        event = recorder.events[-1][1]
+        assert 'test-key' not in repr([getattr(event, name) for name in RequestEvent.__slots__])
+
+    def test_post(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'post', return_value=MockResponse({'mark': 'BMW'})):
+            client.get_offer_by_url('https://example.com/car/1')
+
+        event = recorder.events[-1][1]
+        assert event.method == 'POST'
+        assert event.endpoint == 'api/v1/offer/info'
+        assert event.source is None
+        assert event.status_code == 200
+
+    def test_http_error(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Bad'}, 400)):
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        kind, event = recorder.events[-1]
+        assert kind == 'error'
+        assert event.status_code == 400
+        assert isinstance(event.error, ApiError)
+        assert 'total' in event.timings
+
+    def test_network_error(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'get', side_effect=requests.ConnectionError('refused')):
+            with pytest.raises(NetworkError):
+                client.get_filters('encar')
+
+        kind, event = recorder.events[-1]
+        assert kind == 'error'
+        assert event.status_code is None
+
+    def test_unexpected_errors_end_the_event(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'get', side_effect=RuntimeError('adapter bug')):
+            with pytest.raises(RuntimeError):
+                client.get_filters('encar')
+        with patch.object(client.session, 'post', side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                client.get_offer_by_url('https://example.com/car/1')
+        with patch.object(client.session, 'get', side_effect=RuntimeError('adapter bug')):
+            with pytest.raises(RuntimeError):
+                client.stream_offers('encar', page=1)
+
+        assert [kind for kind, _ in recorder.events] == ['request', 'error'] * 3
+        assert all(event.status_code is None and 'total' in event.timings for _, event in recorder.events)
+        assert isinstance(recorder.events[3][1].error, KeyboardInterrupt)
+
+    def test_retries_are_counted_in_one_event(self):
+        client, recorder = make_client(retry=RetryPolicy(backoff=0.001, sleep=lambda s: None, jitter=lambda: 1.0))
+        responses = [MockResponse({}, 503), MockResponse({}, 503), MockResponse({'mark': []})]
+
+        with patch.object(client.session, 'get', side_effect=responses):
+            client.get_filters('encar')
+
+        assert [kind for kind, _ in recorder.events] == ['request', 'response']
+        event = recorder.events[-1][1]
+        assert event.retries == 2
+        assert 'backoff' in event.timings
+
+    def test_cache_hits_fire_no_events(self):
+        client, recorder = make_client(cache=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': []})):
+            client.get_filters('encar')
+            client.get_filters('encar')
+
+        assert [kind for kind, _ in recorder.events] == ['request', 'response']
+
+    def test_stream_reports_headers_only(self):
+        client, recorder = make_client()
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'result': [], 'meta': {}})):
+            list(client.stream_offers('encar', page=1))
+
+        event = recorder.events[-1][1]
+        assert event.status_code == 200
+        assert event.size is None
+
+    def test_no_hooks_no_events(self):
+        client = Client('test-key')
+
+        assert client.hooks == []
+        assert client._start_event('GET', 'api/v2/encar/filters') is None
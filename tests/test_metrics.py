@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import pytest
+
+from auto_api.client import Client
+from auto_api.errors import ApiError
+from tests.test_client import MockResponse
+
+
+# ── Prometheus ───────────────────────────────────────────────────
+
+
+class TestPrometheusHooks:
+    @pytest.fixture
+    def setup(self):
+        prometheus_client = pytest.importorskip('prometheus_client')
+        from auto_api.metrics import PrometheusHooks
+
+        registry = prometheus_client.CollectorRegistry()
+        hooks = PrometheusHooks(registry=registry)
+        return Client('test-key', hooks=[hooks]), registry
+
+    def test_records_duration_phases_and_size(self, setup):
+        client, registry = setup
+        response = MockResponse({'result': [], 'meta': {}})
+
+        with patch.object(client.session, 'get', return_value=response):
+            client.get_offers('encar', page=1)
+            client.get_offers('encar', page=2)
+
+        labels = {'method': 'GET', 'endpoint': 'api/v2/{source}/offers', 'source': 'encar', 'status': '200'}
+        assert registry.get_sample_value('auto_api_request_duration_seconds_count', labels) == 2
+        phase = {'endpoint': 'api/v2/{source}/offers', 'source': 'encar', 'phase': 'decode'}
+        assert registry.get_sample_value('auto_api_request_phase_seconds_count', phase) == 2
+        size = {'endpoint': 'api/v2/{source}/offers', 'source': 'encar'}
+        assert registry.get_sample_value('auto_api_response_size_bytes_sum', size) == 2 * len(response.content)
+
+    def test_counts_errors(self, setup):
+        client, registry = setup
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Bad'}, 400)):
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        labels = {'endpoint': 'api/v2/{source}/filters', 'source': 'encar', 'error': 'ApiError'}
+        assert registry.get_sample_value('auto_api_request_errors_total', labels) == 1
+
+
+# ── OpenTelemetry ────────────────────────────────────────────────
+
+
+class TestOpenTelemetryHooks:
+    @pytest.fixture
+    def setup(self):
+        pytest.importorskip('opentelemetry.sdk')
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        from auto_api.metrics import OpenTelemetryHooks
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        hooks = OpenTelemetryHooks(provider.get_tracer('test'))
+        return Client('test-key', hooks=[hooks]), exporter
+
+    def test_span_per_call(self, setup):
+        client, exporter = setup
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': []})):
+            client.get_filters('encar')
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == 'GET api/v2/{source}/filters'
+        assert span.attributes['auto_api.source'] == 'encar'
+        assert span.attributes['http.response.status_code'] == 200
+        assert 'auto_api.timing.total' in span.attributes
+
+    def test_error_span(self, setup):
+        from opentelemetry.trace import StatusCode
+
+        client, exporter = setup
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Bad'}, 400)):
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        (span,) = exporter.get_finished_spans()
+        assert span.status.status_code == StatusCode.ERROR
+        assert span.events[0].name == 'exception'
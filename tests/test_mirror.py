@@ -0,0 +1,196 @@
+import datetime
+import json
+
+import pytest
+
+from auto_api.mirror import Mirror
+from auto_api.models import Change, Offer
+
+
+def offer(inner_id, mark='Kia', model='K5', year=2020, price=2000, km_age=10000):
+    return {'inner_id': inner_id, 'data': {'mark': mark, 'model': model, 'year': year, 'price': price, 'km_age': km_age}}
+
+
+class FakeSource:
+    """Stands in for Client: one offer listing plus a changes feed keyed by change_id."""
+
+    def __init__(self, offers=(), batches=None, change_id=100):
+        self.offers = list(offers)
+        self.batches = batches or {}
+        self.change_id = change_id
+        self.requested = []
+
+    def iter_offers(self, source, concurrency=1, **params):
+        return iter(self.offers)
+
+    def get_change_id(self, source, date):
+        self.requested.append(('change_id', date))
+        return self.change_id
+
+    def get_changes(self, source, change_id):
+        self.requested.append(('changes', change_id))
+        return self.batches.get(change_id, {'result': [], 'meta': {'next_change_id': change_id}})
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = Mirror(str(tmp_path / 'mirror.db'), batch_size=2)
+    yield mirror
+    mirror.close()
+
+
+# ── bootstrap ────────────────────────────────────────────────────
+
+
+class TestBootstrap:
+    def test_stores_crawl_and_position(self, mirror):
+        client = FakeSource([offer('1'), offer('2'), offer('3')])
+
+        assert mirror.bootstrap(client, 'encar') == 3
+
+        assert mirror.count('encar') == 3
+        assert mirror.get('encar', '2') == offer('2')
+        assert mirror.position('encar') == 100
+        assert client.requested == [('change_id', datetime.date.today().strftime('%Y-%m-%d'))]
+
+    def test_start_change_id(self, mirror):
+        client = FakeSource([offer('1')])
+
+        mirror.bootstrap(client, 'encar', start=42)
+
+        assert mirror.position('encar') == 42
+        assert client.requested == []
+
+    def test_replaces_previous_rows_of_source_only(self, mirror):
+        mirror.bootstrap(FakeSource([offer('1'), offer('2')]), 'encar', start=1)
+        mirror.bootstrap(FakeSource([offer('9')]), 'mobilede', start=1)
+
+        mirror.bootstrap(FakeSource([offer('3')]), 'encar', start=5)
+
+        assert [item['inner_id'] for item in mirror.offers('encar')] == ['3']
+        assert mirror.count('mobilede') == 1
+        assert len(mirror) == 2
+
+    def test_failed_crawl_keeps_previous_offers_and_position(self, mirror):
+        mirror.bootstrap(FakeSource([offer('1'), offer('2')]), 'encar', start=7)
+
+        def failing(source, concurrency=1, **params):
+            yield offer('3')
+            yield offer('4')
+            yield offer('5')
+            raise ConnectionError('crawl interrupted')
+
+        client = FakeSource()
+        client.iter_offers = failing
+        with pytest.raises(ConnectionError):
+            mirror.bootstrap(client, 'encar', start=9)
+
+        assert [item['inner_id'] for item in mirror.offers('encar')] == ['1', '2']
+        assert mirror.position('encar') == 7
+
+        # A later bootstrap starts its staging afresh.
+        mirror.bootstrap(FakeSource([offer('6')]), 'encar', start=10)
+        assert [item['inner_id'] for item in mirror.offers('encar')] == ['6']
+        assert mirror.position('encar') == 10
+
+    def test_accepts_models(self, mirror):
+        mirror.bootstrap(FakeSource([Offer.from_dict(offer('1'))]), 'encar', start=1)
+
+        assert mirror.get('encar', '1')['data']['price'] == 2000
+        assert list(mirror.offers('encar', mark='Kia', year_from=2020))[0]['inner_id'] == '1'
+
+
+# ── sync ─────────────────────────────────────────────────────────
+
+
+class TestSync:
+    def test_applies_changes_until_head(self, mirror):
+        batches = {
+            100: {'result': [
+                {'inner_id': '2', 'change_type': 'changed', 'data': offer('2', price=1500)['data']},
+                {'inner_id': '4', 'change_type': 'added', 'data': offer('4', mark='BMW')['data']},
+            ], 'meta': {'next_change_id': 102}},
+            102: {'result': [{'inner_id': '1', 'change_type': 'removed'}], 'meta': {'next_change_id': 103}},
+        }
+        client = FakeSource([offer('1'), offer('2')], batches)
+        mirror.bootstrap(client, 'encar', start=100)
+
+        assert mirror.sync(client, 'encar') == 3
+
+        assert mirror.get('encar', '1') is None
+        assert mirror.get('encar', '2')['data']['price'] == 1500
+        assert mirror.get('encar', '4')['data']['mark'] == 'BMW'
+        assert mirror.position('encar') == 103
+
+    def test_resumes_from_stored_position(self, mirror):
+        batches = {
+            100: {'result': [{'inner_id': '1', 'change_type': 'removed'}], 'meta': {'next_change_id': 101}},
+            101: {'result': [{'inner_id': '2', 'change_type': 'removed'}], 'meta': {'next_change_id': 102}},
+        }
+        client = FakeSource([offer('1'), offer('2')], batches)
+        mirror.bootstrap(client, 'encar', start=100)
+
+        assert mirror.sync(client, 'encar', max_batches=1) == 1
+        assert mirror.position('encar') == 101
+
+        client.requested.clear()
+        mirror.sync(client, 'encar')
+        assert client.requested == [('changes', 101), ('changes', 102)]
+        assert mirror.count('encar') == 0
+
+    def test_requires_bootstrap(self, mirror):
+        with pytest.raises(ValueError, match='bootstrap'):
+            mirror.sync(FakeSource(), 'encar')
+
+    def test_last_record_per_offer_wins(self, mirror):
+        mirror.apply('encar', [
+            {'inner_id': '1', 'change_type': 'added', 'data': offer('1')['data']},
+            {'inner_id': '1', 'change_type': 'removed'},
+            {'inner_id': '2', 'change_type': 'removed'},
+            {'inner_id': '2', 'change_type': 'added', 'data': offer('2')['data']},
+        ])
+
+        assert mirror.get('encar', '1') is None
+        assert mirror.get('encar', '2') == offer('2')
+
+    def test_apply_change_models(self, mirror):
+        mirror.apply('encar', [Change.from_dict({'inner_id': '7', 'change_type': 'added', 'data': offer('7')['data']})], 8)
+
+        assert mirror.get('encar', '7')['data']['model'] == 'K5'
+        assert mirror.position('encar') == 8
+
+
+# ── Queries and export ───────────────────────────────────────────
+
+
+class TestQueries:
+    def test_filters_on_indexed_columns(self, mirror):
+        mirror.bootstrap(FakeSource([
+            offer('1', mark='Kia', year=2018, price=900),
+            offer('2', mark='Kia', year=2021, price=1900),
+            offer('3', mark='BMW', year=2022, price=4000),
+        ]), 'encar', start=1)
+
+        assert [o['inner_id'] for o in mirror.offers('encar', mark='Kia')] == ['1', '2']
+        assert [o['inner_id'] for o in mirror.offers('encar', year_from=2020, price_to=2000)] == ['2']
+
+    def test_unknown_filter(self, mirror):
+        with pytest.raises(TypeError, match='color'):
+            list(mirror.offers('encar', color='red'))
+
+    def test_non_numeric_values_are_kept_in_data(self, mirror):
+        mirror.apply('encar', [{'inner_id': '1', 'change_type': 'added', 'data': {'price': 'on request'}}])
+
+        assert mirror.get('encar', '1')['data']['price'] == 'on request'
+        assert list(mirror.offers('encar', price_from=0)) == []
+
+    def test_export_parquet(self, mirror, tmp_path):
+        pq = pytest.importorskip('pyarrow.parquet')
+        mirror.bootstrap(FakeSource([offer('1'), offer('2'), offer('3')]), 'encar', start=1)
+        path = str(tmp_path / 'encar.parquet')
+
+        assert mirror.export_parquet(path, 'encar', batch_size=2) == 3
+
+        table = pq.read_table(path)
+        assert table.column('inner_id').to_pylist() == ['1', '2', '3']
+        assert json.loads(table.column('data')[0].as_py()) == offer('1')['data']
@@ -0,0 +1,187 @@
+from unittest.mock import patch
+
+import pytest
+
+from auto_api.client import Client
+from auto_api.models import Change, ChangesPage, Offer, OfferPage, page_parts
+from tests.test_client import MockResponse
+
+ITEM = {
+    'inner_id': '40427050',
+    'data': {
+        'url': 'https://fem.encar.com/cars/detail/40427050',
+        'mark': 'Hyundai',
+        'model': 'Sonata',
+        'year': 2021,
+        'price': 2150,
+        'km_age': 35000,
+        'transmission_type': 'automatic',
+        'images': ['a.jpg', 'b.jpg'],
+        'address': 'Seoul',
+    },
+}
+
+
+# ── Offer ────────────────────────────────────────────────────────
+
+
+class TestOffer:
+    def test_from_result_item(self):
+        offer = Offer.from_dict(ITEM)
+
+        assert offer.inner_id == '40427050'
+        assert offer.mark == 'Hyundai'
+        assert offer.model == 'Sonata'
+        assert offer.km_age == 35000
+        assert offer.body_type is None
+        assert offer.extra == {'address': 'Seoul'}
+
+    def test_from_bare_data(self):
+        offer = Offer.from_dict({'mark': 'BMW', 'model': 'X5', 'inner_id': 7})
+
+        assert offer.inner_id == '7'
+        assert offer.mark == 'BMW'
+
+    def test_images_are_a_tuple(self):
+        offer = Offer.from_dict(ITEM)
+
+        assert offer.images == ('a.jpg', 'b.jpg')
+        assert not hasattr(offer, '__dict__')
+
+    def test_missing_images(self):
+        assert Offer.from_dict({'mark': 'Kia'}).images == ()
+
+    def test_has_no_instance_dict(self):
+        offer = Offer.from_dict(ITEM)
+
+        assert not hasattr(offer, '__dict__')
+        with pytest.raises(AttributeError):
+            offer.unknown = 1
+
+    def test_to_dict_round_trip(self):
+        offer = Offer.from_dict(ITEM)
+
+        assert Offer.from_dict(offer.to_dict()) == offer
+        assert offer.to_dict()['data']['address'] == 'Seoul'
+
+    def test_constructor(self):
+        offer = Offer('1', mark='Kia', images=['x.jpg'], extra={'vin': 'KNA'})
+
+        assert offer.mark == 'Kia'
+        assert offer.images == ('x.jpg',)
+        assert offer.extra == {'vin': 'KNA'}
+
+    def test_constructor_rejects_unknown_fields(self):
+        with pytest.raises(TypeError, match='vin'):
+            Offer('1', vin='KNA')
+
+
+# ── Change ───────────────────────────────────────────────────────
+
+
+class TestChange:
+    def test_from_dict(self):
+        change = Change.from_dict({'id': 5, 'inner_id': 10, 'change_type': 'removed'})
+
+        assert change.inner_id == '10'
+        assert change.change_type == 'removed'
+        assert change.id == 5
+        assert change.offer is None
+
+    def test_offer_is_built_on_first_access(self):
+        change = Change.from_dict({'inner_id': '40427050', 'change_type': 'added', 'data': ITEM['data']})
+
+        assert change._offer is None
+        offer = change.offer
+        assert offer.mark == 'Hyundai'
+        assert change.offer is offer
+        assert change._data is None
+
+
+# ── Pages ────────────────────────────────────────────────────────
+
+
+class TestPages:
+    def test_offer_page(self):
+        page = OfferPage.from_dict({'result': [ITEM], 'meta': {'page': 1, 'next_page': 2}})
+
+        assert len(page) == 1
+        assert [offer.inner_id for offer in page] == ['40427050']
+        assert page.page == 1
+        assert page.next_page == 2
+
+    def test_changes_page(self):
+        page = ChangesPage.from_dict({'result': [{'inner_id': '1', 'change_type': 'added'}], 'meta': {'next_change_id': 9}})
+
+        assert len(page) == 1
+        assert page.next_change_id == 9
+        assert isinstance(page.result[0], Change)
+
+    def test_page_parts_accepts_dicts_and_models(self):
+        raw = {'result': [ITEM], 'meta': {'next_page': None}}
+
+        assert page_parts(raw) == ([ITEM], {'next_page': None})
+        result, meta = page_parts(OfferPage.from_dict(raw))
+        assert isinstance(result[0], Offer)
+        assert meta == {'next_page': None}
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientModels:
+    def test_dicts_by_default(self):
+        client = Client('test-key')
+
+        with patch.object(client.session, 'get', return_value=MockResponse(ITEM)):
+            assert client.get_offer('encar', '40427050') == ITEM
+
+    def test_models_mode(self):
+        client = Client('test-key', models=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'result': [ITEM], 'meta': {}})):
+            page = client.get_offers('encar', page=1)
+        with patch.object(client.session, 'get', return_value=MockResponse(ITEM)):
+            offer = client.get_offer('encar', '40427050')
+        with patch.object(client.session, 'get', return_value=MockResponse({'result': [], 'meta': {'next_change_id': 3}})):
+            changes = client.get_changes('encar', 1)
+        with patch.object(client.session, 'post', return_value=MockResponse(ITEM['data'])):
+            info = client.get_offer_by_url('https://fem.encar.com/cars/detail/40427050')
+
+        assert isinstance(page, OfferPage)
+        assert isinstance(offer, Offer)
+        assert isinstance(changes, ChangesPage)
+        assert changes.next_change_id == 3
+        assert isinstance(info, Offer)
+        assert info.mark == 'Hyundai'
+
+    def test_filters_stay_dicts(self):
+        client = Client('test-key', models=True)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'mark': ['Kia']})):
+            assert client.get_filters('encar') == {'mark': ['Kia']}
+
+    def test_iter_offers_yields_models(self):
+        client = Client('test-key', models=True)
+        pages = [
+            MockResponse({'result': [ITEM], 'meta': {'next_page': 2}}),
+            MockResponse({'result': [ITEM], 'meta': {'next_page': None}}),
+        ]
+
+        with patch.object(client.session, 'get', side_effect=pages):
+            offers = list(client.iter_offers('encar'))
+
+        assert len(offers) == 2
+        assert all(isinstance(offer, Offer) for offer in offers)
+
+    def test_follow_changes_yields_models(self):
+        client = Client('test-key', models=True)
+        batches = [
+            MockResponse({'result': [{'inner_id': '1', 'change_type': 'added'}], 'meta': {'next_change_id': 2}}),
+            MockResponse({'result': [], 'meta': {'next_change_id': 2}}),
+        ]
+
+        with patch.object(client.session, 'get', side_effect=batches):
+            changes = list(client.follow_changes('encar', 1, stop_at_head=True))
+
+        assert [type(change) for change in changes] == [Change]
@@ -0,0 +1,209 @@
+import random
+
+import pytest
+
+from auto_api.changes import MemoryCheckpoint
+from auto_api.client import Client
+from auto_api.planner import CrawlPlan, CrawlPlanner, Shard
+from auto_api.query import OfferIndex
+from auto_api.transport import MockTransport
+
+MARKS = {'Hyundai': ['Sonata', 'Tucson'], 'Kia': ['K5', 'Sorento'], 'BMW': ['X5', '320d']}
+
+
+def make_offers(count=400, seed=5):
+    rng = random.Random(seed)
+    offers = []
+    for i in range(count):
+        mark = rng.choice(list(MARKS))
+        offers.append({'inner_id': str(i), 'data': {
+            'mark': mark,
+            'model': rng.choice(MARKS[mark]),
+            'year': rng.randint(2010, 2024),
+            'price': rng.randint(500, 9000),
+            'km_age': rng.randint(0, 250000),
+            'body_type': rng.choice(['sedan', 'suv']),
+            'engine_type': rng.choice(['gasoline', 'diesel']),
+            'transmission_type': rng.choice(['automatic', 'manual']),
+            'color': rng.choice(['white', 'black']),
+        }})
+    return offers
+
+
+class Backend:
+    """get_offers and get_filters answered from an OfferIndex, for MockTransport."""
+
+    def __init__(self, offers, page_size=10):
+        self.index = OfferIndex(page_size)
+        self.index.load('encar', offers)
+        self.offer_requests = 0
+
+    def __call__(self, request):
+        if request.path.endswith('/filters'):
+            return {
+                'mark': MARKS,
+                'body_type': ['sedan', 'suv'],
+                'engine_type': ['gasoline', 'diesel'],
+                'transmission_type': ['automatic', 'manual'],
+                'color': ['white', 'black'],
+            }
+        params = {name: value for name, value in request.params.items() if name != 'api_key'}
+        self.offer_requests += 1
+        return self.index.get_offers('encar', **params)
+
+
+@pytest.fixture
+def offers():
+    return make_offers()
+
+
+@pytest.fixture
+def backend(offers):
+    return Backend(offers)
+
+
+@pytest.fixture
+def client(backend):
+    return Client('key', transport=MockTransport(backend))
+
+
+def ids(items):
+    return sorted(item['inner_id'] for item in items)
+
+
+# ── Planning ─────────────────────────────────────────────────────
+
+
+class TestPlan:
+    def test_small_query_is_one_shard(self, client):
+        plan = CrawlPlanner(client, max_pages=50).plan('encar')
+
+        assert plan.shards == [Shard({})]
+        assert plan.probes == 1
+
+    def test_shards_are_bounded_and_cover_the_query(self, client, backend, offers):
+        plan = CrawlPlanner(client, max_pages=3).plan('encar')
+
+        assert len(plan) > 3
+        seen = []
+        for shard in plan:
+            assert not shard.oversized
+            assert backend.index.count('encar', **shard.params) <= 30
+            seen.extend(item['inner_id'] for item in backend.index.get_offers('encar', **shard.params)['result'])
+            seen.extend(
+                item['inner_id']
+                for page in range(2, 4)
+                for item in backend.index.get_offers('encar', page=page, **shard.params)['result']
+            )
+        assert sorted(seen) == sorted(offer['inner_id'] for offer in offers)
+
+    def test_splits_by_brand_first(self, client):
+        plan = CrawlPlanner(client, max_pages=13).plan('encar')
+
+        assert {shard.params['brand'] for shard in plan} == set(MARKS)
+
+    def test_bisects_ranges_within_query_bounds(self, client):
+        plan = CrawlPlanner(client, max_pages=2, dimensions=['year']).plan('encar', brand='Kia', year_from=2015)
+
+        years = sorted((shard.params['year_from'], shard.params.get('year_to')) for shard in plan)
+        assert years[0][0] == 2015
+        assert years[-1][1] is None
+        assert all(shard.params['brand'] == 'Kia' for shard in plan)
+        for (_, high), (low, _) in zip(years, years[1:]):
+            assert low == high + 1
+
+    def test_default_bounds_leave_outer_shards_open(self, client, offers):
+        planner = CrawlPlanner(client, max_pages=2, dimensions=['price'], ranges={'price': (1000, 2000)})
+        plan = planner.plan('encar')
+
+        assert any('price_from' not in shard.params for shard in plan)
+        assert any('price_to' not in shard.params for shard in plan)
+        # Prices run from 500 to 9000, well outside the default range, and are still all crawled.
+        assert ids(planner.crawl(plan)) == sorted(offer['inner_id'] for offer in offers)
+
+    @pytest.mark.parametrize('dimension, values', [
+        ('body_type', {'sedan', 'suv'}),
+        ('engine_type', {'gasoline', 'diesel'}),
+        ('transmission', {'automatic', 'manual'}),
+        ('color', {'white', 'black'}),
+    ])
+    def test_splits_on_filter_values(self, client, offers, dimension, values):
+        planner = CrawlPlanner(client, max_pages=30, dimensions=[dimension])
+        plan = planner.plan('encar')
+
+        assert {shard.params[dimension] for shard in plan} == values
+        assert ids(planner.crawl(plan)) == sorted(offer['inner_id'] for offer in offers)
+
+    def test_models_need_a_brand(self, client):
+        plan = CrawlPlanner(client, max_pages=5, dimensions=['model', 'brand', 'model']).plan('encar')
+
+        assert {(shard.params['brand'], shard.params.get('model')) for shard in plan} >= {('BMW', 'X5'), ('Kia', 'K5')}
+
+    def test_unsplittable_shard_is_oversized(self, client):
+        plan = CrawlPlanner(client, max_pages=2, dimensions=['brand']).plan('encar')
+
+        assert len(plan) == 3
+        assert all(shard.oversized for shard in plan)
+
+    def test_rejects_bad_arguments(self, client):
+        with pytest.raises(ValueError):
+            CrawlPlanner(client, max_pages=0)
+        with pytest.raises(ValueError):
+            CrawlPlanner(client, dimensions=['colour'])
+        with pytest.raises(TypeError):
+            CrawlPlanner(client).plan('encar', page=2)
+
+    def test_plan_round_trips_through_json(self, client, tmp_path):
+        plan = CrawlPlanner(client, max_pages=3).plan('encar')
+        path = str(tmp_path / 'plan.json')
+        plan.save(path)
+
+        loaded = CrawlPlan.load(path)
+        assert loaded.source == 'encar'
+        assert loaded.shards == plan.shards
+        assert [shard.key for shard in loaded] == [shard.key for shard in plan]
+
+
+# ── Crawling ─────────────────────────────────────────────────────
+
+
+class TestCrawl:
+    def test_crawls_every_offer_once(self, client, offers):
+        planner = CrawlPlanner(client, max_pages=3)
+
+        assert ids(planner.crawl(planner.plan('encar'))) == sorted(offer['inner_id'] for offer in offers)
+
+    def test_dedupes_across_overlapping_shards(self, client, offers):
+        plan = CrawlPlan('encar', [Shard({'brand': 'Kia'}), Shard({}), Shard({'year_from': 2020})])
+
+        items = ids(CrawlPlanner(client).crawl(plan))
+        assert items == sorted(offer['inner_id'] for offer in offers)
+
+    def test_seen_skips_known_offers(self, client, offers):
+        plan = CrawlPlan('encar', [Shard({})])
+        seen = {str(i) for i in range(100)}
+
+        items = ids(CrawlPlanner(client).crawl(plan, seen=seen))
+        assert items == sorted(str(i) for i in range(100, len(offers)))
+        assert len(seen) == len(offers)
+
+    def test_resumes_from_checkpoint(self, client, backend, offers):
+        planner = CrawlPlanner(client, max_pages=3, concurrency=2)
+        plan = planner.plan('encar')
+        checkpoint = MemoryCheckpoint()
+        seen = set()
+
+        crawl = planner.crawl(plan, checkpoint, seen)
+        first = [next(crawl) for _ in range(150)]
+        crawl.close()
+
+        backend.offer_requests = 0
+        rest = list(planner.crawl(plan, checkpoint, seen))
+        assert ids(first + rest) == sorted(offer['inner_id'] for offer in offers)
+        assert all(checkpoint.load(f'encar:{shard.key}') == 0 for shard in plan)
+        # Finished shards are skipped; only unfinished ones are paged again.
+        assert backend.offer_requests < len(offers) // 10
+
+        backend.offer_requests = 0
+        assert list(planner.crawl(plan, checkpoint)) == []
+        assert backend.offer_requests == 0
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+
+from auto_api.mirror import Mirror
+from auto_api.models import Offer
+from auto_api.query import OfferIndex
+
+MARKS = {'Hyundai': ['Sonata', 'Tucson'], 'Kia': ['K5', 'Sorento'], 'BMW': ['X5', '320d']}
+
+
+def make_offers(count=300, seed=3):
+    rng = random.Random(seed)
+    offers = []
+    for i in range(count):
+        mark = rng.choice(list(MARKS))
+        offers.append({'inner_id': str(i), 'data': {
+            'mark': mark,
+            'model': rng.choice(MARKS[mark]),
+            'year': rng.randint(2010, 2024),
+            'price': rng.choice([None, rng.randint(500, 9000)]),
+            'km_age': rng.randint(0, 250000),
+            'transmission_type': rng.choice(['automatic', 'manual']),
+            'color': rng.choice(['white', 'black', 'gray']),
+        }})
+    return offers
+
+
+def brute_force(offers, brand=None, model=None, transmission=None, color=None,
+                year_from=None, year_to=None, price_from=None, price_to=None, mileage_from=None, mileage_to=None):
+    def within(value, low, high):
+        if low is None and high is None:
+            return True
+        return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+    return [
+        item['inner_id'] for item in offers
+        if (brand is None or item['data']['mark'] == brand)
+        and (model is None or item['data']['model'] == model)
+        and (transmission is None or item['data']['transmission_type'] == transmission)
+        and (color is None or item['data']['color'] == color)
+        and within(item['data']['year'], year_from, year_to)
+        and within(item['data']['price'], price_from, price_to)
+        and within(item['data']['km_age'], mileage_from, mileage_to)
+    ]
+
+
+def all_pages(index, source, **params):
+    ids = []
+    page = 1
+    while page:
+        response = index.get_offers(source, page=page, **params)
+        ids.extend(item['inner_id'] for item in response['result'])
+        page = response['meta']['next_page']
+    return ids
+
+
+OFFERS = make_offers()
+QUERIES = [
+    {},
+    {'brand': 'Kia'},
+    {'brand': 'Hyundai', 'model': 'Tucson'},
+    {'year_from': 2018},
+    {'year_from': 2015, 'year_to': 2016, 'transmission': 'manual'},
+    {'price_to': 3000},
+    {'brand': 'BMW', 'price_from': 2000, 'price_to': 6000, 'mileage_to': 100000},
+    {'color': 'white', 'mileage_from': 200000},
+    {'brand': 'Lada'},
+]
+
+
+# ── Filters ──────────────────────────────────────────────────────
+
+
+class TestFilters:
+    @pytest.mark.parametrize('params', QUERIES)
+    def test_matches_brute_force(self, params):
+        index = OfferIndex(page_size=25)
+        index.load('encar', OFFERS)
+
+        assert all_pages(index, 'encar', **params) == brute_force(OFFERS, **params)
+        assert index.count('encar', **params) == len(brute_force(OFFERS, **params))
+
+    def test_none_filters_are_ignored(self):
+        index = OfferIndex()
+        index.load('encar', OFFERS)
+
+        assert index.count('encar', brand=None, year_from=None) == len(OFFERS)
+
+    def test_unknown_filter(self):
+        index = OfferIndex()
+        index.load('encar', OFFERS)
+
+        with pytest.raises(TypeError, match='seats'):
+            index.get_offers('encar', seats=5)
+
+    def test_recent_matches_are_reused(self):
+        index = OfferIndex()
+        index.load('encar', OFFERS)
+        columns = index._sources['encar']
+
+        first = columns.query({'brand': 'Kia', 'year_from': 2015})
+        assert columns.query({'year_from': 2015, 'brand': 'Kia'}) is first
+
+        for year in range(columns.recent_size + 1):
+            columns.query({'year_from': year})
+        assert len(columns._recent) == columns.recent_size
+
+    def test_numeric_strings_are_ranged(self):
+        index = OfferIndex()
+        index.load('encar', [{'inner_id': '1', 'data': {'price': '1500'}}, {'inner_id': '2', 'data': {'price': 'n/a'}}])
+
+        assert index.count('encar', price_to=2000) == 1
+
+
+# ── get_offers shape ─────────────────────────────────────────────
+
+
+class TestGetOffers:
+    def test_pagination_meta(self):
+        index = OfferIndex(page_size=2)
+        index.load('encar', OFFERS[:5])
+
+        first = index.get_offers('encar', page=1)
+        last = index.get_offers('encar', page=3)
+
+        assert [item['inner_id'] for item in first['result']] == ['0', '1']
+        assert first['meta'] == {'page': 1, 'next_page': 2}
+        assert last['meta'] == {'page': 3, 'next_page': None}
+        assert index.get_offers('encar', page=4)['result'] == []
+
+    def test_unknown_source_is_empty(self):
+        assert OfferIndex().get_offers('encar') == {'result': [], 'meta': {'page': 1, 'next_page': None}}
+
+    def test_invalid_page(self):
+        with pytest.raises(ValueError):
+            OfferIndex().get_offers('encar', page=0)
+
+    def test_load_accepts_models(self):
+        index = OfferIndex()
+        index.load('encar', [Offer.from_dict(OFFERS[0])])
+
+        assert index.get_offers('encar', brand=OFFERS[0]['data']['mark'])['result'][0]['inner_id'] == '0'
+
+    def test_from_mirror(self, tmp_path):
+        mirror = Mirror(str(tmp_path / 'mirror.db'))
+        mirror.apply('encar', [dict(item, change_type='added') for item in OFFERS[:10]])
+
+        index = OfferIndex.from_mirror(mirror, ['encar'])
+        mirror.close()
+
+        assert index.count('encar') == 10
+        assert all_pages(index, 'encar', brand='Kia') == brute_force(OFFERS[:10], brand='Kia')
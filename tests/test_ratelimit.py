@@ -0,0 +1,176 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from auto_api.client import Client
+from auto_api.errors import ApiError, NetworkError
+from auto_api.ratelimit import AdaptiveConcurrency, RateLimiter
+from tests.test_client import MockResponse
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+# ── RateLimiter ──────────────────────────────────────────────────
+
+
+class TestRateLimiter:
+    def test_allows_burst_without_waiting(self):
+        limiter = RateLimiter(10, burst=3, clock=FakeClock())
+
+        assert [limiter.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    def test_queues_callers_past_the_burst(self):
+        limiter = RateLimiter(10, burst=1, clock=FakeClock())
+
+        delays = [limiter.reserve() for _ in range(3)]
+
+        assert delays == pytest.approx([0.0, 0.1, 0.2])
+
+    def test_refills_over_time(self):
+        clock = FakeClock()
+        limiter = RateLimiter(2, burst=2, clock=clock)
+        limiter.reserve()
+        limiter.reserve()
+
+        clock.now = 0.5
+
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == pytest.approx(0.5)
+
+    def test_acquire_sleeps_for_the_delay(self):
+        sleeps = []
+        limiter = RateLimiter(4, burst=1, clock=FakeClock(), sleep=sleeps.append)
+
+        limiter.acquire()
+        limiter.acquire()
+
+        assert sleeps == [pytest.approx(0.25)]
+
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            RateLimiter(0)
+
+
+# ── AdaptiveConcurrency ──────────────────────────────────────────
+
+
+class TestAdaptiveConcurrency:
+    def test_success_grows_limit_additively(self):
+        controller = AdaptiveConcurrency(initial=4, maximum=10)
+
+        for _ in range(4):
+            controller.acquire()
+            controller.release()
+
+        assert 4.9 < controller.limit < 5.1
+
+    def test_overload_halves_limit(self):
+        controller = AdaptiveConcurrency(initial=8, clock=FakeClock())
+
+        controller.acquire()
+        controller.release(overloaded=True)
+
+        assert controller.limit == 4
+
+    def test_overloads_within_cooldown_count_once(self):
+        clock = FakeClock()
+        controller = AdaptiveConcurrency(initial=8, cooldown=1.0, clock=clock)
+
+        for _ in range(3):
+            controller.acquire()
+            controller.release(overloaded=True)
+        assert controller.limit == 4
+
+        clock.now = 1.0
+        controller.acquire()
+        controller.release(overloaded=True)
+        assert controller.limit == 2
+
+    def test_limit_stays_within_bounds(self):
+        clock = FakeClock()
+        controller = AdaptiveConcurrency(initial=2, minimum=1, maximum=3, cooldown=0, clock=clock)
+
+        for _ in range(5):
+            controller.acquire()
+            controller.release(overloaded=True)
+        assert controller.limit == 1
+
+        for _ in range(50):
+            controller.acquire()
+            controller.release()
+        assert controller.limit == 3
+
+    def test_blocks_at_the_limit(self):
+        controller = AdaptiveConcurrency(initial=1, maximum=1)
+        controller.acquire()
+        acquired = threading.Event()
+
+        thread = threading.Thread(target=lambda: (controller.acquire(), acquired.set()))
+        thread.start()
+        assert not acquired.wait(0.05)
+
+        controller.release()
+        assert acquired.wait(1)
+        thread.join()
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientLimits:
+    def test_rate_limit_number_creates_limiter(self):
+        client = Client('test-key', rate_limit=5)
+
+        assert isinstance(client.rate_limiter, RateLimiter)
+        assert client.rate_limiter.rate == 5
+
+    def test_every_request_takes_a_token(self):
+        limiter = RateLimiter(10, burst=3, clock=FakeClock())
+        client = Client('test-key', rate_limit=limiter)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})):
+            client.get_filters('encar')
+            client.get_offer('encar', '1')
+        with patch.object(client.session, 'post', return_value=MockResponse({})):
+            client.get_offer_by_url('https://example.com/car/1')
+
+        assert limiter.reserve() == pytest.approx(0.1)
+
+    def test_429_shrinks_concurrency_limit(self):
+        controller = AdaptiveConcurrency(initial=8, clock=FakeClock())
+        client = Client('test-key', concurrency_limit=controller)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Slow down'}, 429)):
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        assert controller.limit == 4
+        assert controller.in_flight == 0
+
+    def test_timeout_shrinks_concurrency_limit(self):
+        controller = AdaptiveConcurrency(initial=8, clock=FakeClock())
+        client = Client('test-key', concurrency_limit=controller)
+
+        with patch.object(client.session, 'get', side_effect=requests.Timeout()):
+            with pytest.raises(NetworkError):
+                client.get_filters('encar')
+
+        assert controller.limit == 4
+        assert controller.in_flight == 0
+
+    def test_success_grows_concurrency_limit(self):
+        controller = AdaptiveConcurrency(initial=8)
+        client = Client('test-key', concurrency_limit=controller)
+
+        with patch.object(client.session, 'get', return_value=MockResponse({})):
+            client.get_filters('encar')
+
+        assert controller.limit > 8
@@ -0,0 +1,205 @@
+import email.utils
+import time
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from auto_api.client import Client
+from auto_api.errors import ApiError, AuthError, NetworkError
+from auto_api.retry import RetryBudget, RetryPolicy, parse_retry_after
+from tests.test_client import MockResponse
+
+
+def make_policy(**kwargs):
+    """RetryPolicy with recorded sleeps, a frozen clock and no jitter randomness."""
+    sleeps = []
+    kwargs.setdefault('sleep', sleeps.append)
+    kwargs.setdefault('clock', lambda: 0.0)
+    kwargs.setdefault('jitter', lambda: 1.0)
+    policy = RetryPolicy(**kwargs)
+    policy.sleeps = sleeps
+    return policy
+
+
+# ── RetryPolicy ──────────────────────────────────────────────────
+
+
+class TestRetryPolicy:
+    def test_exponential_backoff_capped(self):
+        policy = make_policy(backoff=1, max_backoff=5, max_attempts=10)
+        error = ApiError('Bad gateway', 502)
+
+        assert [policy.delay(retry, error) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_full_jitter_scales_backoff(self):
+        policy = make_policy(backoff=2, jitter=lambda: 0.25)
+
+        assert policy.delay(1, ApiError('Unavailable', 503)) == 1.0
+
+    def test_gives_up_after_max_attempts(self):
+        policy = make_policy(max_attempts=3)
+        error = ApiError('Bad gateway', 502)
+
+        assert policy.delay(1, error) is not None
+        assert policy.delay(2, error) is None
+
+    def test_never_retries_auth_error(self):
+        assert make_policy().delay(0, AuthError()) is None
+
+    def test_does_not_retry_client_errors(self):
+        assert make_policy().delay(0, ApiError('Not found', 404)) is None
+
+    def test_retries_network_errors(self):
+        assert make_policy().delay(0, NetworkError()) is not None
+
+    def test_honors_retry_after_seconds(self):
+        policy = make_policy()
+
+        assert policy.delay(0, ApiError('Slow down', 429), {'Retry-After': '7'}) == 7.0
+
+    def test_gives_up_on_retry_after_beyond_max_backoff(self):
+        policy = make_policy(max_backoff=30)
+        error = ApiError('Slow down', 429)
+
+        assert policy.delay(0, error, {'Retry-After': '30'}) == 30.0
+        assert policy.delay(0, error, {'Retry-After': '86400'}) is None
+
+    def test_stops_at_deadline(self):
+        policy = make_policy(backoff=1, deadline=10)
+        error = ApiError('Bad gateway', 502)
+
+        assert policy.delay(0, error, elapsed=8.5) == 1
+        assert policy.delay(0, error, elapsed=9.5) is None
+
+    def test_budget_limits_retries(self):
+        policy = make_policy(budget=RetryBudget(ratio=0.5, min_tokens=1))
+        error = ApiError('Bad gateway', 502)
+
+        assert policy.delay(0, error) is not None
+        assert policy.delay(0, error) is None
+
+        policy.budget.deposit()
+        policy.budget.deposit()
+        assert policy.delay(0, error) is not None
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after('120') == 120.0
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert 28 <= parse_retry_after(value) <= 30
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after('soon') is None
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientRetry:
+    def test_retries_transient_errors_then_succeeds(self):
+        policy = make_policy()
+        client = Client('test-key', retry=policy)
+        responses = [
+            MockResponse({'message': 'Bad gateway'}, 502),
+            MockResponse({'message': 'Unavailable'}, 503),
+            MockResponse({'mark': ['Kia']}),
+        ]
+
+        with patch.object(client.session, 'get', side_effect=responses) as mock:
+            result = client.get_filters('encar')
+
+        assert result == {'mark': ['Kia']}
+        assert mock.call_count == 3
+        assert policy.sleeps == [0.5, 1.0]
+
+    def test_retries_connection_errors(self):
+        client = Client('test-key', retry=make_policy())
+        responses = [requests.ConnectionError('reset'), MockResponse({'change_id': 5})]
+
+        with patch.object(client.session, 'get', side_effect=responses):
+            assert client.get_change_id('encar', '2025-01-15') == 5
+
+    @pytest.mark.parametrize('error', [
+        requests.exceptions.ChunkedEncodingError('Connection broken: IncompleteRead(10 bytes read)'),
+        requests.exceptions.ContentDecodingError('Received response with content-encoding: gzip'),
+    ])
+    def test_retries_body_read_failures(self, error):
+        client = Client('test-key', retry=make_policy())
+
+        with patch.object(client.session, 'get', side_effect=[error, MockResponse({'change_id': 5})]) as mock:
+            assert client.get_change_id('encar', '2025-01-15') == 5
+        assert mock.call_count == 2
+
+        with patch.object(client.session, 'get', side_effect=error):
+            with pytest.raises(NetworkError, match='Connection failed'):
+                client.get_change_id('encar', '2025-01-15')
+
+    def test_raises_last_error_when_attempts_run_out(self):
+        client = Client('test-key', retry=make_policy(max_attempts=2))
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Down'}, 503)) as mock:
+            with pytest.raises(ApiError) as exc_info:
+                client.get_offers('encar', page=1)
+
+        assert exc_info.value.status_code == 503
+        assert mock.call_count == 2
+
+    def test_does_not_retry_auth_error(self):
+        client = Client('test-key', retry=make_policy())
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Bad key'}, 401)) as mock:
+            with pytest.raises(AuthError):
+                client.get_offer('encar', '1')
+
+        assert mock.call_count == 1
+
+    def test_uses_retry_after_header(self):
+        policy = make_policy()
+        client = Client('test-key', retry=policy)
+        responses = [MockResponse({'message': 'Slow down'}, 429, headers={'Retry-After': '3'}), MockResponse({})]
+
+        with patch.object(client.session, 'get', side_effect=responses):
+            client.get_changes('encar', 1)
+
+        assert policy.sleeps == [3.0]
+
+    def test_deadline_caps_attempt_timeout(self):
+        now = [0.0]
+        policy = make_policy(deadline=10, clock=lambda: now[0])
+        client = Client('test-key', timeout=30, retry=policy)
+
+        def get(url, **kwargs):
+            now[0] += 4
+            return MockResponse({'message': 'Down'}, 503)
+
+        with patch.object(client.session, 'get', side_effect=get) as mock:
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        timeouts = [call[1]['timeout'] for call in mock.call_args_list]
+        assert timeouts[0] == 10
+        assert timeouts[1] == pytest.approx(6)
+
+    def test_post_is_not_retried(self):
+        client = Client('test-key', retry=make_policy())
+
+        with patch.object(client.session, 'post', return_value=MockResponse({'message': 'Down'}, 503)) as mock:
+            with pytest.raises(ApiError):
+                client.get_offer_by_url('https://example.com/car/1')
+
+        assert mock.call_count == 1
+
+    def test_disabled_by_default(self):
+        client = Client('test-key')
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Down'}, 503)) as mock:
+            with pytest.raises(ApiError):
+                client.get_filters('encar')
+
+        assert client.retry is None
+        assert mock.call_count == 1
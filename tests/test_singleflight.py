@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from auto_api.client import Client
+from auto_api.errors import ApiError
+from auto_api.singleflight import AsyncSingleFlight, SingleFlight
+from tests.test_client import MockResponse
+
+
+def run_together(count, fn):
+    """Run fn from `count` threads at once and return their results."""
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(call, range(count)))
+
+
+# ── SingleFlight ─────────────────────────────────────────────────
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        group = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'mark': ['Kia']}
+
+        results = run_together(8, lambda: group.do('k', fetch))
+
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert group.stats() == {'calls': 1, 'coalesced': 7, 'in_flight': 0}
+
+    def test_different_keys_run_separately(self):
+        group = SingleFlight()
+
+        assert group.do('a', lambda: 1) == 1
+        assert group.do('b', lambda: 2) == 2
+        assert group.calls == 2
+        assert group.coalesced == 0
+
+    def test_sequential_calls_are_not_coalesced(self):
+        group = SingleFlight()
+        calls = []
+
+        group.do('k', calls.append, 1)
+        group.do('k', calls.append, 2)
+
+        assert calls == [1, 2]
+
+    def test_error_is_shared(self):
+        group = SingleFlight()
+
+        def fail():
+            time.sleep(0.1)
+            raise ApiError('Boom', 500)
+
+        def call():
+            try:
+                group.do('k', fail)
+            except ApiError as e:
+                return e.message
+
+        assert run_together(4, call) == ['Boom'] * 4
+        assert group.calls == 1
+        assert group.stats()['in_flight'] == 0
+
+
+# ── AsyncSingleFlight ────────────────────────────────────────────
+
+
+class TestAsyncSingleFlight:
+    def test_concurrent_tasks_share_one_call(self):
+        group = AsyncSingleFlight()
+        calls = []
+
+        async def fetch(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {'value': value}
+
+        async def main():
+            return await asyncio.gather(*(group.do('k', fetch, 1) for _ in range(5)))
+
+        results = asyncio.run(main())
+
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert group.stats() == {'calls': 1, 'coalesced': 4, 'in_flight': 0}
+
+    def test_cancelled_waiter_does_not_cancel_others(self):
+        group = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        async def main():
+            first = asyncio.ensure_future(group.do('k', fetch))
+            second = asyncio.ensure_future(group.do('k', fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(main()) == 'done'
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientCoalescing:
+    def test_disabled_by_default(self):
+        assert Client('test-key').single_flight is None
+
+    def test_identical_requests_share_one_http_call(self):
+        client = Client('test-key', coalesce=True)
+
+        def slow_get(url, **kwargs):
+            time.sleep(0.1)
+            return MockResponse({'inner_id': kwargs['params']['inner_id']})
+
+        with patch.object(client.session, 'get', side_effect=slow_get) as mock:
+            results = run_together(6, lambda: client.get_offer('encar', '42'))
+
+        assert mock.call_count == 1
+        assert results == [{'inner_id': '42'}] * 6
+        assert client.single_flight.stats()['coalesced'] == 5
+
+    def test_different_params_are_not_coalesced(self):
+        client = Client('test-key', coalesce=True)
+        ids = iter(['1', '2'])
+
+        def slow_get(url, **kwargs):
+            time.sleep(0.05)
+            return MockResponse({})
+
+        with patch.object(client.session, 'get', side_effect=slow_get) as mock:
+            run_together(2, lambda: client.get_offer('encar', next(ids)))
+
+        assert mock.call_count == 2
+
+    def test_accepts_shared_group(self):
+        group = SingleFlight()
+
+        assert Client('test-key', coalesce=group).single_flight is group
+
+
+class TestAsyncClientCoalescing:
+    def test_identical_requests_share_one_http_call(self):
+        httpx = pytest.importorskip('httpx')
+        from auto_api.async_client import AsyncClient
+
+        requests = []
+
+        async def handler(request):
+            requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={'mark': ['Kia']})
+
+        async def main():
+            client = AsyncClient('test-key', coalesce=True)
+            client.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with client:
+                return await asyncio.gather(*(client.get_filters('encar') for _ in range(4))), client
+
+        results, client = asyncio.run(main())
+
+        assert len(requests) == 1
+        assert results == [{'mark': ['Kia']}] * 4
+        assert client.single_flight.coalesced == 3
@@ -0,0 +1,157 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from auto_api.client import Client
+from auto_api.errors import ApiError, NetworkError
+from auto_api.models import Change, Offer
+from auto_api.streaming import ResultStream
+from tests.test_client import MockResponse
+
+PAGE = {
+    'result': [
+        {'inner_id': '1', 'data': {'mark': 'Hyundai', 'model': 'Sonata', 'price': 21000, 'images': ['a.jpg', 'b.jpg']}},
+        {'inner_id': '2', 'data': {'mark': '기아', 'model': 'K5 "GT]', 'price': None, 'options': {'a': [1, [2, {}]]}}},
+        {'inner_id': '3', 'data': {'mark': 'BMW', 'model': 'X5\\', 'year': 2020}},
+    ],
+    'meta': {'page': 1, 'next_page': 2},
+}
+BODY = json.dumps(PAGE, ensure_ascii=False).encode()
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+# ── ResultStream ─────────────────────────────────────────────────
+
+
+class TestResultStream:
+    @pytest.mark.parametrize('size', [1, 2, 3, 7, 64, len(BODY)])
+    def test_items_across_chunk_boundaries(self, size):
+        stream = ResultStream(chunked(BODY, size), json.loads)
+
+        assert list(stream) == PAGE['result']
+        assert stream.meta == PAGE['meta']
+
+    def test_meta_before_result(self):
+        body = b'{"meta": {"next_change_id": 9, "note": "result: ["}, "result": [{"id": 1}, {"id": 2}]}'
+        stream = ResultStream(chunked(body, 5), json.loads)
+
+        assert list(stream) == [{'id': 1}, {'id': 2}]
+        assert stream.meta == {'next_change_id': 9, 'note': 'result: ['}
+
+    def test_nested_result_keys_are_not_the_array(self):
+        body = b'{"meta": {"result": [0]}, "result": [1, "two", null, true, -1.5e3, [3]]}'
+        stream = ResultStream(chunked(body, 2), json.loads)
+
+        assert list(stream) == [1, 'two', None, True, -1500.0, [3]]
+        assert stream.envelope == {'meta': {'result': [0]}}
+
+    def test_items_are_yielded_before_the_body_ends(self):
+        def chunks():
+            yield b'{"result": [{"id": 1}, '
+            raise AssertionError('read past the first item')
+
+        assert next(ResultStream(chunks(), json.loads)) == {'id': 1}
+
+    def test_empty_result(self):
+        stream = ResultStream([b'{"result": [], "meta": {}}'], json.loads)
+
+        assert list(stream) == []
+        assert stream.meta == {}
+
+    def test_meta_is_none_until_exhausted(self):
+        stream = ResultStream([BODY], json.loads)
+
+        next(stream)
+        assert stream.meta is None
+
+    def test_item_factory(self):
+        stream = ResultStream([BODY], json.loads, Offer.from_dict)
+
+        offers = list(stream)
+        assert [offer.mark for offer in offers] == ['Hyundai', '기아', 'BMW']
+
+    def test_truncated_body(self):
+        with pytest.raises(ApiError, match='Truncated response'):
+            list(ResultStream([BODY[:len(BODY) // 2]], json.loads))
+
+    def test_invalid_json(self):
+        with pytest.raises(ApiError, match='Invalid JSON response'):
+            list(ResultStream([b'{"result": [{"id": oops}]}'], json.loads))
+
+    def test_close_releases_response(self):
+        closed = []
+        stream = ResultStream([BODY], json.loads, on_close=lambda: closed.append(True))
+
+        next(stream)
+        stream.close()
+
+        assert closed == [True]
+        with pytest.raises(StopIteration):
+            next(stream)
+
+    def test_context_manager_closes(self):
+        closed = []
+
+        with ResultStream([BODY], json.loads, on_close=lambda: closed.append(True)) as stream:
+            assert list(stream) == PAGE['result']
+
+        assert closed == [True]
+
+
+# ── Client integration ───────────────────────────────────────────
+
+
+class TestClientStreaming:
+    def test_stream_offers(self):
+        client = Client('test-key')
+        response = MockResponse(PAGE)
+
+        with patch.object(client.session, 'get', return_value=response) as mock:
+            with client.stream_offers('encar', page=1, brand='Hyundai') as stream:
+                items = list(stream)
+
+        assert items == PAGE['result']
+        assert stream.meta == PAGE['meta']
+        assert response.closed
+        args, kwargs = mock.call_args
+        assert args[0] == 'https://api1.auto-api.com/api/v2/encar/offers'
+        assert kwargs['params'] == {'api_key': 'test-key', 'page': 1, 'brand': 'Hyundai'}
+        assert kwargs['stream'] is True
+
+    def test_stream_changes_models(self):
+        client = Client('test-key', models=True)
+        body = {'result': [{'id': 1, 'inner_id': '5', 'change_type': 'added'}], 'meta': {'next_change_id': 2}}
+
+        with patch.object(client.session, 'get', return_value=MockResponse(body)) as mock:
+            changes = list(client.stream_changes('encar', 1))
+
+        assert [type(change) for change in changes] == [Change]
+        assert mock.call_args[1]['params']['change_id'] == 1
+
+    def test_error_status_raises_before_streaming(self):
+        client = Client('test-key')
+
+        with patch.object(client.session, 'get', return_value=MockResponse({'message': 'Bad page'}, 400)):
+            with pytest.raises(ApiError, match='Bad page'):
+                client.stream_offers('encar', page=0)
+
+    def test_read_error_becomes_network_error(self):
+        client = Client('test-key')
+        response = MockResponse(PAGE)
+
+        def iter_content(chunk_size):
+            yield BODY[:40]
+            raise requests.exceptions.ChunkedEncodingError('connection reset')
+
+        response.iter_content = iter_content
+
+        with patch.object(client.session, 'get', return_value=response):
+            with pytest.raises(NetworkError, match='connection reset'):
+                list(client.stream_offers('encar', page=1))
+
+        assert response.closed
@@ -0,0 +1,175 @@
+import threading
+
+import pytest
+
+from auto_api.changes import MemoryCheckpoint
+from auto_api.errors import ApiError, AuthError
+from auto_api.sync import SyncEngine
+
+
+class FakeFeeds:
+    """Stands in for Client: per-source get_changes batches keyed by change_id."""
+
+    def __init__(self, batches, errors=None):
+        self.batches = batches
+        self.errors = errors or {}
+        self.requested = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_changes(self, source, change_id):
+        with self._lock:
+            self.requested.append((source, change_id))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            error = self.errors.get(source)
+            if error is not None and error[0] > 0:
+                error[0] -= 1
+                raise error[1]
+            return self.batches[source].get(change_id, {'result': [], 'meta': {'next_change_id': change_id}})
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_change_id(self, source, date):
+        return 1
+
+
+def feed(source, *sizes):
+    batches = {}
+    change_id = 1
+    for size in sizes:
+        records = [{'inner_id': f'{source}-{change_id + i}'} for i in range(size)]
+        batches[change_id] = {'result': records, 'meta': {'next_change_id': change_id + size}}
+        change_id += size
+    return batches
+
+
+def run(engine):
+    return [(source, change['inner_id']) for source, change in engine]
+
+
+# ── Merged stream ────────────────────────────────────────────────
+
+
+class TestMergedStream:
+    def test_yields_every_record_with_its_source(self):
+        feeds = FakeFeeds({'encar': feed('encar', 2, 1), 'mobilede': feed('mobilede', 3)})
+        engine = SyncEngine(feeds, ['encar', 'mobilede'], start=1, stop_at_head=True)
+
+        records = run(engine)
+
+        assert sorted(records) == sorted([
+            ('encar', 'encar-1'), ('encar', 'encar-2'), ('encar', 'encar-3'),
+            ('mobilede', 'mobilede-1'), ('mobilede', 'mobilede-2'), ('mobilede', 'mobilede-3'),
+        ])
+
+    def test_keeps_order_within_a_source(self):
+        feeds = FakeFeeds({'encar': feed('encar', 2, 2, 2), 'guazi': feed('guazi', 1)})
+        engine = SyncEngine(feeds, ['encar', 'guazi'], start=1, stop_at_head=True)
+
+        encar = [inner_id for source, inner_id in run(engine) if source == 'encar']
+
+        assert encar == [f'encar-{i}' for i in range(1, 7)]
+
+    def test_busy_source_does_not_starve_others(self):
+        feeds = FakeFeeds({'encar': feed('encar', *[5] * 20), 'guazi': feed('guazi', 1, 1)})
+        engine = SyncEngine(feeds, ['encar', 'guazi'], start=1, max_concurrency=1, stop_at_head=True)
+
+        records = run(engine)
+        last_guazi = max(i for i, (source, _) in enumerate(records) if source == 'guazi')
+
+        assert last_guazi < 20
+
+    def test_start_per_source(self):
+        feeds = FakeFeeds({'encar': feed('encar', 1, 1), 'guazi': feed('guazi', 1, 1)})
+        engine = SyncEngine(feeds, ['encar', 'guazi'], start={'encar': 2, 'guazi': 1}, stop_at_head=True)
+
+        assert sorted(run(engine)) == [('encar', 'encar-2'), ('guazi', 'guazi-1'), ('guazi', 'guazi-2')]
+
+    def test_requires_start_without_checkpoint(self):
+        engine = SyncEngine(FakeFeeds({'encar': {}}), ['encar'], stop_at_head=True)
+
+        with pytest.raises(ValueError):
+            run(engine)
+
+
+# ── Concurrency cap ──────────────────────────────────────────────
+
+
+class TestConcurrencyCap:
+    def test_never_exceeds_global_cap(self):
+        sources = ['encar', 'mobilede', 'autoscout24', 'che168', 'dongchedi', 'guazi', 'dubicars', 'dubizzle']
+        feeds = FakeFeeds({source: feed(source, 3, 3, 3) for source in sources})
+        engine = SyncEngine(feeds, sources, start=1, max_concurrency=3, stop_at_head=True)
+
+        records = run(engine)
+
+        assert len(records) == 8 * 9
+        assert feeds.max_active <= 3
+
+
+# ── Checkpoints ──────────────────────────────────────────────────
+
+
+class TestCheckpoints:
+    def test_saves_position_per_source(self):
+        checkpoint = MemoryCheckpoint()
+        feeds = FakeFeeds({'encar': feed('encar', 2, 1), 'guazi': feed('guazi', 4)})
+
+        run(SyncEngine(feeds, ['encar', 'guazi'], start=1, checkpoint=checkpoint, stop_at_head=True))
+
+        assert checkpoint.load('encar') == 4
+        assert checkpoint.load('guazi') == 5
+
+    def test_resumes_from_checkpoint(self):
+        checkpoint = MemoryCheckpoint()
+        checkpoint.save('encar', 3)
+        feeds = FakeFeeds({'encar': feed('encar', 2, 1)})
+
+        records = run(SyncEngine(feeds, ['encar'], checkpoint=checkpoint, stop_at_head=True))
+
+        assert records == [('encar', 'encar-3')]
+        assert ('encar', 1) not in feeds.requested
+
+
+# ── Errors and metrics ───────────────────────────────────────────
+
+
+class TestErrorsAndMetrics:
+    def test_transient_error_backs_off_and_retries(self):
+        feeds = FakeFeeds({'encar': feed('encar', 1)}, errors={'encar': [1, ApiError('Bad gateway', 502)]})
+        engine = SyncEngine(feeds, ['encar'], start=1, poll_interval=0.01, stop_at_head=True)
+
+        assert run(engine) == [('encar', 'encar-1')]
+        assert engine.stats()['encar']['errors'] == 1
+
+    def test_auth_error_is_raised(self):
+        feeds = FakeFeeds({'encar': feed('encar', 1)}, errors={'encar': [1, AuthError()]})
+
+        with pytest.raises(AuthError):
+            run(SyncEngine(feeds, ['encar'], start=1, stop_at_head=True))
+
+    def test_lag_is_zero_at_head(self):
+        feeds = FakeFeeds({'encar': feed('encar', 1)})
+        engine = SyncEngine(feeds, ['encar'], start=1, stop_at_head=True)
+
+        run(engine)
+
+        assert engine.lag() == {'encar': 0.0}
+        assert engine.stats()['encar']['consumed'] == 1
+        assert engine.stats()['encar']['change_id'] == 2
+
+    def test_lag_grows_while_behind(self):
+        now = [100.0]
+        feeds = FakeFeeds({'encar': feed('encar', 1, 1)})
+        engine = SyncEngine(feeds, ['encar'], start=1, clock=lambda: now[0])
+
+        stream = iter(engine)
+        next(stream)
+        now[0] = 130.0
+
+        assert engine.lag()['encar'] == 30.0
+        stream.close()
@@ -0,0 +1,347 @@
+import contextlib
+import gzip
+import io
+import subprocess
+import sys
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import auto_api
+from auto_api.client import Client
+from auto_api.errors import ApiError, NetworkError
+from auto_api.hooks import Hooks
+from auto_api.transport import MockResponse, MockTransport, RequestsTransport, Transport, UrllibResponse, UrllibTransport
+from benchmarks.server import MockServer
+from tests.test_balancer import closed_port_url
+
+
+class FakeRaw:
+    def __init__(self, body, headers, status=200):
+        self.status = status
+        self.headers = headers
+        self._body = io.BytesIO(body)
+        self.closed = False
+
+    def read(self, size):
+        return self._body.read(size)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(scope='module')
+def server():
+    with MockServer(pages=3, per_page=5, images=1) as server:
+        yield server
+
+
+class HtmlPage(Hooks):
+    """Records the hook events of requests answered with a proxy's HTML page."""
+
+    body = b'<html><body>502 Bad Gateway from the corporate proxy</body></html>'
+
+    def __init__(self):
+        self.events = []
+
+    def on_request(self, event):
+        self.events.append('request')
+
+    def on_error(self, event):
+        self.events.append('error')
+
+
+@contextlib.contextmanager
+def serve(body: bytes, headers: dict):
+    """A local HTTP server answering every GET with 200, ``headers`` and ``body``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def html_server():
+    with serve(HtmlPage.body, {'Content-Type': 'text/html'}) as url:
+        yield url
+
+
+@pytest.fixture
+def corrupt_gzip_server():
+    body = gzip.compress(b'{"mark": []}')[:-6] + b'garbage'
+    with serve(body, {'Content-Encoding': 'gzip'}) as url:
+        yield url
+
+
+# ── Lazy imports ─────────────────────────────────────────────────
+
+
+class TestLazyImports:
+    def test_import_does_not_load_http_libraries(self):
+        code = (
+            'import sys, auto_api; '
+            "assert not {'auto_api.client', 'requests', 'httpx', 'asyncio'} & set(sys.modules), sorted(sys.modules); "
+            "auto_api.Client('key', transport='urllib'); "
+            "assert 'requests' not in sys.modules and 'httpx' not in sys.modules"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_offer_index_and_planner_do_not_load_sqlite(self):
+        code = (
+            'import sys, auto_api; '
+            'auto_api.OfferIndex, auto_api.CrawlPlanner; '
+            "assert not {'auto_api.mirror', 'sqlite3'} & set(sys.modules), sorted(sys.modules)"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_public_names(self):
+        assert auto_api.Client is Client
+        assert set(auto_api.__all__) <= set(dir(auto_api))
+        for name in auto_api.__all__:
+            assert getattr(auto_api, name).__name__ == name
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError):
+            auto_api.Nope
+
+
+# ── Client transports ────────────────────────────────────────────
+
+
+class TestClientTransport:
+    def test_default_is_requests(self):
+        client = Client('key')
+
+        assert isinstance(client.transport, RequestsTransport)
+        assert client.session is client.transport.session
+
+    def test_unknown_transport(self):
+        with pytest.raises(ValueError):
+            Client('key', transport='curl')
+
+    def test_custom_transport(self):
+        class Canned(Transport):
+            def get(self, url, **kwargs):
+                return UrllibResponse(FakeRaw(b'{"mark": ["Kia"]}', {}), None)
+
+        client = Client('key', transport=Canned())
+
+        assert client.get_filters('encar') == {'mark': ['Kia']}
+        assert client.session is None
+
+
+# ── UrllibTransport ──────────────────────────────────────────────
+
+
+class TestUrllibTransport:
+    def test_endpoints(self, server):
+        client = Client('key', base_url=server.url, transport='urllib')
+
+        assert 'mark' in client.get_filters('encar')
+        assert len(list(client.iter_offers('encar'))) == 15
+        assert client.get_offer_by_url('https://fem.encar.com/cars/detail/40000001')['mark']
+        with client.stream_offers('encar', page=2) as stream:
+            assert len(list(stream)) == 5
+        assert stream.meta['page'] == 2
+
+    def test_reuses_connections(self, server):
+        transport = UrllibTransport()
+        client = Client('key', base_url=server.url, transport=transport)
+        client.get_filters('encar')
+        (conn,) = transport._connections().values()
+
+        client.get_offers('encar', page=1)
+
+        assert list(transport._connections().values()) == [conn]
+        transport.close()
+        assert transport._connections() == {}
+
+    def test_threads(self, server):
+        client = Client('key', base_url=server.url, transport='urllib')
+
+        assert len(list(client.iter_offers('encar', concurrency=3))) == 15
+        assert len(client.get_offers_bulk('encar', [str(40000000 + i) for i in range(10)], concurrency=4)) == 10
+
+    def test_api_errors(self, server):
+        client = Client('key', base_url=server.url, transport='urllib')
+
+        with pytest.raises(ApiError) as error:
+            client.get_offer('encar', 'x')
+        assert error.value.status_code == 422
+
+    def test_connection_error(self):
+        client = Client('key', base_url=closed_port_url(), transport='urllib')
+
+        with pytest.raises(NetworkError, match='Connection failed'):
+            client.get_filters('encar')
+
+    def test_timeout(self):
+        with MockServer(latency=0.5) as slow:
+            client = Client('key', base_url=slow.url, transport='urllib', timeout=0.05)
+            with pytest.raises(NetworkError, match='timed out'):
+                client.get_filters('encar')
+
+    def test_corrupt_body(self, corrupt_gzip_server):
+        client = Client('key', base_url=corrupt_gzip_server, transport='urllib')
+
+        with pytest.raises(NetworkError, match='Connection failed'):
+            client.get_filters('encar')
+
+    def test_invalid_json(self, html_server):
+        hooks = HtmlPage()
+        client = Client('key', base_url=html_server, transport='urllib', hooks=[hooks])
+
+        with pytest.raises(ApiError, match='Invalid JSON response: <html>'):
+            client.get_filters('encar')
+        assert hooks.events == ['request', 'error']
+
+
+class TestUrllibResponse:
+    @pytest.mark.parametrize('encoding, compress', [
+        ('gzip', gzip.compress),
+        ('deflate', zlib.compress),
+        (None, lambda body: body),
+    ])
+    def test_decodes_content(self, encoding, compress):
+        body = b'{"result": []}' * 1000
+        headers = {'Content-Encoding': encoding} if encoding else {}
+
+        streamed = UrllibResponse(FakeRaw(compress(body), headers), None)
+        read = UrllibResponse(FakeRaw(compress(body), headers), None)
+
+        assert b''.join(streamed.iter_content(100)) == body
+        assert read.content == body
+        assert b''.join(read.iter_content(100)) == body
+
+    def test_close(self):
+        raw = FakeRaw(b'', {})
+
+        UrllibResponse(raw, None).close()
+
+        assert raw.closed
+
+
+# ── HTTP2Transport ───────────────────────────────────────────────
+
+
+class TestHTTP2Transport:
+    @pytest.fixture
+    def client(self, server):
+        pytest.importorskip('h2')
+        with Client('key', base_url=server.url, transport='http2') as client:
+            yield client
+
+    def test_endpoints(self, client):
+        assert 'mark' in client.get_filters('encar')
+        assert len(list(client.iter_offers('encar', concurrency=3))) == 15
+        assert client.get_offer_by_url('https://fem.encar.com/cars/detail/40000001')['mark']
+        with client.stream_offers('encar', page=2) as stream:
+            assert len(list(stream)) == 5
+
+    def test_more_requests_than_connections(self, server):
+        pytest.importorskip('h2')
+        from auto_api.transport import HTTP2Transport
+
+        with Client('key', base_url=server.url, transport=HTTP2Transport(max_connections=1)) as client:
+            offers = client.get_offers_bulk('encar', [str(40000000 + i) for i in range(12)], concurrency=6)
+
+        assert len(offers) == 12
+        assert not any(isinstance(offer, Exception) for offer in offers.values())
+
+    def test_errors(self, client):
+        with pytest.raises(ApiError) as error:
+            client.get_offer('encar', 'x')
+        assert error.value.status_code == 422
+
+    def test_connection_error(self):
+        pytest.importorskip('h2')
+
+        with Client('key', base_url=closed_port_url(), transport='http2') as client:
+            with pytest.raises(NetworkError, match='Connection failed'):
+                client.get_filters('encar')
+
+    def test_invalid_json(self, html_server):
+        pytest.importorskip('h2')
+        hooks = HtmlPage()
+
+        with Client('key', base_url=html_server, transport='http2', hooks=[hooks]) as client:
+            with pytest.raises(ApiError, match='Invalid JSON response: <html>'):
+                client.get_filters('encar')
+        assert hooks.events == ['request', 'error']
+
+
+# ── MockTransport ────────────────────────────────────────────────
+
+
+class TestMockTransport:
+    def test_answers_from_handler(self):
+        def handler(request):
+            if request.path.endswith('/filters'):
+                return {'mark': ['Kia']}
+            if request.method == 'POST':
+                return 200, {'url': request.json['url']}
+            return MockResponse(404, {'message': 'Not found'})
+
+        transport = MockTransport(handler)
+        client = Client('key', transport=transport)
+
+        assert client.get_filters('encar') == {'mark': ['Kia']}
+        assert client.get_offer_by_url('https://x/1') == {'url': 'https://x/1'}
+        with pytest.raises(ApiError) as error:
+            client.get_offer('encar', '1')
+        assert error.value.status_code == 404
+        assert [request.method for request in transport.requests] == ['GET', 'POST', 'GET']
+        assert transport.requests[0].params['api_key'] == 'key'
+        assert transport.requests[1].headers['x-api-key'] == 'key'
+
+    def test_streams(self):
+        page = {'result': [{'inner_id': str(i)} for i in range(100)], 'meta': {'page': 1}}
+        client = Client('key', transport=MockTransport(lambda request: page))
+
+        with client.stream_offers('encar') as stream:
+            assert [item['inner_id'] for item in stream] == [str(i) for i in range(100)]
+        assert stream.meta == {'page': 1}
+
+    def test_network_errors(self):
+        def handler(request):
+            raise TimeoutError('read timed out')
+
+        client = Client('key', transport=MockTransport(handler))
+
+        with pytest.raises(NetworkError, match='timed out'):
+            client.get_filters('encar')
+
+    def test_invalid_json(self):
+        client = Client('key', transport=MockTransport(lambda request: (200, 'not json')))
+
+        with pytest.raises(ApiError, match='Invalid JSON response: not json') as error:
+            client.get_filters('encar')
+        assert error.value.status_code == 200
+
+        offers = client.get_offers_bulk('encar', ['1', '2'])
+        assert all(isinstance(offer, ApiError) for offer in offers.values())
+
+    def test_case_insensitive_headers(self):
+        response = MockResponse(200, b'', {'Retry-After': '3'})
+
+        assert response.headers.get('retry-after') == '3'
+        assert 'RETRY-AFTER' in response.headers
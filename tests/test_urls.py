@@ -0,0 +1,122 @@
+import pytest
+
+from auto_api.client import Client
+from auto_api.errors import ApiError
+from auto_api.urls import OfferUrl, normalize_url, parse_offer_url
+from benchmarks.server import MockServer
+
+
+# ── Normalization ────────────────────────────────────────────────
+
+
+class TestNormalizeUrl:
+    def test_drops_tracking_and_fragment(self):
+        url = 'HTTP://Suchen.Mobile.DE/fahrzeuge/details.html?utm_source=x&id=123&gclid=abc&lang=en#gallery'
+
+        assert normalize_url(url) == 'https://suchen.mobile.de/fahrzeuge/details.html?id=123&lang=en'
+
+    def test_sorts_query_and_strips_trailing_slash(self):
+        assert normalize_url('https://a.com/x/?b=2&a=1') == normalize_url('https://a.com/x?a=1&b=2')
+
+    def test_adds_scheme_and_drops_default_port(self):
+        assert normalize_url(' www.dubicars.com:443/ ') == 'https://www.dubicars.com'
+
+
+# ── Parsing ──────────────────────────────────────────────────────
+
+
+class TestParseOfferUrl:
+    @pytest.mark.parametrize('url, source, inner_id', [
+        ('https://fem.encar.com/cars/detail/40427050', 'encar', '40427050'),
+        ('http://www.encar.com/dc/dc_cardetailview.do?pageid=dc_carsearch&carid=40427050', 'encar', '40427050'),
+        ('https://suchen.mobile.de/fahrzeuge/details.html?id=412345678&ref=srp', 'mobilede', '412345678'),
+        ('https://suchen.mobile.de/auto-inserat/bmw-x5/412345678.html', 'mobilede', '412345678'),
+        (
+            'https://www.autoscout24.de/angebote/bmw-x5-diesel-schwarz-0b6c1d2e-3f4a-4b5c-8d9e-0a1b2c3d4e5f',
+            'autoscout24',
+            '0b6c1d2e-3f4a-4b5c-8d9e-0a1b2c3d4e5f',
+        ),
+        ('https://www.che168.com/dealer/123456/45678901.html', 'che168', '45678901'),
+        ('https://m.che168.com/cardetail/index?infoid=45678901', 'che168', '45678901'),
+        ('https://www.dongchedi.com/usedcar/12345678?utm_medium=share', 'dongchedi', '12345678'),
+        ('https://www.guazi.com/car-detail/c1234567.html', 'guazi', None),
+        ('https://www.dubicars.com/2020-bmw-x5-xdrive40i-123456.html', 'dubicars', '123456'),
+        ('https://dubai.dubizzle.com/motors/used-cars/bmw/x5/2023/5/12/bmw-x5-2-954/', 'dubizzle', None),
+    ])
+    def test_sources(self, url, source, inner_id):
+        parsed = parse_offer_url(url)
+
+        assert parsed.source == source
+        assert parsed.inner_id == inner_id
+
+    def test_unknown_host(self):
+        parsed = parse_offer_url('https://example.com/car/123?utm_campaign=x')
+
+        assert parsed == OfferUrl('https://example.com/car/123')
+        assert parsed.key == (None, 'https://example.com/car/123')
+
+    def test_lookalike_hosts_are_not_matched(self):
+        assert parse_offer_url('https://notencar.com/cars/detail/1').source is None
+        assert parse_offer_url('https://autoscout24-fake.com/x').source is None
+
+    def test_variants_share_a_key(self):
+        first = parse_offer_url('https://fem.encar.com/cars/detail/40427050?utm_source=kakao')
+        second = parse_offer_url('http://www.encar.com/dc/dc_cardetailview.do?carid=40427050')
+
+        assert first.key == second.key == ('encar', '40427050')
+
+
+# ── Client.resolve_offer_urls ────────────────────────────────────
+
+
+class TestResolveOfferUrls:
+    @pytest.fixture
+    def server(self):
+        with MockServer(images=1) as server:
+            yield server
+
+    def test_routes_dedupes_and_keeps_order(self, server):
+        client = Client('key', base_url=server.url)
+        urls = [
+            'https://fem.encar.com/cars/detail/40000001?utm_source=x',
+            'https://www.guazi.com/car-detail/40000002.html',
+            'http://www.encar.com/dc/dc_cardetailview.do?carid=40000001',
+            'https://www.guazi.com/car-detail/40000002.html#photos',
+        ]
+
+        results = client.resolve_offer_urls(urls)
+
+        assert results[0] == results[2] == client.get_offer_by_url(urls[0])
+        assert results[1] == results[3] == client.get_offer_by_url(urls[1])
+        assert server.stats['offer'] == 1
+        # One POST for the guazi URL, two from the comparisons above.
+        assert server.stats['info'] == 3
+
+    def test_falls_back_to_offer_info(self, server):
+        client = Client('key', base_url=server.url)
+        url = 'https://www.autoscout24.de/angebote/bmw-x5-00000000-0000-4000-8000-000040000003'
+
+        (result,) = client.resolve_offer_urls([url])
+
+        # The mock rejects the non-numeric inner_id; offer/info finds the digits in the URL.
+        assert result == client.get_offer_by_url(url)
+        assert server.stats['offer'] == 1
+
+    def test_failures_map_to_errors(self, server):
+        client = Client('key', base_url=server.url)
+
+        ok, failed = client.resolve_offer_urls(['https://www.dongchedi.com/usedcar/40000004', 'https://example.com/car'])
+
+        assert ok['mark']
+        assert isinstance(failed, ApiError) and failed.status_code == 404
+
+    def test_models(self, server):
+        client = Client('key', base_url=server.url, models=True)
+
+        (offer,) = client.resolve_offer_urls(['https://fem.encar.com/cars/detail/40000005'])
+
+        assert offer.inner_id == '40000005'
+        assert offer.mark
+
+    def test_empty(self):
+        assert Client('key').resolve_offer_urls([]) == []